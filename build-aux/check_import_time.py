@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Measures the cold import time of a module with `python -X importtime` and
+fails when it goes over the given budget.
+
+Every run uses a fresh interpreter, the best of --runs is compared against
+the budget so that a single noisy run does not fail the check.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+def measure(python, module, env):
+    """Returns (cumulative_us, [(self_us, name), ...]) for one cold import."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"Importing {module} failed with status {result.returncode}")
+
+    cumulative = None
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        entries.append((int(self_us), name))
+        if name == module:
+            cumulative = int(cumulative_us)
+
+    if cumulative is None:
+        raise SystemExit(f"No import time recorded for {module}")
+    return cumulative, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="pardus_gnome_greeter.__main__")
+    parser.add_argument("--budget-ms", type=float, required=True)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--source-dir", help="Directory added to PYTHONPATH")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to report")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.source_dir:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [args.source_dir, env.get("PYTHONPATH")]))
+
+    best = None
+    for _ in range(max(1, args.runs)):
+        run = measure(sys.executable, args.module, env)
+        if best is None or run[0] < best[0]:
+            best = run
+
+    cumulative_us, entries = best
+    cumulative_ms = cumulative_us / 1000
+    print(f"{args.module}: {cumulative_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+
+    if cumulative_ms <= args.budget_ms:
+        return 0
+
+    print("Import time budget exceeded, slowest modules by self time:")
+    for self_us, name in sorted(entries, reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
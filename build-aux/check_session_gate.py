@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Checks that the session gate holds background work back until the mocked
+login session has settled, and releases it before its own timeout.
+
+It is meant to run as the command of mock_session_services.py, which
+provides org.gnome.SessionManager and the pressure files:
+
+    dbus-run-session -- python3 build-aux/mock_session_services.py \\
+        --running-after 2 --busy-for 4 -- \\
+        python3 build-aux/check_session_gate.py --source-dir src --min-seconds 4
+"""
+
+import argparse
+import sys
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source-dir", help="Directory added to sys.path")
+    parser.add_argument("--min-seconds", type=float, required=True,
+                        help="earliest time the work may be released")
+    args = parser.parse_args()
+
+    if args.source_dir:
+        sys.path.insert(0, args.source_dir)
+
+    from gi.repository import GLib
+    from pardus_gnome_greeter import session_gate as gate_module
+
+    loop = GLib.MainLoop()
+    started = time.monotonic()
+    released = {}
+
+    def on_released():
+        released["after"] = time.monotonic() - started
+        loop.quit()
+
+    def on_timeout():
+        loop.quit()
+        return False
+
+    gate_module.session_gate.run_when_ready(on_released)
+    GLib.timeout_add_seconds(gate_module.MAX_WAIT_SECONDS + 5, on_timeout)
+    loop.run()
+
+    after = released.get("after")
+    if after is None:
+        print("Background work was never released")
+        return 1
+    print(f"Background work released after {after:.1f} s "
+          f"(expected between {args.min_seconds:.1f} s and {gate_module.MAX_WAIT_SECONDS} s)")
+    if after < args.min_seconds:
+        print("Released before the session settled")
+        return 1
+    if after >= gate_module.MAX_WAIT_SECONDS:
+        print("Released by the timeout, the session state or pressure was not seen")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Stands in for the login session services that the greeter's session gate
+watches, so that the deferral of background work can be tried without
+logging in.
+
+Run it on a private session bus and give it the command to start:
+
+    dbus-run-session -- python3 build-aux/mock_session_services.py \\
+        --running-after 5 --busy-for 10 -- pardus-gnome-greeter
+
+org.gnome.SessionManager reports the session as starting until
+--running-after seconds have passed, then emits SessionRunning. CPU and I/O
+pressure files are written to a temporary directory that is handed to the
+greeter through PARDUS_GNOME_GREETER_PRESSURE_DIR; they show heavy contention
+for --busy-for seconds and a settled system afterwards.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from gi.repository import Gio, GLib
+
+SESSION_MANAGER_XML = """
+<node>
+  <interface name="org.gnome.SessionManager">
+    <method name="IsSessionRunning">
+      <arg type="b" name="running" direction="out"/>
+    </method>
+    <signal name="SessionRunning"/>
+  </interface>
+</node>
+"""
+
+BUSY_PRESSURE = 60.0
+SETTLED_PRESSURE = 1.5
+
+
+class MockSession:
+    def __init__(self, running_after, busy_for, pressure_dir):
+        self.running = False
+        self.connection = None
+        self.pressure_dir = pressure_dir
+        self.started = time.monotonic()
+        self.running_after = running_after
+        self.busy_for = busy_for
+        self.node_info = Gio.DBusNodeInfo.new_for_xml(SESSION_MANAGER_XML)
+
+    def on_bus_acquired(self, connection, name):
+        self.connection = connection
+        connection.register_object(
+            "/org/gnome/SessionManager",
+            self.node_info.interfaces[0],
+            self.on_method_call,
+            None,
+            None,
+        )
+
+    def on_method_call(self, connection, sender, object_path, interface_name,
+                       method_name, parameters, invocation):
+        if method_name == "IsSessionRunning":
+            invocation.return_value(GLib.Variant("(b)", (self.running,)))
+        else:
+            invocation.return_dbus_error("org.freedesktop.DBus.Error.UnknownMethod", method_name)
+
+    def on_session_running(self):
+        self.running = True
+        print("mock: session is running")
+        self.connection.emit_signal(None, "/org/gnome/SessionManager",
+                                    "org.gnome.SessionManager", "SessionRunning", None)
+        return False
+
+    def write_pressure(self):
+        busy = time.monotonic() - self.started < self.busy_for
+        value = BUSY_PRESSURE if busy else SETTLED_PRESSURE
+        for resource in ("cpu", "io"):
+            path = os.path.join(self.pressure_dir, resource)
+            with open(path + ".tmp", "w") as f:
+                f.write(f"some avg10={value:.2f} avg60={value:.2f} avg300={value:.2f} total=0\n")
+                f.write("full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+            os.replace(path + ".tmp", path)
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--running-after", type=float, default=5.0,
+                        help="seconds until the session reports itself as running")
+    parser.add_argument("--busy-for", type=float, default=10.0,
+                        help="seconds of simulated CPU and I/O contention")
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="command to run against the mocked session, after --")
+    args = parser.parse_args()
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no command given")
+
+    pressure_dir = tempfile.mkdtemp(prefix="pardus-greeter-pressure-")
+    mock = MockSession(args.running_after, args.busy_for, pressure_dir)
+    mock.write_pressure()
+
+    loop = GLib.MainLoop()
+    exit_status = {"code": 1}
+
+    def on_child_exit(pid, status):
+        exit_status["code"] = os.waitstatus_to_exitcode(status)
+        loop.quit()
+
+    def on_name_acquired(connection, name):
+        # The greeter is started only once the mocked services can be found
+        env = dict(os.environ, PARDUS_GNOME_GREETER_PRESSURE_DIR=pressure_dir)
+        child = subprocess.Popen(command, env=env)
+        GLib.child_watch_add(GLib.PRIORITY_DEFAULT, child.pid, on_child_exit)
+
+    def on_name_lost(connection, name):
+        print("mock: org.gnome.SessionManager is already owned, run under dbus-run-session", file=sys.stderr)
+        loop.quit()
+
+    owner_id = Gio.bus_own_name(Gio.BusType.SESSION, "org.gnome.SessionManager",
+                                Gio.BusNameOwnerFlags.NONE, mock.on_bus_acquired,
+                                on_name_acquired, on_name_lost)
+    GLib.timeout_add(int(args.running_after * 1000), mock.on_session_running)
+    GLib.timeout_add(500, mock.write_pressure)
+    try:
+        loop.run()
+    finally:
+        Gio.bus_unown_name(owner_id)
+        shutil.rmtree(pressure_dir, ignore_errors=True)
+    return exit_status["code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
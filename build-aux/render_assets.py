@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Pre-renders images to the pixel size they are displayed at.
+
+Every input is scaled to fit inside --size (keeping its aspect ratio, like
+Gtk.ContentFit.CONTAIN) and written as <name>.png for scale 1 and
+<name>@2x.png for scale 2 into --output-dir. SVG input needs the librsvg
+GdkPixbuf loader.
+"""
+
+import argparse
+import os
+import sys
+
+import gi
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GdkPixbuf
+
+SCALES = (1, 2)
+
+
+def parse_size(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def fit_size(source_width, source_height, box_width, box_height):
+    ratio = min(box_width / source_width, box_height / source_height)
+    return max(1, round(source_width * ratio)), max(1, round(source_height * ratio))
+
+
+def render(path, box, output_dir):
+    info = GdkPixbuf.Pixbuf.get_file_info(path)
+    if info[0] is None:
+        raise SystemExit(f"Unsupported image: {path}")
+    _, source_width, source_height = info
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    for scale in SCALES:
+        width, height = fit_size(source_width, source_height, box[0] * scale, box[1] * scale)
+        # Vector images are rasterized at the target size, bitmaps are downscaled
+        pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(path, width, height, True)
+        suffix = "" if scale == 1 else f"@{scale}x"
+        output = os.path.join(output_dir, f"{name}{suffix}.png")
+        pixbuf.savev(output, "png", ["compression"], ["9"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=parse_size, required=True, help="Display size as WIDTHxHEIGHT in logical pixels")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("inputs", nargs="+")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for path in args.inputs:
+        render(path, args.size, args.output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,24 +8,24 @@ manage GNOME desktop settings.
 
 __version__ = "0.0.13"
 
-# Export managers
-from .managers import (
-    ShortcutManager,
-    ThemeManager,
-    WallpaperManager,
-    DisplayManager,
-    ExtensionManager,
-    LayoutManager,
-    SettingsManager,
-)
+from .lazy import lazy_attributes
 
-# Export settings instances
-from .managers.settings import (
-    app_settings,
-    theme_settings,
-    shell_settings,
-    background_settings,
-)
+# Exported names are resolved on first access, see __getattr__ below
+_LAZY_ATTRIBUTES = {
+    # Managers
+    'ShortcutManager': '.managers',
+    'ThemeManager': '.managers',
+    'WallpaperManager': '.managers',
+    'DisplayManager': '.managers',
+    'ExtensionManager': '.managers',
+    'LayoutManager': '.managers',
+    'SettingsManager': '.managers',
+    # Settings instances
+    'app_settings': '.managers.settings',
+    'theme_settings': '.managers.settings',
+    'shell_settings': '.managers.settings',
+    'background_settings': '.managers.settings',
+}
 
 __all__ = [
     'ShortcutManager',
@@ -41,3 +41,5 @@ __all__ = [
     'background_settings',
 ]
 
+
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
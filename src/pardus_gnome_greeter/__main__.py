@@ -3,9 +3,20 @@ import sys
 import os
 import gi
 
+# The startup tracer times the imports below; the other diagnostics are
+# imported only when their option or environment variable asks for them
+from .diagnostics.startup import tracer
+from .diagnostics import (STALL_ENV, DBUS_TRACE_ENV, MEMORY_ENV, PROFILER_TOGGLE_SIGNAL,
+                          RUN_MODE_GUI, RUN_MODE_HEADLESS, RUN_MODE_SERVICE)
+from . import log
+
+# Quiet by default; --verbose raises the level once options are parsed
+log.setup()
+
 # Gettext setup - must be done before any other imports
 from .translation import init_translation
-init_translation()
+with tracer.phase("init_translation"):
+    init_translation()
 
 # Enable translation support for UI files
 Gtk = None  # Will be imported later
@@ -14,37 +25,15 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Gio, GLib, Gtk, Adw
 
-def load_gresource():
-
-    """Loads the GResource file."""
-    # Simplified dev environment check
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-    build_dir = os.path.join(project_root, 'build')
-    resource_path = os.path.join(build_dir, 'pardus-gnome-greeter.gresource')
-
-    if os.path.exists(build_dir) and os.path.exists(resource_path):
-        # Development environment
-        pass
-    else:
-        # Installed environment
-        resource_path = "/usr/share/pardus/pardus-gnome-greeter/pardus-gnome-greeter.gresource"
-
-    try:
-        resource = Gio.resource_load(resource_path)
-        Gio.Resource._register(resource)
-        _("GResource loaded from")
-        print(f"GResource loaded from {resource_path}")
-    except GLib.Error as e:
-        print(f"FATAL: Could not load GResource: {e}")
-        sys.exit(1)
+from .resources import load_gresource
 
 # Load GResource before importing any UI code
-load_gresource()
+with tracer.phase("load_gresource"):
+    load_gresource()
 
-# Import UI classes after GResource is loaded
-from .main_window import MainWindow
 from .managers.settings import app_settings
-from .managers.ShortcutManager import ShortcutManager
+
+logger = log.get_logger("app")
 
 class PardusGreeterApplication(Adw.Application):
     """The main application."""
@@ -55,6 +44,12 @@ class PardusGreeterApplication(Adw.Application):
         self.win = None
         self.is_first_run_check = False
         self.start_page = None
+        # Created in service mode only
+        self.service = None
+        # Frame running the main loop, set by main() for the stall detector
+        self.main_frame = None
+        # Reports and writers of the enabled diagnostics, run at shutdown
+        self._shutdown_reports = []
 
         self.add_main_option(
             "first-run",
@@ -72,46 +67,283 @@ class PardusGreeterApplication(Adw.Application):
             "First page to be opened of application",
             "PAGE",
         )
+        self.add_main_option(
+            "apply-layout",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.STRING,
+            "Apply the given layout without opening the window and exit",
+            "NAME",
+        )
+        self.add_main_option(
+            "list-layouts",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            "List the available layouts and exit",
+            None,
+        )
+        self.add_main_option(
+            "trace-startup",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.STRING,
+            "Write startup phase timings to FILE in Chrome trace-event format",
+            "FILE",
+        )
+        self.add_main_option(
+            "verbose",
+            ord("v"),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            "Print debug output",
+            None,
+        )
+        self.add_main_option(
+            "trace-dbus",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.STRING,
+            "Write D-Bus call counts and latencies per method and page to FILE as JSON",
+            "FILE",
+        )
+        self.add_main_option(
+            "memory-report",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            "Print the memory used by building and visiting each page at exit",
+            None,
+        )
+        self.add_main_option(
+            "detect-stalls",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.INT,
+            "Report callbacks that block the main loop for longer than MS milliseconds at exit",
+            "MS",
+        )
+
+    def do_dbus_register(self, connection, object_path):
+        """Exports the management interface next to the application's own in service mode."""
+        if self.get_flags() & Gio.ApplicationFlags.IS_SERVICE:
+            from .service import GreeterService
+            self.service = GreeterService()
+            try:
+                self.service.register(connection, object_path)
+            except GLib.Error as e:
+                logger.warning("Could not export the D-Bus interface: %s", e)
+        return Adw.Application.do_dbus_register(self, connection, object_path)
+
+    def do_dbus_unregister(self, connection, object_path):
+        if self.service is not None:
+            self.service.unregister()
+        Adw.Application.do_dbus_unregister(self, connection, object_path)
+
+    def _at_shutdown(self, report):
+        if report not in self._shutdown_reports:
+            self._shutdown_reports.append(report)
+
+    def enable_diagnostics_from_environment(self):
+        """Enables the diagnostics whose environment variable is set"""
+        if os.environ.get(STALL_ENV, ""):
+            self._enable_stall_detector()
+        if os.environ.get(DBUS_TRACE_ENV, ""):
+            self._enable_dbus_tracer()
+        if os.environ.get(MEMORY_ENV, "") not in ("", "0"):
+            self._enable_memory_recorder()
+
+    def _enable_stall_detector(self, threshold_ms=None):
+        from .diagnostics.stalls import stall_detector
+        stall_detector.attach(self.main_frame)
+        if threshold_ms is None:
+            stall_detector.enable_from_environment()
+        else:
+            stall_detector.enable(threshold_ms)
+        self._at_shutdown(stall_detector.report)
+
+    def _enable_dbus_tracer(self, output_path=None):
+        from .diagnostics.dbus_trace import dbus_tracer
+        if output_path is None:
+            dbus_tracer.enable_from_environment()
+        else:
+            dbus_tracer.enable(output_path)
+        self._at_shutdown(dbus_tracer.write)
+
+    def _enable_memory_recorder(self):
+        from .diagnostics.memory import memory_recorder
+        memory_recorder.enable()
+        self._at_shutdown(memory_recorder.report)
+
+    def _toggle_profiler(self):
+        from .diagnostics.profiler import profiler
+        profiler.toggle()
+        self._at_shutdown(profiler.stop)
+
+    def _on_profiler_signal(self):
+        self._toggle_profiler()
+        return GLib.SOURCE_CONTINUE
+
+    def _set_run_mode(self, run_mode):
+        """Records what this process does in the performance history, written at shutdown"""
+        from .diagnostics.history import perf_history
+        perf_history.run_mode = run_mode
+        self._at_shutdown(perf_history.write)
+
+    def do_startup(self):
+        Adw.Application.do_startup(self)
+        from .executor import executor
+        from .render_profile import render_profile
+        from .session_gate import lower_thread_priority
+        # Fewer workers in the low-resource profile; background work yields to the session
+        executor.configure(max_workers=render_profile.worker_threads, initializer=lower_thread_priority)
+        # gapplication action tr.org.pardus.pardus-gnome-greeter toggle-profiler,
+        # or kill -USR2, starts and stops the sampling profiler
+        toggle_profiler = Gio.SimpleAction.new("toggle-profiler", None)
+        toggle_profiler.connect("activate", lambda action, parameter: self._toggle_profiler())
+        self.add_action(toggle_profiler)
+        GLib.unix_signal_add(GLib.PRIORITY_HIGH, PROFILER_TOGGLE_SIGNAL, self._on_profiler_signal)
+        if self.get_flags() & Gio.ApplicationFlags.IS_SERVICE:
+            # Resident mode (--gapplication-service): keep the managers
+            # initialized and the process alive for D-Bus clients
+            logger.info("Running as a D-Bus service")
+            self._set_run_mode(RUN_MODE_SERVICE)
+            if self.service is not None:
+                self.service.warm()
+            self.hold()
 
     def do_command_line(self, command_line):
         options = command_line.get_options_dict()
         options = options.end().unpack()
 
+        if "verbose" in options:
+            log.setup(verbose=True)
+
         if "first-run" in options:
             self.is_first_run_check = True
 
         if "page" in options:
             self.start_page = options["page"]
 
+        if "trace-startup" in options:
+            cwd = command_line.get_cwd() or os.getcwd()
+            tracer.enable(os.path.join(cwd, options["trace-startup"]))
+
+        if "trace-dbus" in options:
+            cwd = command_line.get_cwd() or os.getcwd()
+            self._enable_dbus_tracer(os.path.join(cwd, options["trace-dbus"]))
+
+        if "memory-report" in options:
+            self._enable_memory_recorder()
+
+        if "detect-stalls" in options:
+            self._enable_stall_detector(options["detect-stalls"])
+
+        if "list-layouts" in options or "apply-layout" in options:
+            return self._run_headless(command_line, options)
+
         self.activate()
         return 0
 
+    def _run_headless(self, command_line, options):
+        """Handles the layout options without building the main window."""
+        self._set_run_mode(RUN_MODE_HEADLESS)
+        from .managers.LayoutManager import LayoutManager
+
+        layout_manager = LayoutManager()
+
+        if "list-layouts" in options:
+            for layout_name in layout_manager.get_available_layouts():
+                _print_command_line(command_line, f"{layout_name}\n")
+            return 0
+
+        layout_name = options["apply-layout"]
+        if layout_name not in layout_manager.get_available_layouts():
+            available = ", ".join(layout_manager.get_available_layouts())
+            _print_command_line(command_line, f"Unknown layout '{layout_name}'. Available layouts: {available}\n", error=True)
+            return 1
+
+        # Iterates the main context until every layout step has finished
+        if layout_manager.apply_layout_sync(layout_name):
+            return 0
+        _print_command_line(command_line, f"Failed to apply layout '{layout_name}'\n", error=True)
+        return 1
+
     def do_activate(self):
         """Called when the application is activated."""
         # First run check
         if self.is_first_run_check:
             if not app_settings.get('first-run'):
-                print("Autostart check: Not the first run, exiting.")
+                logger.debug("Autostart check: Not the first run, exiting.")
                 self.quit()
                 return
             
             # Apply shortcuts only on the actual first run
-            print("--- First run detected, applying shortcuts ---")
+            logger.info("First run detected, applying shortcuts")
+            from .managers.ShortcutManager import ShortcutManager
             shortcut_manager = ShortcutManager()
             shortcut_manager.apply_standard_shortcuts()
             shortcut_manager.apply_custom_shortcuts()
         
         # Normal GUI mode
         if not self.win:
-            self.win = MainWindow(application=self, start_page=self.start_page)
-        self.win.present()
+            self._set_run_mode(RUN_MODE_GUI)
+            # Import UI classes only when a window is actually needed
+            with tracer.phase("import main_window"):
+                from .main_window import MainWindow
+            with tracer.phase("MainWindow"):
+                self.win = MainWindow(application=self, start_page=self.start_page)
+            with tracer.phase("present"):
+                self.win.present()
+            self._watch_first_frame()
+        else:
+            self.win.present()
 
         if self.is_first_run_check:
             app_settings.set('first-run', False)
 
+    def _watch_first_frame(self):
+        """Records the first frame drawn by the main window in the startup trace."""
+        frame_clock = self.win.get_frame_clock()
+        if frame_clock is None:
+            return
+
+        def on_after_paint(clock):
+            clock.disconnect(handler_id)
+            tracer.mark("first_frame")
+            tracer.write()
+
+        handler_id = frame_clock.connect("after-paint", on_after_paint)
+
+    def do_shutdown(self):
+        # Rewrite the trace so pages built after the first frame are included
+        tracer.write()
+        for report in self._shutdown_reports:
+            report()
+        from .managers.snapshot import session_snapshot
+        session_snapshot.flush()
+        Adw.Application.do_shutdown(self)
+
+def _print_command_line(command_line, message, error=False):
+    """Prints on the invoking terminal, which may belong to a remote instance."""
+    if error:
+        printer = getattr(command_line, "printerr_literal", None)
+    else:
+        printer = getattr(command_line, "print_literal", None)
+    if printer:
+        printer(message)
+    else:
+        print(message, end="", file=sys.stderr if error else sys.stdout)
+
 def main():
     """The main entry point of the application."""
+    # Coroutines started by the pages and managers run on GTK's main loop
+    from . import event_loop
+    event_loop.install()
     app = PardusGreeterApplication()
+    # Handlers blocking the main loop are the frames GLib calls below this one
+    app.main_frame = sys._getframe()
+    app.enable_diagnostics_from_environment()
     return app.run(sys.argv)
 
 if __name__ == '__main__':
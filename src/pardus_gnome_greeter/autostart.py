@@ -0,0 +1,37 @@
+# Only Gio and the logger are needed here; GTK, Adwaita and the GResource are deliberately
+# not loaded so that the autostart check finishes in a few milliseconds.
+from gi.repository import Gio
+
+from .log import get_logger
+
+logger = get_logger("autostart")
+
+APP_SCHEMA_ID = "tr.org.pardus.pardus-gnome-greeter"
+FIRST_RUN_KEY = "first-run"
+FIRST_RUN_ARGS = ("--first-run", "-c")
+
+
+def is_first_run_check(argv):
+    """Returns True if the command line asks for the autostart first run check."""
+    return any(arg in FIRST_RUN_ARGS for arg in argv[1:])
+
+
+def first_run_done(argv):
+    """
+    Returns True if this is an autostart invocation on a system where the
+    greeter has already been shown, i.e. the launcher can exit right away.
+    Any doubt (unknown schema, other options) leaves the decision to the
+    full application.
+    """
+    if not is_first_run_check(argv):
+        return False
+
+    try:
+        schema_source = Gio.SettingsSchemaSource.get_default()
+        if schema_source is None or schema_source.lookup(APP_SCHEMA_ID, True) is None:
+            return False
+        settings = Gio.Settings.new(APP_SCHEMA_ID)
+        return not settings.get_boolean(FIRST_RUN_KEY)
+    except Exception as e:
+        logger.warning("Autostart check failed, starting normally: %s", e)
+        return False
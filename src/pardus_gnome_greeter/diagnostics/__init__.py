@@ -0,0 +1,22 @@
+"""
+Diagnostics modules
+
+This module contains opt-in tracing and measurement helpers used to find
+out where the Pardus GNOME Greeter spends its time. The switches are
+defined here, so the application can check them without importing the
+helpers of diagnostics nobody asked for.
+"""
+import signal
+
+# Environment variables enabling the diagnostics, like their command line options
+STALL_ENV = "PARDUS_GNOME_GREETER_STALL_MS"
+DBUS_TRACE_ENV = "PARDUS_GNOME_GREETER_TRACE_DBUS"
+MEMORY_ENV = "PARDUS_GNOME_GREETER_MEMORY_REPORT"
+# Signal that starts and stops the profiler of a running greeter
+PROFILER_TOGGLE_SIGNAL = signal.SIGUSR2
+# What a process does, recorded with its performance history
+RUN_MODE_GUI = "gui"
+RUN_MODE_HEADLESS = "headless"
+RUN_MODE_SERVICE = "service"
+
+__all__ = []
@@ -0,0 +1,161 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from ..log import get_logger
+from . import DBUS_TRACE_ENV as TRACE_ENV
+
+logger = get_logger("diagnostics.dbus")
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PAGES_DIR = os.path.join(_PACKAGE_DIR, "pages") + os.sep
+# Frames of these modules only forward calls, so they are never the caller
+_FORWARDING_FILES = (
+    os.path.join(_PACKAGE_DIR, "managers", "bus.py"),
+    os.path.join(_PACKAGE_DIR, "diagnostics", "dbus_trace.py"),
+    os.path.join(_PACKAGE_DIR, "event_loop.py"),
+    os.path.join(_PACKAGE_DIR, "executor.py"),
+)
+
+
+def _label(frame):
+    instance = frame.f_locals.get("self")
+    if instance is not None and frame.f_code.co_filename.startswith(_PAGES_DIR):
+        return type(instance).__name__
+    return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+
+
+def _caller(frame):
+    """
+    Returns the page that made a call or, for calls made outside of the
+    pages, the outermost greeter function, e.g. LayoutManager.apply_layout_async.
+    Coroutine frames are linked to the coroutines awaiting them, so this
+    also works for calls made with BusRegistry.call().
+    """
+    outermost = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PAGES_DIR):
+            return _label(frame)
+        if filename.startswith(_PACKAGE_DIR) and filename not in _FORWARDING_FILES:
+            outermost = frame
+        frame = frame.f_back
+    return _label(outermost) if outermost is not None else "<unknown>"
+
+
+def _percentile(durations, fraction):
+    return durations[min(len(durations) - 1, int(fraction * len(durations)))]
+
+
+def _summarize(durations, errors):
+    durations = sorted(durations)
+    return {
+        "count": len(durations),
+        "errors": errors,
+        "total_ms": round(sum(durations) * 1000, 3),
+        "p50_ms": round(_percentile(durations, 0.5) * 1000, 3),
+        "p95_ms": round(_percentile(durations, 0.95) * 1000, 3),
+        "max_ms": round(durations[-1] * 1000, 3),
+    }
+
+
+class DBusTracer:
+    """
+    Records the latency of the D-Bus calls made through BusRegistry.
+
+    Tracing is off by default and costs one attribute check per call. Once
+    enabled with an output path, every call is timed and attributed to its
+    method and to the page (or manager entry point) that made it; write()
+    dumps counts, total, p50, p95 and max latencies as JSON.
+    """
+
+    def __init__(self):
+        self.output_path = None
+        self.started = time.monotonic()
+        # "interface.Method" -> [durations], and the same per caller
+        self._methods = {}
+        self._callers = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def enable(self, output_path):
+        """Starts recording; the statistics are written to output_path by write()"""
+        self.output_path = output_path
+        self.started = time.monotonic()
+
+    def enable_from_environment(self):
+        """Enables the tracer if PARDUS_GNOME_GREETER_TRACE_DBUS names a file"""
+        output_path = os.environ.get(TRACE_ENV, "")
+        if output_path:
+            self.enable(output_path)
+
+    @property
+    def enabled(self):
+        return self.output_path is not None
+
+    @contextmanager
+    def trace(self, service, method):
+        """Context manager timing one call of method on a (name, path, interface) service"""
+        caller = _caller(sys._getframe(1))
+        key = f"{service[2]}.{method}"
+        start = time.monotonic()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._add(key, caller, time.monotonic() - start, failed)
+
+    def _add(self, key, caller, duration, failed):
+        with self._lock:
+            self._methods.setdefault(key, []).append(duration)
+            self._callers.setdefault(caller, {}).setdefault(key, []).append(duration)
+            if failed:
+                self._errors[(caller, key)] = self._errors.get((caller, key), 0) + 1
+        logger.debug("%s from %s took %.1f ms", key, caller, duration * 1000)
+
+    def _method_errors(self, key):
+        return sum(count for (caller, method), count in self._errors.items() if method == key)
+
+    def summary(self):
+        """Returns the recorded statistics as a JSON-serializable dict"""
+        with self._lock:
+            methods = {key: _summarize(durations, self._method_errors(key))
+                       for key, durations in self._methods.items()}
+            callers = {}
+            for caller, calls in self._callers.items():
+                callers[caller] = {
+                    "calls": sum(len(durations) for durations in calls.values()),
+                    "total_ms": round(sum(sum(durations) for durations in calls.values()) * 1000, 3),
+                    "methods": {key: _summarize(durations, self._errors.get((caller, key), 0))
+                                for key, durations in calls.items()},
+                }
+        return {
+            "duration_s": round(time.monotonic() - self.started, 3),
+            "methods": methods,
+            "callers": callers,
+        }
+
+    def write(self):
+        """Writes the statistics if tracing is enabled"""
+        if not self.enabled:
+            return False
+        try:
+            directory = os.path.dirname(os.path.abspath(self.output_path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                json.dump(self.summary(), f, indent=1)
+            logger.info("D-Bus trace written to %s", self.output_path)
+            return True
+        except OSError as e:
+            logger.error("Error writing D-Bus trace: %s", e)
+            return False
+
+
+# Process wide tracer used by BusRegistry
+dbus_tracer = DBusTracer()
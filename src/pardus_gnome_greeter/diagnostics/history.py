@@ -0,0 +1,180 @@
+"""
+Local performance history.
+
+At the end of every run that showed the window a one-line JSON record is
+appended to ~/.cache/pardus-gnome-greeter/perf.jsonl, which keeps only the
+last MAX_RECORDS runs. Headless, service and autostart runs that exit
+early record no timings and are not written. A record holds the startup phases, page build times,
+layout and thumbnail timings, the slowest main loop stalls (when the stall
+detector runs), the greeter version and a rough hardware class, so
+regressions on real machines can be collected without asking users to
+reproduce them. PARDUS_GNOME_GREETER_PERF_HISTORY=0 turns it off.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from gi.repository import GLib
+
+from ..log import get_logger
+from . import RUN_MODE_GUI
+from .startup import tracer
+from .stalls import stall_detector
+
+logger = get_logger("diagnostics.history")
+
+HISTORY_PATH = os.path.join(GLib.get_user_cache_dir(), "pardus-gnome-greeter", "perf.jsonl")
+HISTORY_ENV = "PARDUS_GNOME_GREETER_PERF_HISTORY"
+MAX_RECORDS = 30
+STALLS_PER_RECORD = 5
+# Run modes that produce timings worth keeping
+RECORDED_RUN_MODES = {RUN_MODE_GUI}
+# Machines below these get the "low" hardware class
+LOW_END_MEMORY_GIB = 4
+LOW_END_CPUS = 2
+_VERSION_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             "__version__")
+
+
+def _version():
+    try:
+        with open(_VERSION_FILE, "r") as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def _memory_gib():
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return round(int(line.split()[1]) / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _hardware():
+    from ..render_profile import render_profile
+
+    memory = _memory_gib()
+    cpus = os.cpu_count()
+    low_end = (render_profile.low_resource
+               or (memory is not None and memory < LOW_END_MEMORY_GIB)
+               or (cpus is not None and cpus <= LOW_END_CPUS))
+    return {
+        "class": "low" if low_end else "standard",
+        "cpus": cpus,
+        "memory_gib": memory,
+        "render_profile": "low-resource" if render_profile.low_resource else "normal",
+        "render_reasons": render_profile.reasons,
+    }
+
+
+class PerfHistory:
+    """Collects the timings of one run and appends them to the history file"""
+
+    def __init__(self):
+        # Set by the application once it knows what this process does
+        self.run_mode = None
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return os.environ.get(HISTORY_ENV, "") != "0"
+
+    @contextmanager
+    def measure(self, name):
+        """Context manager adding the duration of its block to the timings called name"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._add(name, start, time.monotonic())
+
+    def _add(self, name, start, end):
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = {"count": 0, "total": 0.0, "max": 0.0,
+                                                "first": start, "last": end}
+            timing["count"] += 1
+            timing["total"] += end - start
+            timing["max"] = max(timing["max"], end - start)
+            timing["first"] = min(timing["first"], start)
+            timing["last"] = max(timing["last"], end)
+
+    def _summarize_timings(self):
+        with self._lock:
+            timings = {name: dict(timing) for name, timing in self._timings.items()}
+        summary = {}
+        for name, timing in timings.items():
+            span = timing["last"] - timing["first"]
+            summary[name] = {
+                "count": timing["count"],
+                "total_ms": round(timing["total"] * 1000, 1),
+                "max_ms": round(timing["max"] * 1000, 1),
+                # Wall-clock rate, so work spread over worker threads counts once
+                "per_second": round(timing["count"] / span, 1) if span > 0 else None,
+            }
+        return summary
+
+    def record(self):
+        """Returns the record of this run"""
+        startup, pages, marks = {}, {}, {}
+        for event in list(tracer.events):
+            if event["ph"] == "X":
+                name = event["name"]
+                target = pages if name.startswith("page:") else startup
+                key = name[len("page:"):] if target is pages else name
+                target[key] = round(target.get(key, 0) + event["dur"] / 1000, 1)
+            else:
+                marks[event["name"]] = round(event["ts"] / 1000, 1)
+
+        stalls = sorted(stall_detector.stalls.items(), key=lambda item: item[1]["max"], reverse=True)
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "version": _version(),
+            "mode": self.run_mode,
+            "hardware": _hardware(),
+            "run_ms": round(tracer.elapsed() * 1000, 1),
+            "startup_ms": startup,
+            "marks_ms": marks,
+            "pages_ms": pages,
+            "timings": self._summarize_timings(),
+            "stalls": [
+                {"handler": handler, "max_ms": round(stats["max"] * 1000, 1), "count": stats["count"]}
+                for handler, stats in stalls[:STALLS_PER_RECORD]
+            ],
+        }
+
+    def write(self):
+        """Appends the record of this run, dropping the oldest records beyond MAX_RECORDS"""
+        if not self.enabled or self.run_mode not in RECORDED_RUN_MODES:
+            return False
+        try:
+            line = json.dumps(self.record(), separators=(",", ":"))
+            try:
+                with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+                    lines = [existing for existing in f.read().splitlines() if existing.strip()]
+            except FileNotFoundError:
+                lines = []
+            lines = lines[-(MAX_RECORDS - 1):] + [line]
+
+            os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+            temp_path = HISTORY_PATH + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(temp_path, HISTORY_PATH)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not write the performance history: %s", e)
+            return False
+
+
+# Process wide history, written by the application at shutdown
+perf_history = PerfHistory()
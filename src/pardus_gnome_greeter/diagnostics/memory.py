@@ -0,0 +1,145 @@
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+
+from ..log import get_logger
+
+logger = get_logger("diagnostics.memory")
+
+# Frames kept per allocation; the report groups by the innermost one
+TRACE_FRAMES = 5
+SITES_PER_PAGE = 3
+TOP_SITES = 15
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _rss():
+    """Returns the resident set size of the process in bytes, or 0 if unknown"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _peak_rss():
+    """Returns the highest resident set size of the process in bytes, or 0 if unknown"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _size(value):
+    return f"{value / (1024 * 1024):+8.2f} MiB"
+
+
+class MemoryRecorder:
+    """
+    Measures how much memory building and visiting each page costs.
+
+    tracemalloc only sees Python allocations; textures, pixbufs and widgets
+    live in C libraries, so the resident set size is recorded next to it.
+    Building a page is measured around its factory; a visit lasts from
+    showing the page until the next page is shown, so it includes the
+    thumbnails, screenshots and animations the page loads in the background.
+    """
+
+    def __init__(self):
+        self.pages = {}
+        self._baseline = None
+        self._visit = None
+
+    @property
+    def enabled(self):
+        return self._baseline is not None
+
+    def enable(self):
+        if self.enabled:
+            return
+        tracemalloc.start(TRACE_FRAMES)
+        self._baseline = self._take()
+        logger.info("Recording memory use per page")
+
+    def _take(self):
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED), _rss()
+
+    @contextmanager
+    def build(self, name):
+        """Context manager measuring the construction of the page called name"""
+        if not self.enabled:
+            yield
+            return
+        before = self._take()
+        try:
+            yield
+        finally:
+            self._add(name, "build", before, self._take())
+
+    def visit(self, name):
+        """Ends the visit of the previous page and starts the visit of name"""
+        if not self.enabled:
+            return
+        now = self._take()
+        if self._visit is not None:
+            previous, before = self._visit
+            self._add(previous, "visit", before, now)
+        self._visit = (name, now)
+
+    def _add(self, name, kind, before, after):
+        differences = after[0].compare_to(before[0], "lineno")
+        stats = self.pages.setdefault(name, {}).setdefault(
+            kind, {"count": 0, "traced": 0, "rss": 0, "sites": {}})
+        stats["count"] += 1
+        stats["traced"] += sum(difference.size_diff for difference in differences)
+        stats["rss"] += after[1] - before[1]
+        for difference in differences[:SITES_PER_PAGE]:
+            if difference.size_diff > 0:
+                site = str(difference.traceback[0])
+                stats["sites"][site] = stats["sites"].get(site, 0) + difference.size_diff
+
+    def report(self, file=None):
+        """Prints the memory deltas per page and the top allocation sites"""
+        if not self.enabled:
+            return
+        file = file or sys.stderr
+        now = self._take()
+        if self._visit is not None:
+            previous, before = self._visit
+            self._visit = None
+            self._add(previous, "visit", before, now)
+        snapshot, rss = now
+
+        print(f"Memory report: RSS {rss / (1024 * 1024):.1f} MiB, "
+              f"peak {_peak_rss() / (1024 * 1024):.1f} MiB, "
+              f"Python heap {tracemalloc.get_traced_memory()[0] / (1024 * 1024):.1f} MiB", file=file)
+        print(f"  {'page':<14}{'':>7}{'python':>13}{'rss':>13}", file=file)
+        for name, kinds in self.pages.items():
+            for kind in ("build", "visit"):
+                stats = kinds.get(kind)
+                if stats is None:
+                    continue
+                print(f"  {name:<14}{kind:>7}{_size(stats['traced'])}{_size(stats['rss'])}"
+                      f"  ({stats['count']}x)", file=file)
+                for site, size in sorted(stats["sites"].items(), key=lambda item: item[1], reverse=True):
+                    print(f"      {_size(size)}  {site}", file=file)
+
+        print("Top allocation sites since the report was enabled:", file=file)
+        for difference in snapshot.compare_to(self._baseline[0], "lineno")[:TOP_SITES]:
+            print(f"  {_size(difference.size_diff)} {difference.count_diff:+7d} blocks  "
+                  f"{difference.traceback[0]}", file=file)
+
+
+# Process wide recorder, enabled by --memory-report
+memory_recorder = MemoryRecorder()
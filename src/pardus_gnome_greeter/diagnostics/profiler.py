@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+import time
+
+from gi.repository import GLib
+
+from ..log import get_logger
+
+logger = get_logger("diagnostics.profiler")
+
+PROFILE_DIR = os.path.join(GLib.get_user_cache_dir(), "pardus-gnome-greeter", "profiles")
+# Environment variable setting the sampling rate in Hz
+RATE_ENV = "PARDUS_GNOME_GREETER_PROFILE_HZ"
+DEFAULT_RATE = 100
+MAX_RATE = 1000
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of all threads at a fixed rate.
+
+    Nothing runs until start(); while running, a daemon thread reads
+    sys._current_frames() rate times per second. stop() writes the samples
+    as collapsed stacks ("thread;outer;...;inner count" per line), which
+    flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self):
+        self.rate = DEFAULT_RATE
+        self.started = None
+        self._samples = {}
+        self._labels = {}
+        self._stop = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._stop is not None
+
+    def start(self, rate=None):
+        if self.running:
+            return
+        if rate is None:
+            try:
+                rate = int(os.environ.get(RATE_ENV, DEFAULT_RATE))
+            except ValueError:
+                rate = DEFAULT_RATE
+        self.rate = min(max(1, rate), MAX_RATE)
+        self.started = time.time()
+        self._samples = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, args=(self._stop,),
+                                        name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info("Profiler started at %d Hz", self.rate)
+
+    def stop(self):
+        """Stops sampling and returns the path of the written profile, or None"""
+        if not self.running:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._stop = None
+        self._thread = None
+        return self.write()
+
+    def toggle(self):
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _sample(self, stop):
+        interval = 1 / self.rate
+        own_ident = threading.get_ident()
+        while not stop.wait(interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                key = tuple(reversed(stack))
+                self._samples[key] = self._samples.get(key, 0) + 1
+
+    def write(self):
+        """Writes the collapsed stacks to PROFILE_DIR"""
+        if not self._samples:
+            logger.warning("Profiler stopped without samples")
+            return None
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        path = os.path.join(PROFILE_DIR, f"profile-{stamp}-{os.getpid()}.folded")
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in sorted(self._samples.items()):
+                    f.write(f"{';'.join(stack)} {count}\n")
+        except OSError as e:
+            logger.error("Error writing profile: %s", e)
+            return None
+        logger.info("Profile written to %s", path)
+        return path
+
+
+# Process wide profiler, toggled by PROFILER_TOGGLE_SIGNAL or the toggle-profiler action
+profiler = SamplingProfiler()
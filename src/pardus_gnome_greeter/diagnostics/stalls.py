@@ -0,0 +1,163 @@
+import os
+import sys
+import threading
+import time
+import traceback
+
+from gi.repository import GLib
+
+from ..log import get_logger
+from . import STALL_ENV
+
+logger = get_logger("diagnostics.stalls")
+
+DEFAULT_THRESHOLD_MS = 100
+# How often the main loop reports that it is alive while the detector runs
+HEARTBEAT_MS = 10
+# Frames from these packages are dispatch machinery, not handlers
+_MACHINERY_DIRS = (os.sep + "asyncio" + os.sep, os.sep + "gi" + os.sep)
+REPORT_LIMIT = 10
+
+
+def _is_machinery(frame):
+    filename = frame.f_code.co_filename
+    return any(directory in filename for directory in _MACHINERY_DIRS)
+
+
+def _describe(frame):
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StallDetector:
+    """
+    Watchdog naming the callbacks that block the GLib main loop.
+
+    While enabled, the main loop sets a heartbeat every HEARTBEAT_MS and a
+    watchdog thread checks how late it is. When the heartbeat is late by more
+    than the threshold, the watchdog takes the Python stack of the main thread
+    and names the handler GLib dispatched, i.e. the frame right below main().
+    The stall ends with the next heartbeat; report() ranks the handlers by the
+    total time they blocked the loop.
+    """
+
+    def __init__(self):
+        self.threshold = DEFAULT_THRESHOLD_MS / 1000
+        self.stalls = {}
+        self._anchor = None
+        self._main_ident = threading.main_thread().ident
+        self._lock = threading.Lock()
+        self._last_beat = 0.0
+        self._pending = None
+        self._source_id = 0
+        self._stop = None
+
+    def attach(self, frame=None):
+        """
+        Marks frame, by default the caller's, as the one running the main
+        loop. Handlers are the frames GLib calls directly below it.
+        """
+        self._anchor = frame if frame is not None else sys._getframe(1)
+
+    @property
+    def enabled(self):
+        return self._stop is not None
+
+    def enable(self, threshold_ms=DEFAULT_THRESHOLD_MS):
+        """Starts the watchdog; must be called on the main thread"""
+        self.threshold = max(1, threshold_ms) / 1000
+        if self.enabled:
+            return
+        self._last_beat = time.monotonic()
+        self._source_id = GLib.timeout_add(HEARTBEAT_MS, self._beat, priority=GLib.PRIORITY_HIGH)
+        self._stop = threading.Event()
+        threading.Thread(target=self._watch, args=(self._stop,),
+                         name="stall-detector", daemon=True).start()
+        logger.info("Reporting main loop stalls longer than %d ms", threshold_ms)
+
+    def enable_from_environment(self):
+        """Enables the detector if PARDUS_GNOME_GREETER_STALL_MS is set"""
+        value = os.environ.get(STALL_ENV, "")
+        if not value:
+            return
+        try:
+            self.enable(int(value))
+        except ValueError:
+            logger.warning("Ignoring %s=%s, expected milliseconds", STALL_ENV, value)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self._stop.set()
+        self._stop = None
+        if self._source_id:
+            GLib.source_remove(self._source_id)
+            self._source_id = 0
+
+    def _late(self, now):
+        return now - self._last_beat - HEARTBEAT_MS / 1000
+
+    def _beat(self):
+        now = time.monotonic()
+        late = self._late(now)
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._last_beat = now
+        if late > self.threshold:
+            self._record(pending or ("<unknown>", None), late)
+        return GLib.SOURCE_CONTINUE
+
+    def _watch(self, stop):
+        interval = min(self.threshold / 4, HEARTBEAT_MS / 1000)
+        while not stop.wait(interval):
+            with self._lock:
+                if self._pending is None and self._late(time.monotonic()) > self.threshold:
+                    self._pending = self._capture()
+
+    def _capture(self):
+        """Returns the handler running on the main thread and its stack"""
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return ("<unknown>", None)
+
+        # Walk outwards up to the main loop; the handler is the outermost
+        # frame that is not part of the asyncio or gi dispatch machinery
+        frames = []
+        while frame is not None and frame is not self._anchor:
+            frames.append(frame)
+            frame = frame.f_back
+        if not frames:
+            return ("<unknown>", None)
+        handler = frames[0]
+        if frame is not None:
+            handler = next((f for f in reversed(frames) if not _is_machinery(f)), frames[-1])
+        return (_describe(handler), traceback.extract_stack(frames[0]))
+
+    def _record(self, pending, late):
+        handler, stack = pending
+        stats = self.stalls.setdefault(handler, {"count": 0, "total": 0.0, "max": 0.0, "stack": None})
+        stats["count"] += 1
+        stats["total"] += late
+        if late >= stats["max"]:
+            stats["max"] = late
+            stats["stack"] = stack or stats["stack"]
+        logger.debug("Main loop blocked for %.0f ms by %s", late * 1000, handler)
+
+    def report(self, file=None):
+        """Prints the handlers that blocked the main loop, longest total first"""
+        if not self.enabled and not self.stalls:
+            return
+        file = file or sys.stderr
+        ranked = sorted(self.stalls.items(), key=lambda item: item[1]["total"], reverse=True)
+        print(f"Main loop stalls longer than {self.threshold * 1000:.0f} ms: {len(ranked)} handler(s)", file=file)
+        for handler, stats in ranked[:REPORT_LIMIT]:
+            print(f"  {stats['total'] * 1000:8.0f} ms total {stats['max'] * 1000:6.0f} ms max "
+                  f"{stats['count']:4d}x  {handler}", file=file)
+            if stats["stack"]:
+                for line in traceback.format_list(stats["stack"][-6:]):
+                    print("      " + line.rstrip().replace("\n", "\n      "), file=file)
+
+
+# Process wide detector; main() attaches it to the frame running the main loop
+stall_detector = StallDetector()
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from ..log import get_logger
+
+logger = get_logger("diagnostics.startup")
+
+
+def _process_start_offset():
+    """Returns how many seconds ago this process was started, or 0.0 if unknown."""
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # The command name may contain spaces, so split after its closing paren
+            fields = f.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+        started = start_ticks / os.sysconf("SC_CLK_TCK")
+        return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except Exception:
+        return 0.0
+
+
+class StartupTracer:
+    """
+    Records monotonic timestamps of startup phases.
+
+    Recording is always on because it only costs a clock read per phase;
+    the events are written only when an output path has been set with
+    enable(). The output uses the Chrome trace-event format, so it can be
+    opened in chrome://tracing or Perfetto and diffed between releases.
+    """
+
+    def __init__(self):
+        now = time.monotonic()
+        self.origin = now - _process_start_offset()
+        self.events = []
+        self.output_path = None
+        self._lock = threading.Lock()
+        self._add("interpreter", self.origin, now)
+
+    def enable(self, output_path):
+        """Enables writing of the trace to output_path."""
+        self.output_path = output_path
+
+    @property
+    def enabled(self):
+        return self.output_path is not None
+
+    def _add(self, name, start, end=None, args=None):
+        event = {
+            "name": name,
+            "cat": "startup",
+            "ph": "X" if end is not None else "i",
+            "ts": round((start - self.origin) * 1e6),
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+        }
+        if end is not None:
+            event["dur"] = round((end - start) * 1e6)
+        else:
+            event["s"] = "p"
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def phase(self, name, **args):
+        """Context manager recording the duration of a startup phase."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._add(name, start, time.monotonic(), args)
+
+    def mark(self, name, **args):
+        """Records an instant event such as the first drawn frame."""
+        self._add(name, time.monotonic(), args=args)
+
+    def elapsed(self):
+        """Returns the seconds elapsed since the process was started."""
+        return time.monotonic() - self.origin
+
+    def write(self):
+        """Writes the recorded events if tracing is enabled."""
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            events = list(self.events)
+
+        trace = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+        }
+        try:
+            directory = os.path.dirname(os.path.abspath(self.output_path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                json.dump(trace, f, indent=1)
+            logger.info("Startup trace written to %s", self.output_path)
+            return True
+        except OSError as e:
+            logger.error("Error writing startup trace: %s", e)
+            return False
+
+
+# Process wide tracer, created as early as possible by __main__
+tracer = StartupTracer()
@@ -0,0 +1,101 @@
+"""
+Runs asyncio coroutines on the GTK main loop.
+
+PyGObject's asyncio event loop policy (gi.events) drives asyncio from the
+default GLib main context, so coroutines started from GTK callbacks resume on
+the main thread and may touch widgets. Blocking work is awaited through the
+shared executor, D-Bus calls through Gio's asynchronous API.
+"""
+import asyncio
+
+from gi.repository import GLib
+
+from .executor import executor, PRIORITY_DEFAULT
+from .log import get_logger
+
+logger = get_logger("event-loop")
+
+# Running tasks, so that they are not garbage collected while pending
+_tasks = set()
+# Policy set by install(); its loop runs on the default GLib main context
+_policy = None
+
+
+def install():
+    """Makes asyncio use the GLib main loop; call before the application runs"""
+    global _policy
+    from gi.events import GLibEventLoopPolicy
+
+    if _policy is None:
+        _policy = GLibEventLoopPolicy()
+    asyncio.set_event_loop_policy(_policy)
+
+
+def _main_loop():
+    """Returns the asyncio loop of the GLib main loop"""
+    if _policy is None or asyncio.get_event_loop_policy() is not _policy:
+        raise RuntimeError("event_loop.install() has to be called before coroutines are spawned")
+    return _policy.get_event_loop()
+
+
+def spawn(coroutine):
+    """Schedules coroutine on the main loop and returns its task"""
+    try:
+        loop = _main_loop()
+    except RuntimeError:
+        coroutine.close()
+        raise
+    task = loop.create_task(coroutine)
+    _tasks.add(task)
+    task.add_done_callback(_on_task_done)
+    return task
+
+
+def _on_task_done(task):
+    _tasks.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error("Task %s failed: %r", task.get_coro().__qualname__, error)
+
+
+def run_sync(coroutine):
+    """
+    Runs coroutine to completion by iterating the main context and returns its
+    result. Meant for callers that have to block, like command line handlers.
+    """
+    task = spawn(coroutine)
+    context = GLib.MainContext.default()
+    while not task.done():
+        context.iteration(True)
+    return task.result()
+
+
+def run_in_executor(func, *args, priority=PRIORITY_DEFAULT, cancellable=None):
+    """
+    Runs func(*args) on the shared executor and returns a future for its
+    result. The future is cancelled when cancellable is. Without a
+    cancellable, cancelling the future drops the job.
+    """
+    owns_cancellable = cancellable is None
+    future = asyncio.get_running_loop().create_future()
+
+    def on_done(result):
+        if not future.done():
+            future.set_result(result)
+
+    def on_error(error):
+        if not future.done():
+            future.set_exception(error)
+
+    def on_cancelled():
+        if not future.done():
+            future.cancel()
+
+    cancellable = executor.submit(func, *args, callback=on_done, error_callback=on_error,
+                                  cancelled_callback=on_cancelled, priority=priority,
+                                  cancellable=cancellable)
+    if owns_cancellable:
+        future.add_done_callback(lambda future: future.cancelled() and cancellable.cancel())
+    return future
@@ -0,0 +1,111 @@
+"""
+Shared worker threads for blocking work.
+
+Jobs run on a fixed number of worker threads in priority order and their
+results are delivered on the GTK main context. Every job has a
+Gio.Cancellable: a cancelled job that has not started yet is skipped, and
+the result of one that is already running is dropped, so work tied to a
+destroyed page or a closed window does not reach its callback.
+"""
+import itertools
+import queue
+import threading
+
+from gi.repository import Gio, GLib
+
+from .log import get_logger
+
+logger = get_logger("executor")
+
+PRIORITY_HIGH = 0
+PRIORITY_DEFAULT = 50
+PRIORITY_LOW = 100
+DEFAULT_MAX_WORKERS = 4
+
+
+class Executor:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, initializer=None, initargs=()):
+        self.max_workers = max_workers
+        self._initializer = initializer
+        self._initargs = initargs
+        self._jobs = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def configure(self, max_workers=None, initializer=None, initargs=()):
+        """
+        Sets the number of worker threads and the initializer(*initargs) each
+        new worker runs before its first job. Meant to be called by the
+        application before any work is submitted; workers that are already
+        running keep going.
+        """
+        with self._lock:
+            if max_workers is not None:
+                self.max_workers = max_workers
+            self._initializer = initializer
+            self._initargs = initargs
+
+    def submit(self, func, *args, callback=None, error_callback=None,
+               cancelled_callback=None, priority=PRIORITY_DEFAULT, cancellable=None):
+        """
+        Runs func(*args) on a worker thread. callback(result) or
+        error_callback(exception) is called on the main context unless the
+        job was cancelled, in which case cancelled_callback() is called
+        instead. Returns the job's Gio.Cancellable.
+        """
+        if cancellable is None:
+            cancellable = Gio.Cancellable()
+        self._jobs.put((priority, next(self._sequence),
+                        (func, args, callback, error_callback, cancelled_callback, cancellable)))
+        self._ensure_workers()
+        return cancellable
+
+    def _ensure_workers(self):
+        with self._lock:
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, args=(self._initializer, self._initargs),
+                                          name=f"executor-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+
+    def _work(self, initializer, initargs):
+        if initializer is not None:
+            try:
+                initializer(*initargs)
+            except Exception as e:
+                logger.error("Worker initializer failed: %s", e)
+        while True:
+            _priority, _sequence, job = self._jobs.get()
+            func, args, callback, error_callback, cancelled_callback, cancellable = job
+            if cancellable.is_cancelled():
+                if cancelled_callback:
+                    GLib.idle_add(self._deliver_cancelled, cancelled_callback)
+                continue
+
+            try:
+                result = func(*args)
+            except Exception as e:
+                logger.error("%s failed: %s", getattr(func, '__qualname__', func), e)
+                if error_callback or cancelled_callback:
+                    GLib.idle_add(self._deliver, error_callback, e, cancelled_callback, cancellable)
+                continue
+
+            if callback or cancelled_callback:
+                GLib.idle_add(self._deliver, callback, result, cancelled_callback, cancellable)
+
+    def _deliver(self, callback, value, cancelled_callback, cancellable):
+        if cancellable.is_cancelled():
+            if cancelled_callback:
+                cancelled_callback()
+        elif callback:
+            callback(value)
+        return False
+
+    def _deliver_cancelled(self, cancelled_callback):
+        cancelled_callback()
+        return False
+
+
+# Executor shared by the whole application
+executor = Executor()
@@ -0,0 +1,32 @@
+"""
+Module attributes that are imported on first access.
+
+A package lists which submodule provides each exported name and installs
+the returned functions as its module level __getattr__ and __dir__, so
+importing the package does not import its submodules:
+
+    __getattr__, __dir__ = lazy_attributes(globals(), {'Name': '.module'})
+"""
+import importlib
+
+
+def lazy_attributes(namespace, attributes):
+    """
+    Returns (__getattr__, __dir__) for the module whose globals() are
+    namespace. attributes maps exported names to the module, relative to
+    the package, that defines them; a resolved name is cached in namespace.
+    """
+    package = namespace['__name__']
+
+    def __getattr__(name):
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(namespace.get('__all__', attributes)))
+
+    return __getattr__, __dir__
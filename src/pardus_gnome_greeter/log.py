@@ -0,0 +1,39 @@
+"""
+Leveled logging for the greeter.
+
+Every subsystem logs through its own logger below "pardus-gnome-greeter".
+Only warnings and errors are written by default, so an autostart leaves the
+session journal quiet. --verbose, PARDUS_GNOME_GREETER_DEBUG=1 or
+G_MESSAGES_DEBUG=all (or a list containing pardus-gnome-greeter) turn on
+debug output. Messages take %-style arguments, so nothing is formatted for a
+disabled level.
+"""
+import logging
+import os
+import sys
+
+ROOT_LOGGER = "pardus-gnome-greeter"
+DEBUG_ENV = "PARDUS_GNOME_GREETER_DEBUG"
+
+
+def get_logger(subsystem):
+    """Returns the logger of a subsystem, e.g. "layout" or "display" """
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+def _debug_requested():
+    if os.environ.get(DEBUG_ENV, "") not in ("", "0"):
+        return True
+    domains = os.environ.get("G_MESSAGES_DEBUG", "").split()
+    return "all" in domains or ROOT_LOGGER in domains
+
+
+def setup(verbose=False):
+    """Installs the stderr handler; may be called again to raise the level"""
+    root = logging.getLogger(ROOT_LOGGER)
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(name)s %(levelname)s: %(message)s"))
+        root.addHandler(handler)
+        root.propagate = False
+    root.setLevel(logging.DEBUG if verbose or _debug_requested() else logging.WARNING)
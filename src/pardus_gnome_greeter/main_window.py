@@ -5,18 +5,20 @@ from locale import gettext as _
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gtk, Adw, Gio, GLib
-
-from .pages.welcome import WelcomePage
-from .pages.layout import LayoutPage
-from .pages.theme import ThemePage
-from .pages.wallpaper import WallpaperPage
-from .pages.display import DisplayPage
-from .pages.extension import ExtensionPage
-from .pages.applications import ApplicationsPage
-from .pages.time import TimePage
-from .pages.outro import OutroPage
-from .components.AboutDialog import create_about_dialog
+from gi.repository import Gtk, Adw, Gio, GLib, Gdk
+
+from .diagnostics.startup import tracer
+from .diagnostics.memory import memory_recorder
+from .prefetch import PrefetchScheduler, LOOKAHEAD
+from .render_profile import render_profile
+
+
+def _lazy_page(class_name):
+    """Returns a factory that imports the page class only when it is first built"""
+    def factory():
+        from . import pages
+        return getattr(pages, class_name)()
+    return factory
 
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/MainWindow.ui')
 class MainWindow(Adw.ApplicationWindow):
@@ -27,17 +29,22 @@ class MainWindow(Adw.ApplicationWindow):
     def __init__(self, start_page=None, **kwargs):
         super().__init__(**kwargs)
         
+        # Turn off animations before anything is shown on low-resource machines
+        render_profile.apply()
+        self.connect("realize", self._on_realize)
+
         # Set minimum window size (but still resizable)
         self.set_size_request(765, 750)
 
         # Load custom CSS
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_resource('/tr/org/pardus/pardus-gnome-greeter/css/style.css')
-        Gtk.StyleContext.add_provider_for_display(
-            self.get_display(),
-            css_provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
+        with tracer.phase("css_provider"):
+            css_provider = Gtk.CssProvider()
+            css_provider.load_from_resource('/tr/org/pardus/pardus-gnome-greeter/css/style.css')
+            Gtk.StyleContext.add_provider_for_display(
+                self.get_display(),
+                css_provider,
+                Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+            )
 
         # 1. Create the Sidebar
         self.pages_listbox = Gtk.ListBox()
@@ -108,21 +115,26 @@ class MainWindow(Adw.ApplicationWindow):
         content_box.set_hexpand(True)
         self.view_stack.set_hexpand(True)
         
+        # Warm data for the next pages while the user reads the current one
+        self.prefetcher = PrefetchScheduler()
+        interaction_controller = Gtk.EventControllerLegacy()
+        interaction_controller.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        interaction_controller.connect("event", self._on_user_interaction)
+        self.add_controller(interaction_controller)
+
         self.load_pages()
         self.pages_listbox.connect('row-activated', self._on_row_activated)
         self.split_view.connect('notify::collapsed', self._on_split_view_collapsed)
 
         # Set start page if provided
+        start_row = self.pages_listbox.get_row_at_index(0)
         if start_page:
             for row in self.pages_listbox:
                 if row.get_name() == start_page:
-                    self.pages_listbox.select_row(row)
-                    self.view_stack.set_visible_child_name(row.get_name())
+                    start_row = row
                     break
-            else: # If loop finishes without break
-                self.pages_listbox.select_row(self.pages_listbox.get_row_at_index(0))
-        else:
-            self.pages_listbox.select_row(self.pages_listbox.get_row_at_index(0))
+        self.pages_listbox.select_row(start_row)
+        self._show_page(start_row.get_name())
 
         self._on_split_view_collapsed(self.split_view, None)
         
@@ -240,10 +252,21 @@ class MainWindow(Adw.ApplicationWindow):
                 self._on_row_activated(self.pages_listbox, row)
                 break
 
+    def _on_realize(self, widget):
+        # The renderer is only known once the window has a surface
+        render_profile.check_renderer(self.get_renderer())
+
+    def _on_user_interaction(self, controller, event):
+        if event.get_event_type() in (Gdk.EventType.BUTTON_PRESS, Gdk.EventType.KEY_PRESS,
+                                      Gdk.EventType.SCROLL, Gdk.EventType.TOUCH_BEGIN):
+            self.prefetcher.interrupt()
+        return False
+
     def _on_menu_button_clicked(self, button):
         self.split_view.set_show_sidebar(not self.split_view.get_show_sidebar())
 
     def _on_about_button_clicked(self, button):
+        from .components.AboutDialog import create_about_dialog
         about_dialog = create_about_dialog()
         about_dialog.present()
 
@@ -253,7 +276,7 @@ class MainWindow(Adw.ApplicationWindow):
 
     def _on_row_activated(self, listbox, row):
         name = row.get_name()
-        self.view_stack.set_visible_child_name(name)
+        self._show_page(name)
         # Update the title
         list_box_row_child = row.get_child()
         # The second element in the default Gtk.Box is the Gtk.Label
@@ -270,24 +293,24 @@ class MainWindow(Adw.ApplicationWindow):
 
     
     def load_pages(self):
-        # Create and add pages to the ViewStack
+        # Register page descriptors; the pages themselves are built on first visit
+        self.page_descriptors = {}
+        self.built_pages = {}
+
         pages = [
-            {"name": "welcome", "title": _("Welcome"), "icon": "go-home-symbolic", "class": WelcomePage},
-            {"name": "layout", "title": _("Layout"), "icon": "view-paged-symbolic", "class": LayoutPage},
-            {"name": "theme", "title": _("Theme"), "icon": "applications-graphics-symbolic", "class": ThemePage},
-            {"name": "wallpaper", "title": _("Wallpaper"), "icon": "image-x-generic-symbolic", "class": WallpaperPage},
-            {"name": "display", "title": _("Display"), "icon": "video-display-symbolic", "class": DisplayPage},
-            {"name": "extension", "title": _("Extensions"), "icon": "org.gnome.Shell.Extensions-symbolic", "class": ExtensionPage},
-            {"name": "applications", "title": _("Applications"), "icon": "view-app-grid-symbolic", "class": ApplicationsPage},
-            {"name": "time", "title": _("Time"), "icon": "org.gnome.Settings-time-symbolic", "class": TimePage},
-            {"name": "outro", "title": _("Finish"), "icon": "application-exit-symbolic", "class": OutroPage},
+            {"name": "welcome", "title": _("Welcome"), "icon": "go-home-symbolic", "factory": _lazy_page("WelcomePage")},
+            {"name": "layout", "title": _("Layout"), "icon": "view-paged-symbolic", "factory": _lazy_page("LayoutPage")},
+            {"name": "theme", "title": _("Theme"), "icon": "applications-graphics-symbolic", "factory": _lazy_page("ThemePage")},
+            {"name": "wallpaper", "title": _("Wallpaper"), "icon": "image-x-generic-symbolic", "factory": _lazy_page("WallpaperPage")},
+            {"name": "display", "title": _("Display"), "icon": "video-display-symbolic", "factory": _lazy_page("DisplayPage")},
+            {"name": "extension", "title": _("Extensions"), "icon": "org.gnome.Shell.Extensions-symbolic", "factory": _lazy_page("ExtensionPage")},
+            {"name": "applications", "title": _("Applications"), "icon": "view-app-grid-symbolic", "factory": _lazy_page("ApplicationsPage")},
+            {"name": "time", "title": _("Time"), "icon": "org.gnome.Settings-time-symbolic", "factory": _lazy_page("TimePage")},
+            {"name": "outro", "title": _("Finish"), "icon": "application-exit-symbolic", "factory": _lazy_page("OutroPage")},
         ]
 
         for page_info in pages:
-            page = page_info["class"]()
-            if page_info["name"] == "welcome":
-                page.connect("navigate-to", self._on_navigate_request)
-            self.view_stack.add_named(page, page_info["name"])
+            self.page_descriptors[page_info["name"]] = page_info
 
             row = Gtk.ListBoxRow(name=page_info["name"])
             row.icon_name = page_info["icon"]
@@ -307,4 +330,29 @@ class MainWindow(Adw.ApplicationWindow):
             row.set_child(box)
             self.pages_listbox.append(row)
         
-        self.pages_listbox.select_row(self.pages_listbox.get_row_at_index(0)) 
\ No newline at end of file
+        self.pages_listbox.select_row(self.pages_listbox.get_row_at_index(0))
+
+    def _ensure_page(self, name):
+        """Builds the page registered under name on first use and returns it"""
+        page = self.built_pages.get(name)
+        if page is not None:
+            return page
+
+        page_info = self.page_descriptors[name]
+        with tracer.phase(f"page:{name}"), memory_recorder.build(name):
+            page = page_info["factory"]()
+        if name == "welcome":
+            page.connect("navigate-to", self._on_navigate_request)
+        self.view_stack.add_named(page, name)
+        self.built_pages[name] = page
+        return page
+
+    def _show_page(self, name):
+        """Makes the named page visible, building it if needed"""
+        memory_recorder.visit(name)
+        self._ensure_page(name)
+        self.view_stack.set_visible_child_name(name)
+
+        names = list(self.page_descriptors)
+        upcoming = names[names.index(name) + 1:names.index(name) + 1 + LOOKAHEAD]
+        self.prefetcher.schedule([page for page in upcoming if page not in self.built_pages])
@@ -1,52 +1,104 @@
-from pydbus import SessionBus
 from gi.repository import GLib
-import threading
-try:
-    import dbus
-    DBUS_AVAILABLE = True
-except ImportError:
-    DBUS_AVAILABLE = False
-    print("Warning: python-dbus not available, resolution changing will not work")
+from .snapshot import session_snapshot, MONITORS
+from .bus import session_bus, DISPLAY_CONFIG
+from ..executor import executor, PRIORITY_HIGH
+from ..event_loop import run_in_executor
+from ..log import get_logger
+
+logger = get_logger("display")
+
+# Signature of org.gnome.Mutter.DisplayConfig.ApplyMonitorsConfig
+APPLY_MONITORS_CONFIG_SIGNATURE = "(uua(iiduba(ssa{sv}))a{sv})"
+
+def _layout_mode_properties(properties):
+    """Returns the ApplyMonitorsConfig properties that keep the current layout mode"""
+    if "layout-mode" in properties:
+        return {"layout-mode": GLib.Variant("u", properties["layout-mode"])}
+    return {}
 
 class DisplayManager:
     def __init__(self):
         self._monitors_config = None
+        self._snapshot_config = None
         self._callbacks = []
-        self._loading_thread = None
+        self._loading = False
+        # Monitors have to be queried again after gnome-shell restarts
+        session_bus.watch_name_owner(DISPLAY_CONFIG, self._on_display_config_owner_changed)
+
+    def _on_display_config_owner_changed(self, has_owner):
+        if has_owner:
+            self._monitors_config = None
 
     def get_monitors(self, callback):
+        """
+        Calls callback with the monitor configuration on the main loop.
+        If a snapshot from a previous run exists, callback is first called
+        with it and called again only if the live configuration differs.
+        """
         if self._monitors_config is not None:
             GLib.idle_add(callback, self._monitors_config)
             return
         
-        self._callbacks.append(callback)
+        snapshot_config = session_snapshot.get(MONITORS)
+        if snapshot_config is not None:
+            self._snapshot_config = snapshot_config
+            GLib.idle_add(callback, snapshot_config)
         
-        if self._loading_thread is None or not self._loading_thread.is_alive():
-            self._loading_thread = threading.Thread(target=self._fetch_monitor_resources)
-            self._loading_thread.start()
+        self._callbacks.append(callback)
+        self._start_loading()
+
+    @property
+    def monitors_loaded(self):
+        """True once the live monitor configuration has been read"""
+        return self._monitors_config is not None
+
+    def fetch_monitors(self):
+        """
+        Returns the live monitor configuration, or None if it could not be
+        read. Blocks on D-Bus, so it is meant for worker threads; pass the
+        result to store_monitors() on the main loop.
+        """
+        return self._fetch_monitor_resources()
+
+    def store_monitors(self, config):
+        """Keeps a configuration returned by fetch_monitors() for the next get_monitors()"""
+        # A query started by get_monitors() delivers its own, newer result
+        if config is None or self._loading:
+            return
+        self._monitors_config = config
+        session_snapshot.update(MONITORS, config)
+
+    def _start_loading(self):
+        """Queries the monitors on the shared executor unless a query is running"""
+        if self._loading:
+            return
+        self._loading = True
+        executor.submit(self._fetch_monitor_resources, callback=self._finish_loading,
+                        priority=PRIORITY_HIGH)
 
     def _fetch_monitor_resources(self):
+        """
+        Returns the monitor configuration read from Mutter, or None if it
+        could not be read; runs on a worker thread
+        """
         config = []
         try:
-            bus = SessionBus()
-            proxy = bus.get("org.gnome.Mutter.DisplayConfig", "/org/gnome/Mutter/DisplayConfig")
-            
             # GetResources returns: (serial, crtcs, outputs, modes, max_w, max_h)
-            result = proxy.GetResources()
-            print("DisplayManager: Raw D-Bus response received")
+            result = session_bus.call_sync(DISPLAY_CONFIG, "GetResources")
+            logger.debug("Raw D-Bus response received")
             serial, crtcs, outputs, modes = result[:4]
 
             modes_by_id = {mode[0]: mode for mode in modes}
             
-            print(f"DEBUG: First few modes: {modes[:3]}")
-            print(f"DEBUG: modes_by_id keys: {list(modes_by_id.keys())[:10]}")
+            logger.debug("First few modes: %s", modes[:3])
+            logger.debug("modes_by_id keys: %s", list(modes_by_id.keys())[:10])
 
             active_mode_ids = {}
             for crtc in crtcs:
                 if len(crtc) >= 6 and crtc[5] != 0: # mode_id 0 means disabled
                     active_mode_ids[crtc[0]] = crtc[5]
             
-            print(f"DEBUG: Active mode IDs: {active_mode_ids}")
+            logger.debug("Active mode IDs: %s", active_mode_ids)
             
             # Create a mapping from active mode ID to actual mode data
             active_mode_data = {}
@@ -55,9 +107,16 @@ class DisplayManager:
                 for mode in modes:
                     if len(mode) >= 4 and mode[0] == active_mode_id:  # mode[0] is the mode ID
                         active_mode_data[crtc_id] = mode
-                        print(f"DEBUG: Matched CRTC {crtc_id} with mode: {mode}")
+                        logger.debug("Matched CRTC %s with mode: %s", crtc_id, mode)
                         break
 
+            # Scale information comes from GetCurrentState, fetched once for all outputs
+            try:
+                current_state = session_bus.call_sync(DISPLAY_CONFIG, "GetCurrentState")
+            except Exception as e:
+                logger.warning("Could not get scale info from GetCurrentState: %s", e)
+                current_state = None
+
             for i, output in enumerate(outputs):
                 if len(output) < 8: continue
                 
@@ -137,12 +196,12 @@ class DisplayManager:
                     'connector': output_name  # Add connector for resolution changing
                 }
                 
-                print(f"DEBUG: Monitor {output_id} - current_crtc_id: {current_crtc_id}")
-                print(f"DEBUG: Active mode IDs: {active_mode_ids}")
+                logger.debug("Monitor %s - current_crtc_id: %s", output_id, current_crtc_id)
+                logger.debug("Active mode IDs: %s", active_mode_ids)
                 
                 if current_crtc_id in active_mode_data:
                     mode_data = active_mode_data[current_crtc_id]
-                    print(f"DEBUG: Found active mode_data: {mode_data}")
+                    logger.debug("Found active mode_data: %s", mode_data)
                     
                     if len(mode_data) >= 4:
                         # Set current resolution
@@ -159,7 +218,7 @@ class DisplayManager:
                             'mode_id': mode_id
                         }
                         
-                        print(f"  Set current resolution: {width}x{height} @ {refresh_rate:.1f}Hz (mode_id: {mode_id})")
+                        logger.debug("Set current resolution: %sx%s @ %.1fHz (mode_id: %s)", width, height, refresh_rate, mode_id)
                     
                     # Get current scale - note: GetResources modes may not have scale info
                     # We'll use GetCurrentState for accurate scale data later
@@ -167,11 +226,11 @@ class DisplayManager:
                         supported = mode_data[6] if len(mode_data) > 6 else [1.0]
                         if supported and len(supported) > 1:
                             monitor_data['supported_scales'] = supported
-                            print(f"  Found supported scales: {supported}")
+                            logger.debug("Found supported scales: %s", supported)
                         else:
-                            print(f"  No scale data in GetResources mode, will use GetCurrentState")
+                            logger.debug("No scale data in GetResources mode, will use GetCurrentState")
                 else:
-                    print(f"DEBUG: current_crtc_id {current_crtc_id} not in active_mode_data")
+                    logger.debug("current_crtc_id %s not in active_mode_data", current_crtc_id)
                 
                 # Update current resolution in supported_resolutions with actual current scale info
                 if monitor_data['current_resolution']:
@@ -185,19 +244,14 @@ class DisplayManager:
                             # Update this resolution with current scale information
                             if 'supported_scales' not in res_info or not res_info['supported_scales']:
                                 res_info['supported_scales'] = monitor_data['supported_scales']
-                            print(f"  Updated resolution {current_res_str} with scales: {res_info['supported_scales']}")
+                            logger.debug("Updated resolution %s with scales: %s", current_res_str, res_info['supported_scales'])
                             break
                 
                 # Try to get actual scale information from GetCurrentState
                 try:
-                    # Import here to avoid circular import
-                    import dbus
-                    bus = dbus.SessionBus()
-                    display_config_proxy = bus.get_object("org.gnome.Mutter.DisplayConfig", "/org/gnome/Mutter/DisplayConfig")
-                    display_config_interface = dbus.Interface(display_config_proxy, dbus_interface="org.gnome.Mutter.DisplayConfig")
-                    
-                    # Get current state for scale information
-                    serial, physical_monitors, logical_monitors, properties = display_config_interface.GetCurrentState()
+                    if current_state is None:
+                        raise RuntimeError("GetCurrentState is not available")
+                    serial, physical_monitors, logical_monitors, properties = current_state
                     
                     # Find our monitor in the current state by connector name
                     for monitor_info_current, monitor_modes_current, monitor_properties_current in physical_monitors:
@@ -216,7 +270,7 @@ class DisplayManager:
                                         'refresh_rate': mode_refresh,
                                         'mode_id': active_mode_id  # Use the active mode ID
                                     }
-                                    print(f"  Updated current resolution from GetCurrentState: {mode_width}x{mode_height} @ {mode_refresh}Hz")
+                                    logger.debug("Updated current resolution from GetCurrentState: %sx%s @ %sHz", mode_width, mode_height, mode_refresh)
                                     
                                     # Get scale info
                                     current_scale_actual = float(mode_preferred_scale) if mode_preferred_scale else 1.0
@@ -228,7 +282,7 @@ class DisplayManager:
                                             if linked_monitor_connector == connector_name:
                                                 # Use logical monitor scale if available
                                                 current_scale_actual = float(scale)
-                                                print(f"  Found logical monitor scale: {current_scale_actual}")
+                                                logger.debug("Found logical monitor scale: %s", current_scale_actual)
                                                 break
                                         if current_scale_actual != 1.0:
                                             break
@@ -239,7 +293,7 @@ class DisplayManager:
                                     # Update current_scale variable for filtering
                                     current_scale = current_scale_actual
                                     
-                                    print(f"  GetCurrentState: scale={current_scale_actual}, supported_scales={supported_scales_actual}")
+                                    logger.debug("GetCurrentState: scale=%s, supported_scales=%s", current_scale_actual, supported_scales_actual)
                                     
                                     # Update current resolution in supported_resolutions with GetCurrentState scale data
                                     if monitor_data['current_resolution']:
@@ -247,12 +301,12 @@ class DisplayManager:
                                         for res_info in monitor_data['supported_resolutions']:
                                             if res_info['resolution'] == current_res_str:
                                                 res_info['supported_scales'] = supported_scales_actual
-                                                print(f"  Updated {current_res_str} with GetCurrentState scales: {supported_scales_actual}")
+                                                logger.debug("Updated %s with GetCurrentState scales: %s", current_res_str, supported_scales_actual)
                                                 break
                                     break
                             break
                 except Exception as e:
-                    print(f"  Warning: Could not get scale info from GetCurrentState: {e}")
+                    logger.warning("Could not get scale info from GetCurrentState: %s", e)
                 
                 # Filter supported resolutions based on current scale
                 if current_scale != 1.0:
@@ -265,50 +319,51 @@ class DisplayManager:
                     # If no resolutions support the current scale, show all resolutions
                     # This prevents the dropdown from being empty
                     if len(filtered_resolutions) == 0:
-                        print(f"  No resolutions support scale {current_scale}, showing all {len(supported_resolutions)} resolutions")
+                        logger.debug("No resolutions support scale %s, showing all %s resolutions", current_scale, len(supported_resolutions))
                         monitor_data['supported_resolutions'] = supported_resolutions
                     else:
                         monitor_data['supported_resolutions'] = filtered_resolutions
-                        print(f"  Filtered to {len(filtered_resolutions)} resolutions supporting scale {current_scale}")
+                        logger.debug("Filtered to %s resolutions supporting scale %s", len(filtered_resolutions), current_scale)
                 else:
-                    print(f"  Scale is 1.0, showing all {len(supported_resolutions)} resolutions")
+                    logger.debug("Scale is 1.0, showing all %s resolutions", len(supported_resolutions))
                 
                 config.append(monitor_data)
                 current_res_str = monitor_data['current_resolution']['resolution'] if monitor_data['current_resolution'] else "Unknown"
                 supported_res_count = len(monitor_data['supported_resolutions'])
-                print(f"DisplayManager: Found monitor - {monitor_name} (Vendor: {vendor}, Product: {product}, Connection: {display_name})")
-                print(f"  Current Resolution: {current_res_str}, Supported Resolutions: {supported_res_count}")
+                logger.debug("Found monitor - %s (Vendor: %s, Product: %s, Connection: %s)", monitor_name, vendor, product, display_name)
+                logger.debug("Current Resolution: %s, Supported Resolutions: %s", current_res_str, supported_res_count)
         
         except Exception as e:
-            print(f"DisplayManager Error: Failed to get monitor info via D-Bus. {e}")
-            config = [] # Clear config on error to avoid partial data
+            logger.error("Failed to get monitor info via D-Bus. %s", e)
+            # Not an empty configuration: the caller keeps what it shows
+            return None
 
-        self._finish_loading(config)
+        return config
 
     def _finish_loading(self, config):
+        """Stores a fetched configuration and notifies the waiting callbacks on the main loop"""
+        self._loading = False
+        callbacks, self._callbacks = self._callbacks, []
+        if config is None:
+            # Keep the snapshot and query again on the next get_monitors()
+            if self._snapshot_config is None:
+                for cb in callbacks:
+                    cb([])
+            return
+
         self._monitors_config = config
-        for cb in self._callbacks:
-            GLib.idle_add(cb, config)
-        self._callbacks = []
+        changed = session_snapshot.update(MONITORS, config)
+        if not changed and self._snapshot_config is not None:
+            # The pages already show this configuration from the snapshot
+            return
+        for cb in callbacks:
+            cb(config)
 
     def apply_resolution_change(self, monitor_id, mode_id):
-        """Apply resolution change using proper dbus module like the example script"""
-        if not DBUS_AVAILABLE:
-            print("Error: python-dbus not available for resolution changing")
-            return False
-            
+        """Apply resolution change through org.gnome.Mutter.DisplayConfig"""
         try:
-            # Use standard dbus module like the working script
-            bus = dbus.SessionBus()
-            
-            display_config_well_known_name = "org.gnome.Mutter.DisplayConfig"
-            display_config_object_path = "/org/gnome/Mutter/DisplayConfig"
-            
-            display_config_proxy = bus.get_object(display_config_well_known_name, display_config_object_path)
-            display_config_interface = dbus.Interface(display_config_proxy, dbus_interface=display_config_well_known_name)
-            
             # First get resources to find the mode details
-            result = display_config_interface.GetResources()
+            result = session_bus.call_sync(DISPLAY_CONFIG, "GetResources")
             serial_res, crtcs, outputs, modes = result[:4]
             
             # Find the target mode width/height from GetResources
@@ -321,13 +376,13 @@ class DisplayManager:
                     break
             
             if target_width is None or target_height is None:
-                print(f"Mode {mode_id} not found in resources")
+                logger.warning("Mode %s not found in resources", mode_id)
                 return False
             
-            print(f"Looking for mode with resolution {target_width}x{target_height}")
+            logger.debug("Looking for mode with resolution %sx%s", target_width, target_height)
             
             # Get current state
-            serial, physical_monitors, logical_monitors, properties = display_config_interface.GetCurrentState()
+            serial, physical_monitors, logical_monitors, properties = session_bus.call_sync(DISPLAY_CONFIG, "GetCurrentState")
             
             # Find the exact mode string from GetCurrentState physical monitors
             target_mode_string = None
@@ -337,17 +392,17 @@ class DisplayManager:
                     if mode_width == target_width and mode_height == target_height:
                         target_mode_string = mode_string
                         target_supported_scales = list(mode_supported_scales)
-                        print(f"Found matching mode string: {target_mode_string}")
-                        print(f"Supported scales for this mode: {target_supported_scales}")
+                        logger.debug("Found matching mode string: %s", target_mode_string)
+                        logger.debug("Supported scales for this mode: %s", target_supported_scales)
                         break
                 if target_mode_string:
                     break
             
             if not target_mode_string:
-                print(f"Could not find mode string for resolution {target_width}x{target_height}")
+                logger.warning("Could not find mode string for resolution %sx%s", target_width, target_height)
                 return False
             
-            print(f"Changing resolution for monitor {monitor_id} to mode {target_mode_string}")
+            logger.debug("Changing resolution for monitor %s to mode %s", monitor_id, target_mode_string)
             
             # Find our monitor info
             target_monitor = None
@@ -357,11 +412,11 @@ class DisplayManager:
                     break
                     
             if not target_monitor:
-                print(f"Monitor {monitor_id} not found in config")
+                logger.warning("Monitor %s not found in config", monitor_id)
                 return False
             
             target_connector = target_monitor['connector']
-            print(f"Target connector: {target_connector}")
+            logger.debug("Target connector: %s", target_connector)
             
             updated_logical_monitors = []
             monitor_found = False
@@ -381,11 +436,11 @@ class DisplayManager:
                         if linked_monitor_connector == monitor_connector:
                             if monitor_connector == target_connector:
                                 # This is our target monitor - use the new mode (as string)
-                                physical_monitors_config.append(dbus.Struct([monitor_connector, target_mode_string, {}]))
+                                physical_monitors_config.append((monitor_connector, target_mode_string, {}))
                                 monitor_found = True
                                 current_logical_monitor_has_target = True
                                 monitor_width = target_width  # Use new width
-                                print(f"Found target monitor {monitor_connector}, setting mode to {target_mode_string}")
+                                logger.debug("Found target monitor %s, setting mode to %s", monitor_connector, target_mode_string)
                             else:
                                 # Keep current mode for other monitors - find current mode ID properly
                                 current_mode_string = None
@@ -398,11 +453,11 @@ class DisplayManager:
                                         break
                                 
                                 if current_mode_string is not None:
-                                    physical_monitors_config.append(dbus.Struct([monitor_connector, current_mode_string, {}]))
+                                    physical_monitors_config.append((monitor_connector, current_mode_string, {}))
                                     monitor_width = current_mode_width
-                                    print(f"Keeping current mode {current_mode_string} for monitor {monitor_connector}")
+                                    logger.debug("Keeping current mode %s for monitor %s", current_mode_string, monitor_connector)
                                 else:
-                                    print(f"Warning: Could not find current mode for monitor {monitor_connector}")
+                                    logger.warning("Could not find current mode for monitor %s", monitor_connector)
                 
                 # Store monitor configuration
                 monitor_configs.append({
@@ -415,7 +470,7 @@ class DisplayManager:
                 })
             
             if not monitor_found:
-                print(f"Target monitor connector {target_connector} not found")
+                logger.warning("Target monitor connector %s not found", target_connector)
                 return False
             
             # Recalculate positions - arrange all monitors horizontally from left to right
@@ -425,52 +480,48 @@ class DisplayManager:
                 new_y = 0  # All monitors at same vertical level
                 
                 # Create logical monitor struct with calculated position
-                updated_logical_monitor_struct = dbus.Struct([
-                    dbus.Int32(new_x),
-                    dbus.Int32(new_y),
-                    dbus.Double(monitor_config['scale']),
-                    dbus.UInt32(monitor_config['transform']), 
-                    dbus.Boolean(monitor_config['primary']), 
+                updated_logical_monitor_struct = (
+                    int(new_x),
+                    int(new_y),
+                    float(monitor_config['scale']),
+                    int(monitor_config['transform']),
+                    bool(monitor_config['primary']),
                     monitor_config['physical_monitors_config']
-                ])
+                )
                 updated_logical_monitors.append(updated_logical_monitor_struct)
                 
-                print(f"Monitor {i}: position ({new_x}, {new_y}), width {monitor_config['width']}, target: {monitor_config['is_target']}")
+                logger.debug("Monitor %s: position (%s, %s), width %s, target: %s", i, new_x, new_y, monitor_config['width'], monitor_config['is_target'])
                 
                 # Next monitor starts after this one
                 current_x += monitor_config['width']
             
-            print(f"Final configuration: {len(updated_logical_monitors)} logical monitors arranged horizontally")
+            logger.debug("Final configuration: %s logical monitors arranged horizontally", len(updated_logical_monitors))
             
             # Apply the configuration
-            properties_to_apply = {"layout-mode": properties.get("layout-mode")}
+            properties_to_apply = _layout_mode_properties(properties)
             method = 2  # Show confirmation dialog
             
-            display_config_interface.ApplyMonitorsConfig(
-                dbus.UInt32(serial), 
-                dbus.UInt32(method), 
-                updated_logical_monitors, 
-                properties_to_apply
-            )
+            session_bus.call_sync(DISPLAY_CONFIG, "ApplyMonitorsConfig", GLib.Variant(
+                APPLY_MONITORS_CONFIG_SIGNATURE,
+                (serial, method, updated_logical_monitors, properties_to_apply)
+            ))
             
-            print(f"Successfully applied resolution change for monitor {monitor_id}")
+            logger.info("Successfully applied resolution change for monitor %s", monitor_id)
             
             # Refresh our monitor data after change
             GLib.timeout_add(1000, self._delayed_refresh)
             
             return True
             
-        except Exception as e:
-            print(f"Error applying resolution change: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error applying resolution change")
             return False
     
     def apply_scale_change(self, monitor_id, mode_id, new_scale):
         """Apply scale change to a specific monitor"""
         try:
             if not self._monitors_config:
-                print("No monitor configuration available")
+                logger.warning("No monitor configuration available")
                 return False
             
             # Find target monitor
@@ -481,28 +532,20 @@ class DisplayManager:
                     break
             
             if not target_connector:
-                print(f"Monitor {monitor_id} not found")
+                logger.warning("Monitor %s not found", monitor_id)
                 return False
             
-            print(f"Changing scale for monitor {monitor_id} to {new_scale}")
-            print(f"Target connector: {target_connector}")
+            logger.debug("Changing scale for monitor %s to %s", monitor_id, new_scale)
+            logger.debug("Target connector: %s", target_connector)
             
             # Get current state from D-Bus
-            bus = dbus.SessionBus()
-            display_config_well_known_name = "org.gnome.Mutter.DisplayConfig"
-            display_config_object_path = "/org/gnome/Mutter/DisplayConfig"
-            
-            display_config_proxy = bus.get_object(display_config_well_known_name, display_config_object_path)
-            display_config_interface = dbus.Interface(display_config_proxy, dbus_interface=display_config_well_known_name)
-            
-            # Get current state
-            current_state = display_config_interface.GetCurrentState()
+            current_state = session_bus.call_sync(DISPLAY_CONFIG, "GetCurrentState")
             serial = current_state[0]
             physical_monitors = current_state[1]
             logical_monitors = current_state[2]
             properties = current_state[3]
             
-            print(f"Current state: {len(physical_monitors)} physical monitors, {len(logical_monitors)} logical monitors")
+            logger.debug("Current state: %s physical monitors, %s logical monitors", len(physical_monitors), len(logical_monitors))
             
             # Process logical monitors and normalize coordinates
             updated_logical_monitors = []
@@ -550,7 +593,7 @@ class DisplayManager:
                     arranged_positions.append((new_x, new_y, scale, transform, primary, linked_monitors_info, props))
                     current_x += width
                 logical_monitor_positions = arranged_positions
-                print(f"All monitors arranged strictly side by side, y=0, with calculated widths (target uses new scale)")
+                logger.debug("All monitors arranged strictly side by side, y=0, with calculated widths (target uses new scale)")
             
             # Second pass: build updated logical monitors
             for x, y, scale, transform, primary, linked_monitors_info, props in logical_monitor_positions:
@@ -571,12 +614,12 @@ class DisplayManager:
                                         break
                                         
                                 if current_mode_string:
-                                    physical_monitors_config.append(dbus.Struct([monitor_connector, current_mode_string, {}]))
+                                    physical_monitors_config.append((monitor_connector, current_mode_string, {}))
                                     monitor_found = True
                                     current_logical_monitor_has_target = True
-                                    print(f"Found target monitor {monitor_connector}, keeping mode {current_mode_string}, changing scale to {new_scale}")
+                                    logger.debug("Found target monitor %s, keeping mode %s, changing scale to %s", monitor_connector, current_mode_string, new_scale)
                                 else:
-                                    print(f"Error: Could not find current mode for target monitor {monitor_connector}")
+                                    logger.error("Could not find current mode for target monitor %s", monitor_connector)
                                     return False
                             else:
                                 # Keep current mode for other monitors
@@ -587,65 +630,71 @@ class DisplayManager:
                                         break
                                 
                                 if current_mode_string is not None:
-                                    physical_monitors_config.append(dbus.Struct([monitor_connector, current_mode_string, {}]))
-                                    print(f"Keeping current mode {current_mode_string} for monitor {monitor_connector}")
+                                    physical_monitors_config.append((monitor_connector, current_mode_string, {}))
+                                    logger.debug("Keeping current mode %s for monitor %s", current_mode_string, monitor_connector)
                                 else:
-                                    print(f"Warning: Could not find current mode for monitor {monitor_connector}")
+                                    logger.warning("Could not find current mode for monitor %s", monitor_connector)
                 
                 # Use new scale for target monitor, keep original for others
                 if current_logical_monitor_has_target:
                     use_scale = new_scale
-                    print(f"Setting scale to {new_scale} for target monitor")
+                    logger.debug("Setting scale to %s for target monitor", new_scale)
                 else:
                     use_scale = scale  # Keep original scale for other monitors
                 
                 # Create updated logical monitor struct with normalized coordinates
-                updated_logical_monitor_struct = dbus.Struct([
-                    dbus.Int32(x),  # Use normalized position
-                    dbus.Int32(y),  # Use normalized position
-                    dbus.Double(use_scale),
-                    dbus.UInt32(transform), 
-                    dbus.Boolean(primary), 
+                updated_logical_monitor_struct = (
+                    int(x),  # Use normalized position
+                    int(y),  # Use normalized position
+                    float(use_scale),
+                    int(transform),
+                    bool(primary),
                     physical_monitors_config
-                ])
+                )
                 updated_logical_monitors.append(updated_logical_monitor_struct)
                 
-                print(f"Logical monitor: position ({x}, {y}), scale {use_scale}, target: {current_logical_monitor_has_target}")
+                logger.debug("Logical monitor: position (%s, %s), scale %s, target: %s", x, y, use_scale, current_logical_monitor_has_target)
             
             if not monitor_found:
-                print(f"Target monitor connector {target_connector} not found")
+                logger.warning("Target monitor connector %s not found", target_connector)
                 return False
             
-            print(f"Final configuration: {len(updated_logical_monitors)} logical monitors with scale change")
+            logger.debug("Final configuration: %s logical monitors with scale change", len(updated_logical_monitors))
             
             # Apply the configuration
-            properties_to_apply = {"layout-mode": properties.get("layout-mode")}
+            properties_to_apply = _layout_mode_properties(properties)
             method = 2  # Show confirmation dialog
             
-            display_config_interface.ApplyMonitorsConfig(
-                dbus.UInt32(serial), 
-                dbus.UInt32(method), 
-                updated_logical_monitors, 
-                properties_to_apply
-            )
+            session_bus.call_sync(DISPLAY_CONFIG, "ApplyMonitorsConfig", GLib.Variant(
+                APPLY_MONITORS_CONFIG_SIGNATURE,
+                (serial, method, updated_logical_monitors, properties_to_apply)
+            ))
             
-            print(f"Successfully applied scale change for monitor {monitor_id}")
+            logger.info("Successfully applied scale change for monitor %s", monitor_id)
             
             # Refresh our monitor data after change
             GLib.timeout_add(1000, self._delayed_refresh)
             
             return True
             
-        except Exception as e:
-            print(f"Error applying scale change: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error applying scale change")
             return False
     
+    async def apply_resolution_change_async(self, monitor_id, mode_id):
+        """Awaitable version of apply_resolution_change(), run on the shared executor"""
+        return await run_in_executor(self.apply_resolution_change, monitor_id, mode_id,
+                                     priority=PRIORITY_HIGH)
+
+    async def apply_scale_change_async(self, monitor_id, mode_id, new_scale):
+        """Awaitable version of apply_scale_change(), run on the shared executor"""
+        return await run_in_executor(self.apply_scale_change, monitor_id, mode_id, new_scale,
+                                     priority=PRIORITY_HIGH)
+
     def _delayed_refresh(self):
         """Delayed refresh of monitor configuration"""
         self._monitors_config = None
-        self._fetch_monitor_resources()
+        self._start_loading()
         return False  # Don't repeat the timeout
 
 display_manager = DisplayManager()
\ No newline at end of file
@@ -1,49 +1,35 @@
-import json
+import asyncio
 import os
-import dbus
-from gi.repository import Gio, GLib
+import threading
+from gi.repository import GLib
+from .bus import session_bus, SHELL_EXTENSIONS
+from . import catalog
+from ..log import get_logger
+
+logger = get_logger("extensions")
+
+_installed_index = None
+_installed_index_lock = threading.Lock()
+
+# How long to wait for GNOME Shell to apply disable-user-extensions
+USER_EXTENSIONS_TIMEOUT = 5.0
 
 class ExtensionManager:
-    def __init__(self, extensions_file="/tr/org/pardus/pardus-gnome-greeter/json/extensions.json"):
-        self.extensions_file = extensions_file
-        self.extensions = self._load_extensions()
-        self.dbus_service = None
-        try:
-            bus = dbus.SessionBus()
-            self.dbus_service = bus.get_object('org.gnome.Shell.Extensions', "/org/gnome/Shell/Extensions")
-        except Exception as e:
-            print(f"Could not connect to dbus service: {e}")
-        
-    def _load_extensions(self):
-        """Load extensions from JSON file in GResource with fallback to filesystem"""
-        # Try GResource first
-        try:
-            file = Gio.File.new_for_uri(f'resource://{self.extensions_file}')
-            success, data, _ = file.load_contents(None)
-            if success:
-                json_data = data.decode('utf-8')
-                return json.loads(json_data)
-        except Exception as e:
-            pass  # Fall through to filesystem fallback
-        
-        # Fallback: Try to load from filesystem
-        try:
-            filename = os.path.basename(self.extensions_file)
-            fallback_paths = [
-                f"/usr/share/pardus-gnome-greeter/json/{filename}",
-                f"/usr/local/share/pardus-gnome-greeter/json/{filename}",
-            ]
-            
-            for fallback_path in fallback_paths:
-                if os.path.exists(fallback_path):
-                    with open(fallback_path, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-            
-            print(f"Warning: Could not load extensions from GResource ({self.extensions_file}) or filesystem")
-            return []
-        except Exception as e:
-            print(f"Error loading extensions: {e}")
-            return []
+    def __init__(self, document="extensions.json"):
+        # Parsed once per process and shared by every ExtensionManager
+        self.extensions = catalog.get(document, ())
+        if not self.available:
+            logger.warning("Could not connect to dbus service: org.gnome.Shell.Extensions is not running")
+
+    @property
+    def available(self):
+        """True if GNOME Shell's extension service is running right now"""
+        # Asked at call time, so a restarted gnome-shell is picked up
+        return session_bus.has_owner(SHELL_EXTENSIONS)
+
+    def watch_availability(self, callback):
+        """Calls callback(available) on the main loop when GNOME Shell's extension service appears or vanishes"""
+        session_bus.watch_name_owner(SHELL_EXTENSIONS, callback)
     
     def get_extensions(self):
         """Get all extensions"""
@@ -51,56 +37,126 @@ class ExtensionManager:
     
     def get_enabled_extensions(self):
         """Get currently enabled extensions"""
-        if not self.dbus_service:
+        if not self.available:
             return []
         
         enabled_extensions = []
         try:
-            extensions = self.dbus_service.ListExtensions(dbus_interface='org.gnome.Shell.Extensions')
+            (extensions,) = session_bus.call_sync(SHELL_EXTENSIONS, "ListExtensions")
             for ext_id, ext_info in extensions.items():
                 if 'state' in ext_info and ext_info['state'] == 1:
                     enabled_extensions.append(ext_id)
         except Exception as e:
-            print(f"Failed to get enabled extensions via D-Bus: {e}")
+            logger.warning("Failed to get enabled extensions via D-Bus: %s", e)
         return enabled_extensions
 
     def is_extension_enabled(self, extension_id):
         """Check if an extension is enabled"""
-        if not self.dbus_service:
+        if not self.available:
             return False
         try:
-            extensions = self.dbus_service.ListExtensions(dbus_interface='org.gnome.Shell.Extensions')
+            (extensions,) = session_bus.call_sync(SHELL_EXTENSIONS, "ListExtensions")
             if extension_id in extensions:
                 ext_info = extensions[extension_id]
                 return 'state' in ext_info and ext_info['state'] == 1
         except Exception as e:
-            print(f"Failed to check if extension is enabled via D-Bus: {e}")
+            logger.warning("Failed to check if extension is enabled via D-Bus: %s", e)
         return False
     
     def enable_extension(self, extension_id):
         """Enable an extension"""
-        if not self.dbus_service:
+        if not self.available:
             return False
         try:
-            self.dbus_service.EnableExtension(extension_id, dbus_interface='org.gnome.Shell.Extensions')
-            print(f"Enabled extension: {extension_id}")
+            session_bus.call_sync(SHELL_EXTENSIONS, "EnableExtension", GLib.Variant("(s)", (extension_id,)))
+            logger.info("Enabled extension: %s", extension_id)
             return True
         except Exception as e:
-            print(f"Error enabling extension {extension_id}: {e}")
+            logger.error("Error enabling extension %s: %s", extension_id, e)
         return False
     
     def disable_extension(self, extension_id):
         """Disable an extension"""
-        if not self.dbus_service:
+        if not self.available:
             return False
         try:
-            self.dbus_service.DisableExtension(extension_id, dbus_interface='org.gnome.Shell.Extensions')
-            print(f"Disabled extension: {extension_id}")
+            session_bus.call_sync(SHELL_EXTENSIONS, "DisableExtension", GLib.Variant("(s)", (extension_id,)))
+            logger.info("Disabled extension: %s", extension_id)
             return True
         except Exception as e:
-            print(f"Error disabling extension {extension_id}: {e}")
+            logger.error("Error disabling extension %s: %s", extension_id, e)
         return False
     
+    async def get_enabled_extensions_async(self):
+        """Awaitable version of get_enabled_extensions()"""
+        if not self.available:
+            return []
+        try:
+            (extensions,) = await session_bus.call(SHELL_EXTENSIONS, "ListExtensions")
+            return [ext_id for ext_id, ext_info in extensions.items() if ext_info.get('state') == 1]
+        except Exception as e:
+            logger.warning("Failed to get enabled extensions via D-Bus: %s", e)
+        return []
+
+    async def is_extension_enabled_async(self, extension_id):
+        """Awaitable version of is_extension_enabled()"""
+        return extension_id in await self.get_enabled_extensions_async()
+
+    async def enable_extension_async(self, extension_id):
+        """Awaitable version of enable_extension(); returns once GNOME Shell has replied"""
+        if not self.available:
+            return False
+        try:
+            await session_bus.call(SHELL_EXTENSIONS, "EnableExtension", GLib.Variant("(s)", (extension_id,)))
+            logger.info("Enabled extension: %s", extension_id)
+            return True
+        except Exception as e:
+            logger.error("Error enabling extension %s: %s", extension_id, e)
+        return False
+
+    async def disable_extension_async(self, extension_id):
+        """Awaitable version of disable_extension(); returns once GNOME Shell has replied"""
+        if not self.available:
+            return False
+        try:
+            await session_bus.call(SHELL_EXTENSIONS, "DisableExtension", GLib.Variant("(s)", (extension_id,)))
+            logger.info("Disabled extension: %s", extension_id)
+            return True
+        except Exception as e:
+            logger.error("Error disabling extension %s: %s", extension_id, e)
+        return False
+
+    async def wait_for_user_extensions_async(self, enabled, timeout=USER_EXTENSIONS_TIMEOUT):
+        """
+        Waits until GNOME Shell reports user extensions as enabled or disabled,
+        that is until it has seen the disable-user-extensions setting change.
+        Returns False on timeout or if the shell cannot be asked.
+        """
+        if not self.available:
+            return False
+        applied = asyncio.get_running_loop().create_future()
+
+        def on_properties_changed(changed_properties):
+            if changed_properties.get("UserExtensionsEnabled") == enabled and not applied.done():
+                applied.set_result(True)
+
+        # Subscribed before reading the property, so a change in between is not missed
+        watch = session_bus.watch_properties(SHELL_EXTENSIONS, on_properties_changed)
+        try:
+            (user_extensions_enabled,) = await session_bus.call(
+                SHELL_EXTENSIONS, "org.freedesktop.DBus.Properties.Get",
+                GLib.Variant("(ss)", (SHELL_EXTENSIONS[2], "UserExtensionsEnabled")))
+            if user_extensions_enabled == enabled:
+                return True
+            return await asyncio.wait_for(applied, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out waiting for GNOME Shell to apply disable-user-extensions")
+        except Exception as e:
+            logger.warning("Could not read UserExtensionsEnabled via D-Bus: %s", e)
+        finally:
+            session_bus.unwatch_properties(watch)
+        return False
+
     def toggle_extension(self, extension_id):
         """Toggle extension state"""
         if self.is_extension_enabled(extension_id):
@@ -109,15 +165,7 @@ class ExtensionManager:
             return self.enable_extension(extension_id) 
 
     def is_extension_installed(self, extension_id):
-        # Check user and system extension directories
-        user_dir = os.path.expanduser("~/.local/share/gnome-shell/extensions")
-        system_dir = "/usr/share/gnome-shell/extensions"
-        for base in [user_dir, system_dir]:
-            if os.path.isdir(base):
-                for ext in os.listdir(base):
-                    if ext == extension_id:
-                        return True
-        return False 
+        return extension_id in installed_extension_index() 
 
     def get_sorted_extensions(self):
         """Get extensions sorted by installation status (installed first)"""
@@ -131,4 +179,23 @@ class ExtensionManager:
             else:
                 not_installed.append(extension)
         
-        return installed + not_installed 
\ No newline at end of file
+        return installed + not_installed
+
+
+def installed_extension_index(refresh=False):
+    """
+    Returns the set of extension UUIDs installed for the user or system-wide.
+    The extension directories are listed once and the result is reused.
+    """
+    global _installed_index
+    with _installed_index_lock:
+        if _installed_index is None or refresh:
+            index = set()
+            # Check user and system extension directories
+            user_dir = os.path.expanduser("~/.local/share/gnome-shell/extensions")
+            system_dir = "/usr/share/gnome-shell/extensions"
+            for base in [user_dir, system_dir]:
+                if os.path.isdir(base):
+                    index.update(os.listdir(base))
+            _installed_index = frozenset(index)
+        return _installed_index
@@ -1,27 +1,33 @@
-import json
-import os
 from gi.repository import Gio, GLib
 
 # Import ExtensionManager
 from .ExtensionManager import ExtensionManager
-from .settings import app_settings, SettingsManager, shell_settings
+from . import catalog
+from .settings import app_settings, shell_settings, get_settings, get_settings_manager
+from ..event_loop import spawn, run_sync, run_in_executor
+from ..executor import PRIORITY_HIGH
+from ..refresh import refresh_scheduler
+from ..log import get_logger
+from ..diagnostics.history import perf_history
+
+logger = get_logger("layout")
 
 class LayoutManager:
-    def __init__(self, config_path="/tr/org/pardus/pardus-gnome-greeter/json/layout_config.json"):
-        self.config_path = config_path
-        
+    def __init__(self, document="layout_config.json"):
         try:
-            config_data = self._load_layouts()
-            self.global_resets = config_data.pop("global_resets", [])
-            self.always_enabled_extensions = config_data.pop("always_enabled_extensions", [])
-            self.layouts = config_data
-        except Exception as e:
-            print(f"Warning: Could not initialize LayoutManager: {e}")
+            # Parsed once per process; the layouts are shared read-only views
+            config_data = catalog.load(document)
+            self.global_resets = config_data.get("global_resets", ())
+            self.always_enabled_extensions = config_data.get("always_enabled_extensions", ())
+            self.layouts = {name: layout for name, layout in config_data.items()
+                            if name not in catalog.LAYOUT_META_KEYS}
+        except catalog.CatalogError as e:
+            logger.warning("Could not initialize LayoutManager: %s", e)
             self.layouts = {}
-            self.global_resets = []
+            self.global_resets = ()
+            self.always_enabled_extensions = ()
 
-        # For sequential layout application
-        self.task_queue = []
+        # Only one layout is applied at a time
         self.is_applying_layout = False
         
         # Initialize ExtensionManager
@@ -48,10 +54,10 @@ class LayoutManager:
             # First, try to get the layout from GSettings
             saved_layout = app_settings.get("layout-name")
             if saved_layout and saved_layout in self.layouts:
-                print(f"Detected current layout from GSettings: {saved_layout}")
+                logger.info("Detected current layout from GSettings: %s", saved_layout)
                 return saved_layout
         except Exception as e:
-            print(f"Could not read saved layout from GSettings, falling back to extension check. Error: {e}")
+            logger.warning("Could not read saved layout from GSettings, falling back to extension check. Error: %s", e)
 
         # Fallback to extension-based detection if GSetting is not available
         try:
@@ -76,51 +82,17 @@ class LayoutManager:
                     # We can refine this by checking a key setting if needed
                     disabled_extensions = set(layout_info.get("disable", []))
                     if not disabled_extensions.intersection(enabled_set):
-                        print(f"Detected current layout: {layout_name}")
+                        logger.info("Detected current layout: %s", layout_name)
                         return layout_name
             
             # Fallback to 'gnome' if no other layout matches
-            print("Could not detect a specific layout, falling back to 'gnome'")
+            logger.warning("Could not detect a specific layout, falling back to 'gnome'")
             return 'gnome'
 
         except Exception as e:
-            print(f"Error detecting current layout by extensions: {e}")
+            logger.error("Error detecting current layout by extensions: %s", e)
             return 'gnome'  # Fallback in case of error
 
-    def _load_layouts(self):
-        """Load layout configuration from GResource with fallback to filesystem"""
-        # Try GResource first
-        try:
-            file = Gio.File.new_for_uri(f'resource://{self.config_path}')
-            success, data, _ = file.load_contents(None)
-            if success:
-                json_data = data.decode('utf-8')
-                return json.loads(json_data)
-        except Exception as e:
-            pass  # Fall through to filesystem fallback
-        
-        # Fallback: Try to load from filesystem
-        try:
-            filename = os.path.basename(self.config_path)
-            fallback_paths = [
-                f"/usr/share/pardus-gnome-greeter/json/{filename}",
-                f"/usr/local/share/pardus-gnome-greeter/json/{filename}",
-            ]
-            
-            for fallback_path in fallback_paths:
-                if os.path.exists(fallback_path):
-                    with open(fallback_path, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-            
-            raise FileNotFoundError(
-                f"Layout configuration not found in GResource ({self.config_path}) "
-                f"or filesystem. Tried: {', '.join(fallback_paths)}"
-            )
-        except FileNotFoundError:
-            raise
-        except Exception as e:
-            raise FileNotFoundError(f"Error loading layout configuration: {e}")
-
     def _get_all_managed_extensions(self):
         all_extensions = set()
         for layout_data in self.layouts.values():
@@ -142,30 +114,30 @@ class LayoutManager:
 
     def _set_gsetting(self, schema_id, key, value, value_type=None):
         try:
-            # Check if schema exists before trying to use it to prevent crashes
-            schema_source = Gio.SettingsSchemaSource.get_default()
-            if not schema_source.lookup(schema_id, True):
-                print(f"Warning: Schema '{schema_id}' not found. Skipping setting key '{key}'.")
+            # Shared handle from the settings pool; None if the schema is not installed
+            settings_manager = get_settings_manager(schema_id)
+            if settings_manager is None:
+                logger.warning("Schema '%s' not found. Skipping setting key '%s'.", schema_id, key)
                 return
             
-            print(f"DEBUG: Setting {schema_id} [{key}] - value type: {type(value).__name__}, value length: {len(str(value)) if isinstance(value, str) else 'N/A'}")
-                
-            # Use the generic SettingsManager for dynamic schemas
-            settings_manager = SettingsManager(schema_id)
-            success = settings_manager.set(key, value)
+            success = settings_manager.set(key, catalog.thaw(value))
             
             if success:
-                print(f"SUCCESS: Set {schema_id} [{key}] to {value} (Type: {type(value).__name__})")
+                logger.debug("Set %s [%s] to %.100s", schema_id, key, value)
             else:
-                print(f"ERROR: Failed to set {schema_id} [{key}] - SettingsManager.set returned False")
+                logger.error("Failed to set %s [%s] - SettingsManager.set returned False", schema_id, key)
 
         except GLib.Error as e:
-            print(f"ERROR: Failed to set GSetting {schema_id} [{key}]: {e.message}")
+            logger.error("Failed to set GSetting %s [%s]: %s", schema_id, key, e.message)
         except Exception as e:
-            print(f"UNEXPECTED ERROR: Could not set gsetting {schema_id} [{key}]: {e}")
+            logger.error("Could not set gsetting %s [%s]: %s", schema_id, key, e)
 
 
-    def _task_toggle_user_extensions(self, enable):
+    async def _sync_settings(self):
+        """Waits until pending GSettings writes have reached dconf"""
+        await run_in_executor(Gio.Settings.sync, priority=PRIORITY_HIGH)
+
+    async def _task_toggle_user_extensions(self, enable):
         """Enable or disable all user extensions using GSettings."""
         try:
             # Logic is inverted: enable=True means disable-user-extensions=False
@@ -174,16 +146,20 @@ class LayoutManager:
             
             if shell_settings.set("disable-user-extensions", disable_value):
                 status = "Enabled" if enable else "Disabled"
-                print(f"--- All user extensions {status} (via GSettings) ---")
+                logger.info("All user extensions %s (via GSettings)", status)
             else:
-                 print("Failed to toggle user extensions via GSettings.")
+                 logger.warning("Failed to toggle user extensions via GSettings.")
         except Exception as e:
-            print(f"Error toggling user extensions via GSettings: {e}")
+            logger.error("Error toggling user extensions via GSettings: %s", e)
+
+        # Continue once GNOME Shell has acted on the setting
+        await self._sync_settings()
+        await self.extension_manager.wait_for_user_extensions_async(enable)
 
-    def _task_reset_settings(self, layout_name):
+    async def _task_reset_settings(self, layout_name):
         """Resets GSettings to their default values for schemas used by the target layout."""
         if self.global_resets:
-            print("--- Applying Global Resets ---")
+            logger.info("Applying Global Resets")
             for reset_config in self.global_resets:
                 schema_id, key, value, value_type = (
                     reset_config.get("schema"),
@@ -211,47 +187,47 @@ class LayoutManager:
         
         for schema_id in layout_schemas:
             try:
-                # Check if schema exists before trying to use it to prevent crashes
-                schema_source = Gio.SettingsSchemaSource.get_default()
-                if not schema_source.lookup(schema_id, True):
-                    print(f"Warning: Schema '{schema_id}' not found. Skipping reset for this schema.")
+                settings = get_settings(schema_id)
+                if settings is None:
+                    logger.warning("Schema '%s' not found. Skipping reset for this schema.", schema_id)
                     continue
 
-                settings = Gio.Settings.new(schema_id)
-                print(f"--- Resetting all keys for schema: {schema_id} ---")
+                logger.debug("Resetting all keys for schema: %s", schema_id)
                 for key in settings.list_keys():
                     if settings.is_writable(key):
                         settings.reset(key)
             except Exception as e:
-                print(f"Warning: Failed to reset schema {schema_id}. It might not be installed. Error: {e}")
+                logger.warning("Failed to reset schema %s. It might not be installed. Error: %s", schema_id, e)
 
-    def _task_apply_layout_extensions(self, layout_name):
+        await self._sync_settings()
+
+    async def _task_apply_layout_extensions(self, layout_name):
         """Enables and disables extensions specific to the chosen layout."""
         layout_data = self.layouts.get(layout_name, {})
         
         enable_list = layout_data.get("enable", [])
         disable_list = layout_data.get("disable", [])
         
-        print(f"DEBUG: Layout '{layout_name}' - Enable: {enable_list}, Disable: {disable_list}")
+        logger.debug("Layout '%s' - Enable: %s, Disable: %s", layout_name, enable_list, disable_list)
         
         for ext_uuid in enable_list:
             try:
-                print(f"DEBUG: Attempting to enable extension: {ext_uuid}")
-                self.extension_manager.enable_extension(ext_uuid)
+                logger.debug("Attempting to enable extension: %s", ext_uuid)
+                await self.extension_manager.enable_extension_async(ext_uuid)
             except Exception as e:
-                print(f"ERROR: Failed to enable extension {ext_uuid}: {e}")
+                logger.error("Failed to enable extension %s: %s", ext_uuid, e)
         
         for ext_uuid in disable_list:
             if ext_uuid in self.always_enabled_extensions:
-                print(f"INFO: Skipping disable for '{ext_uuid}' as it is marked as always enabled.")
+                logger.info("Skipping disable for '%s' as it is marked as always enabled.", ext_uuid)
                 continue
             try:
-                print(f"DEBUG: Attempting to disable extension: {ext_uuid}")
-                self.extension_manager.disable_extension(ext_uuid)
+                logger.debug("Attempting to disable extension: %s", ext_uuid)
+                await self.extension_manager.disable_extension_async(ext_uuid)
             except Exception as e:
-                print(f"Warning: Failed to disable extension {ext_uuid}: {e}")
+                logger.warning("Failed to disable extension %s: %s", ext_uuid, e)
 
-    def _task_apply_layout_gsettings(self, layout_name):
+    async def _task_apply_layout_gsettings(self, layout_name):
         """Applies the GSettings configurations for the chosen layout."""
         layout_data = self.layouts.get(layout_name, {})
 
@@ -263,61 +239,84 @@ class LayoutManager:
                 config.get("type"),
             )
             if schema_id and key and value is not None:
-                # Debug: check value type
-                print(f"DEBUG: Processing config - schema: {schema_id}, key: {key}, value type: {type(value).__name__}, value: {str(value)[:100]}...")
-                
                 self._set_gsetting(schema_id, key, value, value_type)
         
         app_settings.set("layout-name", layout_name)
-        print(f"SUCCESS: Set layout-name to {layout_name}")
+        logger.info("Set layout-name to %s", layout_name)
 
-    def _process_next_task(self):
-        if not self.task_queue:
-            self.is_applying_layout = False
-            print("--- Layout application finished successfully ---")
-            return False
+        await self._sync_settings()
 
-        task_func, task_args, delay = self.task_queue.pop(0)
+    def _start_layout(self, layout_name):
+        """Marks a layout application as running; returns False if it cannot start"""
+        if not self.layouts.get(layout_name):
+            logger.error("Layout '%s' not found in configuration.", layout_name)
+            return False
 
-        try:
-            print(f"--- Running task: {task_func.__name__} ---")
-            task_func(*task_args)
-        except Exception as e:
-            print(f"ERROR: An error occurred in task {task_func.__name__}: {e}")
-            self.is_applying_layout = False
-            self.task_queue = []
+        if self.is_applying_layout:
+            logger.warning("Another layout application is already in progress. Ignoring request.")
             return False
 
-        if self.task_queue:
-            GLib.timeout_add(delay, self._process_next_task)
-        else:
+        self.is_applying_layout = True
+        logger.info("Applying layout: %s", layout_name)
+        return True
+
+    async def _run_layout(self, layout_name):
+        """Runs the layout steps in order, each one after the previous has completed"""
+        tasks = [
+            (self._task_toggle_user_extensions, False),
+            (self._task_reset_settings, layout_name),
+            (self._task_apply_layout_gsettings, layout_name),
+            (self._task_apply_layout_extensions, layout_name),
+            (self._task_toggle_user_extensions, True),
+        ]
+        # Pages refresh once after the layout instead of on every settings signal
+        refresh_scheduler.begin_bulk()
+        try:
+            with perf_history.measure("layout_apply"):
+                for task_func, task_arg in tasks:
+                    logger.debug("Running task: %s", task_func.__name__)
+                    try:
+                        await task_func(task_arg)
+                    except Exception as e:
+                        logger.error("An error occurred in task %s: %s", task_func.__name__, e)
+                        return False
+        finally:
             self.is_applying_layout = False
-            print("--- Layout application finished successfully ---")
+            refresh_scheduler.end_bulk()
 
-        return False
+        logger.info("Layout application finished successfully")
+        return True
 
-    def apply_layout(self, layout_name):
-        layout_data = self.layouts.get(layout_name)
-        if not layout_data:
-            print(f"ERROR: Layout '{layout_name}' not found in configuration.")
-            return
+    async def apply_layout_async(self, layout_name):
+        """
+        Applies the given layout on the main loop.
+        Returns True on success and False if it failed or could not be started.
+        """
+        if not self._start_layout(layout_name):
+            return False
+        return await self._run_layout(layout_name)
 
-        if self.is_applying_layout:
-            print("WARNING: Another layout application is already in progress. Ignoring request.")
-            return
+    def apply_layout(self, layout_name, callback=None):
+        """
+        Starts applying the given layout on the main loop.
+        The optional callback is called with a success flag once every task has run.
+        Returns False if the layout could not be started.
+        """
+        if not self._start_layout(layout_name):
+            return False
 
-        self.is_applying_layout = True
-        print(f"--- Applying layout: {layout_name} ---")
-
-        self.task_queue = [
-            (self._task_toggle_user_extensions, [False], 100),
-            (self._task_reset_settings, [layout_name], 300),
-            (self._task_apply_layout_gsettings, [layout_name], 100),
-            (self._task_apply_layout_extensions, [layout_name], 500),
-            (self._task_toggle_user_extensions, [True], 500),
-        ]
+        task = spawn(self._run_layout(layout_name))
+        if callback:
+            task.add_done_callback(
+                lambda task: callback(not task.cancelled() and task.exception() is None and task.result()))
+        return True
 
-        self._process_next_task()
+    def apply_layout_sync(self, layout_name):
+        """
+        Applies the given layout and blocks until every task has run,
+        iterating the main context meanwhile. Returns True on success.
+        """
+        return run_sync(self.apply_layout_async(layout_name))
 
 # Example usage (for testing purposes)
 if __name__ == '__main__':
@@ -331,17 +330,21 @@ if __name__ == '__main__':
         parser.add_argument("-a", "--apply", metavar="LAYOUT", help="Apply the specified layout and exit.")
         args = parser.parse_args()
 
-        manager = LayoutManager(config_path="/tr/org/pardus/pardus-gnome-greeter/json/layout_config.json")
+        from ..event_loop import install
+        install()
+
+        manager = LayoutManager()
         
         if args.apply:
             if args.apply in manager.layouts:
                 print(f"Applying layout '{args.apply}' from command line...")
-                manager.apply_layout(args.apply)
-                print("Done.")
+                success = manager.apply_layout_sync(args.apply)
+                print("Done." if success else "Failed.")
+                sys.exit(0 if success else 1)
             else:
                 print(f"Error: Layout '{args.apply}' not found.")
                 print("Available layouts:", list(manager.layouts.keys()))
-            sys.exit(0)
+                sys.exit(1)
 
         # --- Default interactive test script ---
         print("\nAvailable layouts:", list(manager.layouts.keys()))
@@ -1,76 +1,49 @@
-import json
 import re
-import os
-from gi.repository import Gio
+from . import catalog
+from .settings import get_settings
+from ..log import get_logger
+
+logger = get_logger("shortcuts")
 
 class ShortcutManager:
     def __init__(self, 
-                 custom_shortcuts_path="/tr/org/pardus/pardus-gnome-greeter/json/custom_shortcuts.json",
-                 standard_shortcuts_path="/tr/org/pardus/pardus-gnome-greeter/json/shortcuts.json"):
-        self.custom_shortcuts_path = custom_shortcuts_path
-        self.standard_shortcuts_path = standard_shortcuts_path
+                 custom_shortcuts_document="custom_shortcuts.json",
+                 standard_shortcuts_document="shortcuts.json"):
+        self.custom_shortcuts_document = custom_shortcuts_document
+        self.standard_shortcuts_document = standard_shortcuts_document
         self.media_keys_schema_id = "org.gnome.settings-daemon.plugins.media-keys"
         self.custom_binding_schema_id = "org.gnome.settings-daemon.plugins.media-keys.custom-keybinding"
         self.custom_bindings_key = "custom-keybindings"
-        self.media_keys_settings = Gio.Settings.new(self.media_keys_schema_id)
-
-    def _load_json_from_gresource(self, path):
-        """Loads a JSON file from the GResource bundle with fallback to filesystem."""
-        # Try GResource first
-        try:
-            file = Gio.File.new_for_uri(f'resource://{path}')
-            success, data, _ = file.load_contents(None)
-            if success:
-                json_data = data.decode('utf-8')
-                return json.loads(json_data)
-        except Exception as e:
-            pass  # Fall through to filesystem fallback
-        
-        # Fallback: Try to load from filesystem
-        try:
-            # Extract filename from GResource path
-            filename = os.path.basename(path)
-            # Try common installation paths
-            fallback_paths = [
-                f"/usr/share/pardus-gnome-greeter/json/{filename}",
-                f"/usr/local/share/pardus-gnome-greeter/json/{filename}",
-            ]
-            
-            for fallback_path in fallback_paths:
-                if os.path.exists(fallback_path):
-                    with open(fallback_path, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-            
-            print(f"Warning: Could not load JSON from GResource ({path}) or filesystem")
-            return None
-        except Exception as e:
-            print(f"Error loading JSON from {path}: {e}")
-            return None
+        self.media_keys_settings = get_settings(self.media_keys_schema_id)
 
     def apply_standard_shortcuts(self):
         """Applies standard keyboard shortcuts by setting existing GSettings keys."""
-        shortcuts = self._load_json_from_gresource(self.standard_shortcuts_path)
+        shortcuts = catalog.get(self.standard_shortcuts_document)
         if not shortcuts:
-            print("No standard shortcuts to apply.")
+            logger.info("No standard shortcuts to apply.")
             return
 
-        print("--- Applying Standard Keyboard Shortcuts ---")
+        logger.info("Applying Standard Keyboard Shortcuts")
         for shortcut in shortcuts:
             schema_id = shortcut.get("schema")
             key = shortcut.get("key")
             binding = shortcut.get("binding")
 
             if not all([schema_id, key, binding]):
-                print(f"Skipping invalid standard shortcut entry: {shortcut}")
+                logger.debug("Skipping invalid standard shortcut entry: %s", shortcut)
                 continue
             
+            settings = get_settings(schema_id)
+            if settings is None:
+                logger.warning("Schema '%s' not found. Skipping shortcut [%s].", schema_id, key)
+                continue
+
             try:
-                settings = Gio.Settings.new(schema_id)
                 settings.set_strv(key, [binding])
-                print(f"SUCCESS: Set shortcut for {schema_id} [{key}] to '{binding}'.")
+                logger.info("Set shortcut for %s [%s] to '%s'.", schema_id, key, binding)
             except Exception as e:
-                print(f"ERROR: Failed to set shortcut for {schema_id} [{key}]. Error: {e}")
-        print("--- Finished Applying Standard Shortcuts ---")
+                logger.error("Failed to set shortcut for %s [%s]. Error: %s", schema_id, key, e)
+        logger.info("Finished Applying Standard Shortcuts")
 
     def apply_custom_shortcuts(self):
         """
@@ -78,12 +51,16 @@ class ShortcutManager:
         This function is idempotent and avoids creating duplicate shortcuts
         by checking the name and command of existing shortcuts.
         """
-        shortcuts_to_add = self._load_json_from_gresource(self.custom_shortcuts_path)
+        shortcuts_to_add = catalog.get(self.custom_shortcuts_document)
         if not shortcuts_to_add:
-            print("No custom shortcuts to apply.")
+            logger.info("No custom shortcuts to apply.")
             return
 
-        print("--- Applying Custom Keyboard Shortcuts ---")
+        logger.info("Applying Custom Keyboard Shortcuts")
+        
+        if self.media_keys_settings is None:
+            logger.warning("Schema '%s' not found. Skipping custom shortcuts.", self.media_keys_schema_id)
+            return
         
         existing_paths = self.media_keys_settings.get_strv(self.custom_bindings_key)
         
@@ -91,7 +68,7 @@ class ShortcutManager:
         existing_shortcuts = set()
         for path in existing_paths:
             try:
-                settings = Gio.Settings.new_with_path(self.custom_binding_schema_id, path)
+                settings = get_settings(self.custom_binding_schema_id, path)
                 name = settings.get_string("name")
                 command = settings.get_string("command")
                 existing_shortcuts.add((name, command))
@@ -112,41 +89,41 @@ class ShortcutManager:
             binding = shortcut.get("binding")
 
             if not all([name, command, binding]):
-                print(f"Skipping invalid shortcut entry: {shortcut}")
+                logger.debug("Skipping invalid shortcut entry: %s", shortcut)
                 continue
 
             if (name, command) in existing_shortcuts:
-                print(f"Shortcut '{name}' with command '{command}' already exists. Skipping.")
+                logger.debug("Shortcut '%s' with command '%s' already exists. Skipping.", name, command)
                 continue
 
             # Construct the new path using the customX scheme
             new_path = f"/org/gnome/settings-daemon/plugins/media-keys/custom-keybindings/custom{next_custom_index}/"
             
             try:
-                shortcut_settings = Gio.Settings.new_with_path(self.custom_binding_schema_id, new_path)
+                shortcut_settings = get_settings(self.custom_binding_schema_id, new_path)
                 shortcut_settings.set_string("name", name)
                 shortcut_settings.set_string("command", command)
                 shortcut_settings.set_string("binding", binding)
                 
                 new_paths_to_add.append(new_path)
                 existing_shortcuts.add((name, command)) # Add to set to handle duplicates in the JSON
-                print(f"SUCCESS: Prepared new shortcut '{name}' at path {new_path}.")
+                logger.info("Prepared new shortcut '%s' at path %s.", name, new_path)
                 next_custom_index += 1
 
             except Exception as e:
-                print(f"ERROR: Failed to create settings for shortcut '{name}'. Error: {e}")
+                logger.error("Failed to create settings for shortcut '%s'. Error: %s", name, e)
 
         if new_paths_to_add:
             updated_paths = existing_paths + new_paths_to_add
             try:
                 self.media_keys_settings.set_strv(self.custom_bindings_key, updated_paths)
-                print(f"SUCCESS: Added {len(new_paths_to_add)} new shortcut(s) to the system list.")
+                logger.info("Added %s new shortcut(s) to the system list.", len(new_paths_to_add))
             except Exception as e:
-                print(f"ERROR: Failed to update custom-keybindings list. Error: {e}")
+                logger.error("Failed to update custom-keybindings list. Error: %s", e)
         else:
-            print("No new custom shortcuts were added.")
+            logger.info("No new custom shortcuts were added.")
 
-        print("--- Finished Applying Custom Shortcuts ---")
+        logger.info("Finished Applying Custom Shortcuts")
 
 
 # Example usage (for testing)
@@ -1,5 +1,9 @@
 import os
 from .settings import theme_settings, shell_settings
+from .state import settings_store, COLOR_SCHEME, ACCENT_COLOR, GTK_THEME, ICON_THEME
+from ..log import get_logger
+
+logger = get_logger("theme")
 
 class ThemeManager:
     def __init__(self):
@@ -16,33 +20,33 @@ class ThemeManager:
             try:
                 callback(color_name)
             except Exception as e:
-                print(f"Error in accent color callback: {e}")
+                logger.error("Error in accent color callback: %s", e)
         
     def get_current_color_scheme(self):
         """Get current color scheme (default or prefer-dark)"""
         try:
-            return theme_settings.get("color-scheme")
+            return settings_store.get(COLOR_SCHEME, "default")
         except:
             return "default"
             
     def get_current_accent_color(self):
         """Get current accent color"""
         try:
-            return theme_settings.get("accent-color")
+            return settings_store.get(ACCENT_COLOR, "blue")
         except:
             return "blue"  # Default accent color
         
     def get_current_gtk_theme(self):
         """Get current GTK theme"""
         try:
-            return theme_settings.get("gtk-theme")
+            return settings_store.get(GTK_THEME, "Adwaita")
         except:
             return "Adwaita"
 
     def get_current_icon_theme(self):
         """Get current icon theme"""
         try:
-            return theme_settings.get("icon-theme")
+            return settings_store.get(ICON_THEME, "Adwaita")
         except:
             return "Adwaita"
         
@@ -52,7 +56,7 @@ class ThemeManager:
             theme_settings.set("color-scheme", scheme)
             return True
         except Exception as e:
-            print(f"Error setting color scheme: {e}")
+            logger.error("Error setting color scheme: %s", e)
             return False
         
     def set_gtk_theme(self, theme):
@@ -61,7 +65,7 @@ class ThemeManager:
             theme_settings.set("gtk-theme", theme)
             return True
         except Exception as e:
-            print(f"Error setting GTK theme: {e}")
+            logger.error("Error setting GTK theme: %s", e)
             return False
 
     def set_icon_theme(self, theme):
@@ -70,7 +74,7 @@ class ThemeManager:
             theme_settings.set("icon-theme", theme)
             return True
         except Exception as e:
-            print(f"Error setting icon theme: {e}")
+            logger.error("Error setting icon theme: %s", e)
             return False
             
     def set_accent_color(self, color_name):
@@ -78,7 +82,7 @@ class ThemeManager:
         try:
             # Set accent color through gsettings
             theme_settings.set("accent-color", color_name)
-            print(f"Successfully set accent color to: {color_name}")
+            logger.info("Successfully set accent color to: %s", color_name)
             
             # Notify callbacks
             self.notify_accent_color_change(color_name)
@@ -86,7 +90,7 @@ class ThemeManager:
             return True
                 
         except Exception as e:
-            print(f"Error setting accent color: {e}")
+            logger.error("Error setting accent color: %s", e)
             return False
         
     def apply_light_theme(self):
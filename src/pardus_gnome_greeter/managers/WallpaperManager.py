@@ -1,10 +1,24 @@
 import os
 import glob
+import threading
+from collections import OrderedDict
 import gi
 gi.require_version('GdkPixbuf', '2.0')
-from gi.repository import GdkPixbuf, GLib
+from gi.repository import GLib
 from pathlib import Path
 from .settings import background_settings, theme_settings
+from ..event_loop import run_in_executor
+from ..log import get_logger
+from ..diagnostics.history import perf_history
+
+logger = get_logger("wallpaper")
+
+# Scan results and thumbnails are shared between manager instances so that
+# data prefetched before the wallpaper page opens is reused by the page
+THUMBNAIL_CACHE_SIZE = 64
+_scanned_wallpapers = None
+_thumbnails = OrderedDict()
+_cache_lock = threading.Lock()
 
 class WallpaperManager:
     def __init__(self):
@@ -34,14 +48,14 @@ class WallpaperManager:
                 uri = uri[7:]
             return uri
         except Exception as e:
-            print(f"Error getting current wallpaper: {e}")
+            logger.error("Error getting current wallpaper: %s", e)
             return None
             
     def set_wallpaper(self, file_path):
         """Set wallpaper for both light and dark themes"""
         try:
             if not os.path.exists(file_path):
-                print(f"Wallpaper file does not exist: {file_path}")
+                logger.warning("Wallpaper file does not exist: %s", file_path)
                 return False
             
             uri = f"file://{file_path}"
@@ -49,17 +63,24 @@ class WallpaperManager:
             result2 = background_settings.set("picture-uri-dark", uri)
             
             if result1 is False or result2 is False:
-                print(f"Failed to set wallpaper settings for: {file_path}")
+                logger.warning("Failed to set wallpaper settings for: %s", file_path)
                 return False
             
-            print(f"Wallpaper set successfully: {file_path}")
+            logger.info("Wallpaper set successfully: %s", file_path)
             return True
         except Exception as e:
-            print(f"Error setting wallpaper: {e}")
+            logger.error("Error setting wallpaper: %s", e)
             return False
             
-    def get_wallpapers(self):
-        """Get list of available wallpapers"""
+    def get_wallpapers(self, cached=False):
+        """
+        Get list of available wallpapers.
+        With cached=True the result of an earlier scan is returned if there is one.
+        """
+        global _scanned_wallpapers
+        if cached and _scanned_wallpapers is not None:
+            return list(_scanned_wallpapers)
+
         wallpapers = []
         
         for directory in self.wallpaper_dirs:
@@ -75,23 +96,39 @@ class WallpaperManager:
         wallpapers = list(set(wallpapers))
         wallpapers.sort()
         
+        _scanned_wallpapers = list(wallpapers)
         return wallpapers
     
+    async def get_wallpapers_async(self, cached=False, cancellable=None):
+        """Awaitable version of get_wallpapers(); the directories are scanned on the shared executor"""
+        return await run_in_executor(self.get_wallpapers, cached, cancellable=cancellable)
+    
     def create_thumbnail(self, file_path, width=160, height=120):
         """Create thumbnail for wallpaper preview"""
+        key = (file_path, width, height)
+        with _cache_lock:
+            if key in _thumbnails:
+                _thumbnails.move_to_end(key)
+                return _thumbnails[key]
+
         try:
-            # Load the original image
-            pixbuf = GdkPixbuf.Pixbuf.new_from_file(file_path)
-            
-            # Scale to exact dimensions (stretch to fit)
-            scaled_pixbuf = pixbuf.scale_simple(
-                width, height, 
-                GdkPixbuf.InterpType.BILINEAR
-            )
+            # GdkPixbuf is only needed once thumbnails are actually created
+            from gi.repository import GdkPixbuf
+
+            # Decode straight at thumbnail size (stretch to fit), so loaders
+            # like JPEG can skip most of the full-size image
+            with perf_history.measure("thumbnail"):
+                scaled_pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(
+                    file_path, width, height, False
+                )
             
+            with _cache_lock:
+                _thumbnails[key] = scaled_pixbuf
+                while len(_thumbnails) > THUMBNAIL_CACHE_SIZE:
+                    _thumbnails.popitem(last=False)
             return scaled_pixbuf
         except Exception as e:
-            print(f"Error creating thumbnail for {file_path}: {e}")
+            logger.error("Error creating thumbnail for %s: %s", file_path, e)
             return None
             
     def get_wallpaper_name(self, file_path):
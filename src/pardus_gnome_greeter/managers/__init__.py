@@ -2,23 +2,26 @@
 Manager modules
 
 This module contains manager classes used to manage GNOME desktop settings.
+
+The classes are imported on first access, so importing this package does
+not pull in D-Bus bindings or image loaders that are never used.
 """
 
-from .ShortcutManager import ShortcutManager
-from .ThemeManager import ThemeManager
-from .WallpaperManager import WallpaperManager
-from .DisplayManager import DisplayManager
-from .ExtensionManager import ExtensionManager
-from .LayoutManager import LayoutManager
-from .settings import SettingsManager
+from ..lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    'ShortcutManager': '.ShortcutManager',
+    'ThemeManager': '.ThemeManager',
+    'WallpaperManager': '.WallpaperManager',
+    'DisplayManager': '.DisplayManager',
+    'ExtensionManager': '.ExtensionManager',
+    'LayoutManager': '.LayoutManager',
+    'SettingsManager': '.settings',
+    'BusRegistry': '.bus',
+    'SettingsStore': '.state',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
 
-__all__ = [
-    'ShortcutManager',
-    'ThemeManager',
-    'WallpaperManager',
-    'DisplayManager',
-    'ExtensionManager',
-    'LayoutManager',
-    'SettingsManager',
-]
 
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+
+from gi.repository import Gio, GLib
+from ..log import get_logger
+from ..diagnostics.dbus_trace import dbus_tracer
+
+logger = get_logger("dbus")
+
+# (bus name, object path, interface) of the services the managers talk to
+SHELL_EXTENSIONS = ("org.gnome.Shell.Extensions", "/org/gnome/Shell/Extensions", "org.gnome.Shell.Extensions")
+DISPLAY_CONFIG = ("org.gnome.Mutter.DisplayConfig", "/org/gnome/Mutter/DisplayConfig", "org.gnome.Mutter.DisplayConfig")
+
+
+class BusRegistry:
+    """
+    Shares one D-Bus connection and one proxy per service between all managers.
+
+    The connection and the proxies are created on first use. If the bus
+    connection closes they are dropped and created again by the next call;
+    name owner changes (for example a restarted gnome-shell) are followed by
+    the proxies and reported to callbacks added with watch_name_owner().
+    """
+
+    def __init__(self, bus_type=Gio.BusType.SESSION):
+        self._bus_type = bus_type
+        self._connection = None
+        self._proxies = {}
+        self._owner_callbacks = {}
+        self._lock = threading.RLock()
+
+    def get_connection(self):
+        """Returns the bus connection, connecting if needed"""
+        with self._lock:
+            if self._connection is None or self._connection.is_closed():
+                connection = Gio.bus_get_sync(self._bus_type, None)
+                # Reconnect on the next call instead of exiting with the bus
+                connection.set_exit_on_close(False)
+                connection.connect("closed", self._on_connection_closed)
+                self._connection = connection
+                self._proxies = {}
+            return self._connection
+
+    def _on_connection_closed(self, connection, remote_peer_vanished, error):
+        logger.debug("D-Bus connection closed, reconnecting on next use")
+        with self._lock:
+            if self._connection is connection:
+                self._connection = None
+                self._proxies = {}
+
+    def get_proxy(self, service):
+        """Returns the shared Gio.DBusProxy for a (name, object path, interface) tuple"""
+        with self._lock:
+            proxy = self._proxies.get(service)
+            if proxy is None:
+                name, object_path, interface_name = service
+                proxy = Gio.DBusProxy.new_sync(
+                    self.get_connection(),
+                    Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES,
+                    None,
+                    name,
+                    object_path,
+                    interface_name,
+                    None,
+                )
+                proxy.connect("notify::g-name-owner", self._on_name_owner_changed)
+                self._proxies[service] = proxy
+            return proxy
+
+    def has_owner(self, service):
+        """Returns True if the service is currently running on the bus"""
+        try:
+            return self.get_proxy(service).get_name_owner() is not None
+        except GLib.Error as e:
+            logger.warning("Could not connect to %s: %s", service[0], e)
+            return False
+
+    def call_sync(self, service, method, parameters=None, timeout=-1):
+        """
+        Calls method on the service and returns the unpacked reply tuple.
+        Raises GLib.Error if the call fails.
+        """
+        if dbus_tracer.enabled:
+            with dbus_tracer.trace(service, method):
+                return self._call_sync(service, method, parameters, timeout)
+        return self._call_sync(service, method, parameters, timeout)
+
+    def _call_sync(self, service, method, parameters, timeout):
+        for attempt in range(2):
+            proxy = self.get_proxy(service)
+            try:
+                reply = proxy.call_sync(method, parameters, Gio.DBusCallFlags.NONE, timeout, None)
+                return reply.unpack() if reply is not None else ()
+            except GLib.Error:
+                # Retry once on a fresh connection if this one went away
+                if attempt == 0 and proxy.get_connection().is_closed():
+                    self._on_connection_closed(proxy.get_connection(), True, None)
+                    continue
+                raise
+
+    async def call(self, service, method, parameters=None, timeout=-1):
+        """
+        Awaitable version of call_sync() for coroutines running on the main
+        loop. The call is sent with Gio's asynchronous API, so the main loop
+        keeps running until the reply arrives.
+        """
+        if dbus_tracer.enabled:
+            with dbus_tracer.trace(service, method):
+                return await self._call(service, method, parameters, timeout)
+        return await self._call(service, method, parameters, timeout)
+
+    async def _call(self, service, method, parameters, timeout):
+        for attempt in range(2):
+            proxy = self.get_proxy(service)
+            future = asyncio.get_running_loop().create_future()
+            proxy.call(method, parameters, Gio.DBusCallFlags.NONE, timeout, None,
+                       self._on_call_finished, future)
+            try:
+                reply = await future
+                return reply.unpack() if reply is not None else ()
+            except GLib.Error:
+                if attempt == 0 and proxy.get_connection().is_closed():
+                    self._on_connection_closed(proxy.get_connection(), True, None)
+                    continue
+                raise
+
+    def _on_call_finished(self, proxy, result, future):
+        if future.done():
+            return
+        try:
+            future.set_result(proxy.call_finish(result))
+        except GLib.Error as e:
+            future.set_exception(e)
+
+    def watch_name_owner(self, service, callback):
+        """Calls callback(has_owner) on the main loop when the service appears or vanishes"""
+        with self._lock:
+            self._owner_callbacks.setdefault(service[0], []).append(callback)
+
+    def watch_properties(self, service, callback):
+        """
+        Calls callback(changed_properties) on the main loop when the service
+        emits PropertiesChanged. Returns a handle for unwatch_properties().
+        """
+        name, object_path, interface_name = service
+
+        def on_properties_changed(connection, sender_name, object_path, interface_name,
+                                  signal_name, parameters):
+            _interface, changed_properties, _invalidated = parameters.unpack()
+            try:
+                callback(changed_properties)
+            except Exception as e:
+                logger.error("Error in properties changed callback: %s", e)
+
+        connection = self.get_connection()
+        subscription_id = connection.signal_subscribe(
+            name, "org.freedesktop.DBus.Properties", "PropertiesChanged", object_path,
+            interface_name, Gio.DBusSignalFlags.NONE, on_properties_changed)
+        return connection, subscription_id
+
+    def unwatch_properties(self, handle):
+        """Stops a watch added with watch_properties()"""
+        connection, subscription_id = handle
+        connection.signal_unsubscribe(subscription_id)
+
+    def _on_name_owner_changed(self, proxy, pspec):
+        has_owner = proxy.get_name_owner() is not None
+        for callback in list(self._owner_callbacks.get(proxy.get_name(), [])):
+            try:
+                callback(has_owner)
+            except Exception as e:
+                logger.error("Error in name owner callback: %s", e)
+
+
+# Session bus registry shared by all managers
+session_bus = BusRegistry()
@@ -0,0 +1,149 @@
+"""
+Read-only catalog of the JSON documents shipped with the greeter.
+
+Each document is loaded and validated once per process and handed out as an
+immutable view: objects become MappingProxyType and arrays become tuples, so
+every manager can share the same copy. A document is looked up in the
+overlay directories first, then in the GResource bundle and last in the
+installed json directory. Administrators can replace a document by putting
+a file with the same name into /etc/pardus/pardus-gnome-greeter/json or into
+a directory listed in PARDUS_GNOME_GREETER_DATA_DIRS.
+"""
+import json
+import os
+import threading
+from types import MappingProxyType
+
+from gi.repository import Gio, GLib
+from ..log import get_logger
+
+logger = get_logger("catalog")
+
+RESOURCE_PREFIX = "/tr/org/pardus/pardus-gnome-greeter/json"
+OVERLAY_DIRS = tuple(
+    path for path in os.environ.get("PARDUS_GNOME_GREETER_DATA_DIRS", "").split(":") if path
+) + ("/etc/pardus/pardus-gnome-greeter/json",)
+INSTALLED_DIRS = (
+    "/usr/share/pardus/pardus-gnome-greeter/json",
+    "/usr/local/share/pardus/pardus-gnome-greeter/json",
+)
+
+# Keys of layout_config.json that are not layouts
+LAYOUT_META_KEYS = ("global_resets", "always_enabled_extensions")
+
+_documents = {}
+_lock = threading.Lock()
+
+
+class CatalogError(Exception):
+    """Raised when a document cannot be found or is malformed"""
+
+
+def _require_objects(document, name, required_keys=()):
+    if not isinstance(document, list):
+        raise CatalogError(f"{name}: expected a list")
+    for entry in document:
+        if not isinstance(entry, dict):
+            raise CatalogError(f"{name}: expected objects, got {entry!r}")
+        for key in required_keys:
+            if key not in entry:
+                raise CatalogError(f"{name}: entry without '{key}': {entry!r}")
+
+
+def _validate_layouts(document, name):
+    if not isinstance(document, dict):
+        raise CatalogError(f"{name}: expected an object")
+    for layout_name, layout in document.items():
+        if layout_name in LAYOUT_META_KEYS:
+            continue
+        if not isinstance(layout, dict):
+            raise CatalogError(f"{name}: layout '{layout_name}' is not an object")
+        for key in ("enable", "disable"):
+            if not all(isinstance(uuid, str) for uuid in layout.get(key, [])):
+                raise CatalogError(f"{name}: '{key}' of layout '{layout_name}' must list extension UUIDs")
+        _require_objects(layout.get("config", []), f"{name} ({layout_name})")
+    _require_objects(document.get("global_resets", []), f"{name} (global_resets)")
+
+
+VALIDATORS = {
+    "layout_config.json": _validate_layouts,
+    "extensions.json": lambda document, name: _require_objects(document, name, ("id",)),
+    "shortcuts.json": _require_objects,
+    "custom_shortcuts.json": _require_objects,
+}
+
+
+def freeze(value):
+    """Returns an immutable view of decoded JSON"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Returns a plain, mutable copy of a frozen value, e.g. for GLib.Variant"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _read(name):
+    """Returns the raw bytes of a document and where they came from"""
+    for directory in OVERLAY_DIRS:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                return f.read(), path
+
+    resource_path = f"{RESOURCE_PREFIX}/{name}"
+    try:
+        data = Gio.resources_lookup_data(resource_path, Gio.ResourceLookupFlags.NONE)
+        return data.get_data(), f"resource://{resource_path}"
+    except GLib.Error:
+        pass
+
+    for directory in INSTALLED_DIRS:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                return f.read(), path
+
+    raise CatalogError(
+        f"{name} not found in GResource ({resource_path}) or in "
+        f"{', '.join(OVERLAY_DIRS + INSTALLED_DIRS)}"
+    )
+
+
+def load(name):
+    """
+    Returns the immutable view of the JSON document called name, loading
+    and validating it on first use. Raises CatalogError on failure.
+    """
+    with _lock:
+        if name in _documents:
+            return _documents[name]
+
+        data, source = _read(name)
+        try:
+            document = json.loads(data.decode("utf-8"))
+        except ValueError as e:
+            raise CatalogError(f"{source}: {e}")
+        validator = VALIDATORS.get(name)
+        if validator:
+            validator(document, source)
+
+        _documents[name] = freeze(document)
+        return _documents[name]
+
+
+def get(name, default=None):
+    """Like load(), but logs a warning and returns default if the document is unusable"""
+    try:
+        return load(name)
+    except CatalogError as e:
+        logger.warning("Could not load %s: %s", name, e)
+        return default
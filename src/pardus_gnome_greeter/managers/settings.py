@@ -1,9 +1,78 @@
 from gi.repository import Gio, GLib
 import json
+import threading
+from ..log import get_logger
+
+logger = get_logger("settings")
+
+# Process-wide pools: schema lookups, Gio.Settings handles per (schema, path)
+# and GVariant type strings per (schema, key). Bulk operations like applying
+# a layout touch the same schemas many times.
+_pool_lock = threading.RLock()
+_schemas = {}
+_settings_pool = {}
+_managers = {}
+_value_types = {}
+
+
+def lookup_schema(schema_id):
+    """Returns the installed Gio.SettingsSchema for schema_id, or None"""
+    with _pool_lock:
+        if schema_id not in _schemas:
+            schema_source = Gio.SettingsSchemaSource.get_default()
+            _schemas[schema_id] = schema_source.lookup(schema_id, True) if schema_source else None
+        return _schemas[schema_id]
+
+
+def get_settings(schema_id, path=None):
+    """
+    Returns the shared Gio.Settings for schema_id, or None if the schema is
+    not installed. Relocatable schemas need the path of the instance.
+    """
+    with _pool_lock:
+        settings = _settings_pool.get((schema_id, path))
+        if settings is None:
+            schema = lookup_schema(schema_id)
+            if schema is None:
+                return None
+            settings = Gio.Settings.new_full(schema, None, path)
+            _settings_pool[(schema_id, path)] = settings
+        return settings
+
+
+def get_settings_manager(schema_id, path=None):
+    """Returns the shared SettingsManager for schema_id, or None if the schema is not installed"""
+    with _pool_lock:
+        manager = _managers.get((schema_id, path))
+        if manager is None:
+            if lookup_schema(schema_id) is None:
+                return None
+            manager = SettingsManager(schema_id, path)
+            _managers[(schema_id, path)] = manager
+        return manager
+
+
+def get_value_type(schema_id, key):
+    """Returns the GVariant type string of a key, as declared by its schema"""
+    with _pool_lock:
+        value_type = _value_types.get((schema_id, key))
+        if value_type is None:
+            schema = lookup_schema(schema_id)
+            if schema is None:
+                raise ValueError(f"Schema '{schema_id}' is not installed")
+            if not schema.has_key(key):
+                raise ValueError(f"Schema '{schema_id}' has no key '{key}'")
+            value_type = schema.get_key(key).get_value_type().dup_string()
+            _value_types[(schema_id, key)] = value_type
+        return value_type
+
 
 class SettingsManager:
-    def __init__(self, schema_id):
-        self.settings = Gio.Settings.new(schema_id)
+    def __init__(self, schema_id, path=None):
+        self.schema_id = schema_id
+        self.settings = get_settings(schema_id, path)
+        if self.settings is None:
+            raise ValueError(f"Schema '{schema_id}' is not installed")
 
     def get(self, key):
         """Gets a setting value."""
@@ -16,17 +85,15 @@ class SettingsManager:
     def set(self, key, value):
         """Sets a setting value."""
         try:
-            # Get the expected GVariant type string directly from the original variant.
-            # This is the most compatible and direct method.
-            original_variant = self.settings.get_value(key)
-            type_string = original_variant.get_type_string()
+            # The expected GVariant type comes from the schema, so no value is read
+            type_string = get_value_type(self.schema_id, key)
 
             # Create a new GLib.Variant with the correct type signature and value.
             new_variant = GLib.Variant(type_string, value)
 
             return self.settings.set_value(key, new_variant)
         except Exception as e:
-            print(f"Error setting {key} = {value}: {e}")
+            logger.error("Error setting %s = %s: %s", key, value, e)
             return False
 
     def set_strv(self, key, value):
@@ -34,18 +101,18 @@ class SettingsManager:
         try:
             return self.settings.set_strv(key, value)
         except Exception as e:
-            print(f"Error setting strv {key} = {value}: {e}")
+            logger.error("Error setting strv %s = %s: %s", key, value, e)
             return False
 
 
 # Application specific settings
-app_settings = SettingsManager("tr.org.pardus.pardus-gnome-greeter")
+app_settings = get_settings_manager("tr.org.pardus.pardus-gnome-greeter")
 
 # GNOME Desktop Interface settings (for themes, fonts, etc.)
-theme_settings = SettingsManager("org.gnome.desktop.interface")
+theme_settings = get_settings_manager("org.gnome.desktop.interface")
 
 # GNOME Shell settings
-shell_settings = SettingsManager("org.gnome.shell")
+shell_settings = get_settings_manager("org.gnome.shell")
 
 # GNOME Desktop Background settings
-background_settings = SettingsManager("org.gnome.desktop.background")
\ No newline at end of file
+background_settings = get_settings_manager("org.gnome.desktop.background")
\ No newline at end of file
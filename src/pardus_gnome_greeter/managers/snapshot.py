@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+from gi.repository import GLib
+from ..log import get_logger
+
+logger = get_logger("snapshot")
+
+CACHE_DIR = os.path.join(GLib.get_user_cache_dir(), "pardus-gnome-greeter")
+SNAPSHOT_VERSION = 1
+
+# Snapshot keys
+WALLPAPERS = "wallpapers"
+MONITORS = "monitors"
+ENABLED_EXTENSIONS = "enabled-extensions"
+CURRENT_LAYOUT = "current-layout"
+
+
+class SessionSnapshot:
+    """
+    Compact, persistent copy of the state the pages show.
+
+    Pages render from the snapshot immediately and then reconcile with the
+    live system in the background; every reconciled value is written back
+    here so the next launch starts from it. Writes are coalesced and the
+    file is replaced atomically.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "snapshot.json")
+        self._data = None
+        self._lock = threading.Lock()
+        self._save_pending = False
+
+    def _ensure_loaded(self):
+        if self._data is not None:
+            return
+        data = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            if isinstance(loaded, dict) and loaded.get("version") == SNAPSHOT_VERSION:
+                data = loaded.get("state", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable session snapshot %s: %s", self.path, e)
+        self._data = data
+
+    def get(self, key, default=None):
+        """Returns the snapshot value for key, or default if there is none."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._data.get(key, default)
+
+    def update(self, key, value):
+        """
+        Stores a reconciled value. Returns True if it differs from the
+        snapshot, i.e. the caller has something to patch.
+        """
+        # Normalize through JSON so tuples and lists compare equal to what is read back
+        value = json.loads(json.dumps(value))
+        with self._lock:
+            self._ensure_loaded()
+            if self._data.get(key) == value:
+                return False
+            self._data[key] = value
+            if not self._save_pending:
+                self._save_pending = True
+                # Coalesce several updates into one write; safe to call from worker threads
+                GLib.timeout_add(500, self._save_idle)
+        return True
+
+    def _save_idle(self):
+        self.save()
+        return False
+
+    def flush(self):
+        """Writes pending changes right away, e.g. when the application quits."""
+        if self._save_pending:
+            self.save()
+
+    def save(self):
+        """Writes the snapshot to disk."""
+        with self._lock:
+            self._save_pending = False
+            if self._data is None:
+                return False
+            content = json.dumps({"version": SNAPSHOT_VERSION, "state": self._data})
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            logger.warning("Could not write session snapshot %s: %s", self.path, e)
+            return False
+
+
+# Process wide snapshot shared by all managers
+session_snapshot = SessionSnapshot()
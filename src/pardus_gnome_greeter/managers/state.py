@@ -0,0 +1,98 @@
+"""
+Observable store of the settings the greeter shows.
+
+Each key is read from GSettings once and then kept up to date from the
+schema's "changed" signal, so pages subscribe to the keys they display
+instead of polling or re-reading them. Settings are addressed by
+(schema id, key) tuples; the ones the pages use are defined here.
+"""
+from .settings import get_settings, get_settings_manager
+from ..log import get_logger
+
+logger = get_logger("settings")
+
+INTERFACE_SCHEMA = "org.gnome.desktop.interface"
+SHELL_SCHEMA = "org.gnome.shell"
+CLOCK_SCHEMA = "org.gnome.shell.extensions.date-menu-formatter"
+
+COLOR_SCHEME = (INTERFACE_SCHEMA, "color-scheme")
+ACCENT_COLOR = (INTERFACE_SCHEMA, "accent-color")
+GTK_THEME = (INTERFACE_SCHEMA, "gtk-theme")
+ICON_THEME = (INTERFACE_SCHEMA, "icon-theme")
+CURSOR_SIZE = (INTERFACE_SCHEMA, "cursor-size")
+SHELL_ENABLED_EXTENSIONS = (SHELL_SCHEMA, "enabled-extensions")
+SHELL_DISABLED_EXTENSIONS = (SHELL_SCHEMA, "disabled-extensions")
+DESKTOP_ICON_SIZE = ("org.gnome.shell.extensions.ding", "icon-size")
+NAUTILUS_ZOOM = ("org.gnome.nautilus.icon-view", "default-zoom-level")
+CLOCK_PATTERN = (CLOCK_SCHEMA, "pattern")
+CLOCK_FONT_SIZE = (CLOCK_SCHEMA, "font-size")
+
+
+class SettingsStore:
+    def __init__(self):
+        self._values = {}
+        self._subscribers = {}
+        self._watched = set()
+
+    def get(self, setting, default=None):
+        """Returns the current value of a (schema id, key) setting, or default if it cannot be read"""
+        if setting not in self._values:
+            self._load(setting)
+        value = self._values[setting]
+        return default if value is None else value
+
+    def set(self, setting, value):
+        """Writes a setting; subscribers are notified through the changed signal"""
+        manager = get_settings_manager(setting[0])
+        if manager is None:
+            logger.warning("Schema '%s' not found. Skipping setting key '%s'.", setting[0], setting[1])
+            return False
+        return manager.set(setting[1], value)
+
+    def subscribe(self, settings, callback):
+        """
+        Calls callback(setting, value) on the main loop whenever one of the
+        given settings changes. Returns a handle for unsubscribe().
+        """
+        settings = tuple(settings)
+        for setting in settings:
+            self._subscribers.setdefault(setting, []).append(callback)
+            self.get(setting)
+        return (settings, callback)
+
+    def unsubscribe(self, handle):
+        settings, callback = handle
+        for setting in settings:
+            callbacks = self._subscribers.get(setting, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def _load(self, setting):
+        schema_id, key = setting
+        settings = get_settings(schema_id)
+        if settings is None or not settings.props.settings_schema.has_key(key):
+            self._values[setting] = None
+            return
+        # GSettings only reports changes of keys read after a handler was connected
+        if schema_id not in self._watched:
+            settings.connect("changed", self._on_changed, schema_id)
+            self._watched.add(schema_id)
+        self._values[setting] = settings.get_value(key).unpack()
+
+    def _on_changed(self, settings, key, schema_id):
+        setting = (schema_id, key)
+        if setting not in self._values:
+            return
+        value = settings.get_value(key).unpack()
+        if value == self._values[setting]:
+            return
+        self._values[setting] = value
+        for callback in list(self._subscribers.get(setting, [])):
+            try:
+                callback(setting, value)
+            except Exception as e:
+                logger.error("Error in settings subscriber for %s [%s]: %s", schema_id, key, e)
+
+
+# Store shared by all pages and managers
+settings_store = SettingsStore()
@@ -2,7 +2,26 @@
 Page modules
 
 This module contains page components from the Pardus GNOME Greeter application.
+
+Page classes are imported on first access. Importing a page module registers
+its Gtk.Template, so the GResource must be loaded before a page is accessed.
 """
 
-__all__ = []
+from ..lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    'WelcomePage': '.welcome',
+    'LayoutPage': '.layout',
+    'ThemePage': '.theme',
+    'WallpaperPage': '.wallpaper',
+    'DisplayPage': '.display',
+    'ExtensionPage': '.extension',
+    'ApplicationsPage': '.applications',
+    'TimePage': '.time',
+    'OutroPage': '.outro',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
 
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
@@ -6,13 +6,20 @@ gi.require_version("Adw", "1")
 
 from gi.repository import Gtk, Adw
 
+from ..resources import ensure_bundle, BUNDLE_ILLUSTRATIONS
+from ..log import get_logger
+
+logger = get_logger("pages.applications")
+
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/ApplicationsPage.ui')
 class ApplicationsPage(Adw.PreferencesPage):
     __gtype_name__ = 'ApplicationsPage'
 
     def __init__(self, **kwargs):
+        # The template references an image from the illustrations bundle
+        ensure_bundle(BUNDLE_ILLUSTRATIONS)
         super().__init__(**kwargs)
-        print("ApplicationsPage created.")
+        logger.debug("ApplicationsPage created.")
     
     @Gtk.Template.Callback()
     def on_open_store_clicked(self, button):
@@ -20,6 +27,6 @@ class ApplicationsPage(Adw.PreferencesPage):
         try:
             subprocess.Popen(["pardus-software"])
         except FileNotFoundError:
-            print("Pardus Software Center not found")
+            logger.warning("Pardus Software Center not found")
         except Exception as e:
-            print(f"Error opening Pardus Software Center: {e}") 
\ No newline at end of file
+            logger.error("Error opening Pardus Software Center: %s", e)
\ No newline at end of file
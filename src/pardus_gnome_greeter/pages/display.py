@@ -5,22 +5,18 @@ from locale import gettext as _
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gtk, Adw, Gio, GLib
+from gi.repository import Gtk, Adw, GLib
 
 # Gettext setup
 domain = 'pardus-gnome-greeter'
 locale.bindtextdomain(domain, '/usr/share/locale')
 locale.textdomain(domain)
 from ..managers.DisplayManager import display_manager
+from ..event_loop import spawn
+from ..managers.state import settings_store, CURSOR_SIZE, DESKTOP_ICON_SIZE, NAUTILUS_ZOOM
+from ..log import get_logger
 
-CURSOR_SCHEMA = "org.gnome.desktop.interface"
-CURSOR_KEY = "cursor-size"
-
-DESKTOP_ICONS_SCHEMA = "org.gnome.shell.extensions.ding"
-DESKTOP_ICONS_KEY = "icon-size"
-
-NAUTILUS_SCHEMA = "org.gnome.nautilus.icon-view"
-NAUTILUS_KEY = "default-zoom-level"
+logger = get_logger("pages.display")
 
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/DisplayPage.ui')
 class DisplayPage(Adw.PreferencesPage):
@@ -29,10 +25,8 @@ class DisplayPage(Adw.PreferencesPage):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
-        self.settings = Gio.Settings.new(CURSOR_SCHEMA)
-        self.desktop_icons_settings = Gio.Settings.new(DESKTOP_ICONS_SCHEMA)
-        self.nautilus_settings = Gio.Settings.new(NAUTILUS_SCHEMA)
         self.monitors_group = None
+        self.scaling_group = None
 
         # Maps for settings
         self.cursor_size_map = {0: 24, 1: 32, 2: 48} # Small, Medium, Large
@@ -42,9 +36,11 @@ class DisplayPage(Adw.PreferencesPage):
         display_manager.get_monitors(self.on_monitors_loaded)
 
     def on_monitors_loaded(self, monitors_config):
-        # Remove existing monitors group if it exists
+        # Remove existing groups if the configuration is being refreshed
         if self.monitors_group:
             self.remove(self.monitors_group)
+        if self.scaling_group:
+            self.remove(self.scaling_group)
         
         # Create monitors group
         self.monitors_group = Adw.PreferencesGroup(title=_("Monitors"))
@@ -104,6 +100,7 @@ class DisplayPage(Adw.PreferencesPage):
         # Create a single group for all scaling options
         scaling_group = Adw.PreferencesGroup(title=_("Interface Scaling"))
         self.add(scaling_group)
+        self.scaling_group = scaling_group
 
         # Cursor Size
         cursor_labels = [_("Small"), _("Medium"), _("Large")]
@@ -111,7 +108,7 @@ class DisplayPage(Adw.PreferencesPage):
         self.cursor_size_row = Adw.ComboRow(title=_("Cursor Size"), model=cursor_model)
         scaling_group.add(self.cursor_size_row)
         
-        current_cursor_size = self.settings.get_int(CURSOR_KEY)
+        current_cursor_size = settings_store.get(CURSOR_SIZE)
         rev_cursor_map = {v: k for k, v in self.cursor_size_map.items()}
         cursor_selected_index = rev_cursor_map.get(current_cursor_size, 1) # Default to Medium
         self.cursor_size_row.set_selected(cursor_selected_index)
@@ -123,7 +120,7 @@ class DisplayPage(Adw.PreferencesPage):
         self.desktop_icons_row = Adw.ComboRow(title=_("Desktop Icon Size"), model=desktop_model)
         scaling_group.add(self.desktop_icons_row)
         
-        current_desktop_size = self.desktop_icons_settings.get_string(DESKTOP_ICONS_KEY)
+        current_desktop_size = settings_store.get(DESKTOP_ICON_SIZE)
         rev_desktop_map = {v: k for k, v in self.desktop_icons_map.items()}
         desktop_selected_index = rev_desktop_map.get(current_desktop_size, 2) # Default to Standard
         self.desktop_icons_row.set_selected(desktop_selected_index)
@@ -135,7 +132,7 @@ class DisplayPage(Adw.PreferencesPage):
         self.nautilus_zoom_row = Adw.ComboRow(title=_("File Manager Icon Size"), model=nautilus_model)
         scaling_group.add(self.nautilus_zoom_row)
         
-        current_nautilus_zoom = self.nautilus_settings.get_string(NAUTILUS_KEY)
+        current_nautilus_zoom = settings_store.get(NAUTILUS_ZOOM)
         rev_nautilus_map = {v: k for k, v in self.nautilus_zoom_map.items()}
         nautilus_selected_index = rev_nautilus_map.get(current_nautilus_zoom, 2) # Default to Medium
         self.nautilus_zoom_row.set_selected(nautilus_selected_index)
@@ -145,19 +142,19 @@ class DisplayPage(Adw.PreferencesPage):
         selected_index = combo.get_selected()
         new_size = self.cursor_size_map.get(selected_index)
         if new_size is not None:
-            self.settings.set_int(CURSOR_KEY, new_size)
+            settings_store.set(CURSOR_SIZE, new_size)
 
     def on_desktop_icon_size_changed(self, combo, _):
         selected_index = combo.get_selected()
         new_size = self.desktop_icons_map.get(selected_index)
         if new_size is not None:
-            self.desktop_icons_settings.set_string(DESKTOP_ICONS_KEY, new_size)
+            settings_store.set(DESKTOP_ICON_SIZE, new_size)
 
     def on_nautilus_zoom_changed(self, combo, _):
         selected_index = combo.get_selected()
         new_zoom = self.nautilus_zoom_map.get(selected_index)
         if new_zoom is not None:
-            self.nautilus_settings.set_string(NAUTILUS_KEY, new_zoom)
+            settings_store.set(NAUTILUS_ZOOM, new_zoom)
     
     def on_scale_changed(self, widget, _, monitor_id, scales):
         selected_index = widget.get_selected()
@@ -167,26 +164,25 @@ class DisplayPage(Adw.PreferencesPage):
         
         # Apply the scale change - we need to get the current mode_id
         # For now, we'll use a default mode_id of 0, but ideally we should track the current mode
-        success = display_manager.apply_scale_change(monitor_id, 0, new_scale)
-        if success:
-            pass
-        else:
-            pass
+        spawn(display_manager.apply_scale_change_async(monitor_id, 0, new_scale))
 
     def on_resolution_changed(self, widget, _, monitor_id, resolutions):
         selected_index = widget.get_selected()
         if selected_index < 0 or selected_index >= len(resolutions):
             return
         new_resolution = resolutions[selected_index]
-        print(f"Monitor {monitor_id} resolution changed to: {new_resolution['resolution']} @ {new_resolution['refresh_rate']:.0f}Hz")
-        print(f"  Mode ID: {new_resolution['mode_id']}")
+        logger.debug("Monitor %s resolution changed to: %s @ %.0fHz", monitor_id, new_resolution['resolution'], new_resolution['refresh_rate'])
+        logger.debug("Mode ID: %s", new_resolution['mode_id'])
         
         # Apply the resolution change (with default scale 1.0)
-        success = display_manager.apply_resolution_change(monitor_id, new_resolution['mode_id'])
-        if success:
-            print(f"Successfully applied resolution change")
+        spawn(self._apply_resolution(monitor_id, new_resolution['mode_id']))
+
+    async def _apply_resolution(self, monitor_id, mode_id):
+        """Apply a resolution change without blocking the main loop"""
+        if await display_manager.apply_resolution_change_async(monitor_id, mode_id):
+            logger.info("Successfully applied resolution change")
         else:
-            print(f"Failed to apply resolution change")
+            logger.warning("Failed to apply resolution change")
             
 
 
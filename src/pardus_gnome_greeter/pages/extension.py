@@ -1,17 +1,22 @@
 import locale
 import gi
 import os
-import sys
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gtk, Adw, GLib, Gdk, Gio
+from gi.repository import Gtk, Adw, Gdk
 
-# Add the managers directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'managers'))
 from ..managers.ExtensionManager import ExtensionManager
 from ..managers.ThemeManager import ThemeManager
+from ..managers.snapshot import session_snapshot, ENABLED_EXTENSIONS
+from ..resources import ensure_bundle, scaled_resource, BUNDLE_EXTENSIONS
+from ..event_loop import spawn
+from ..refresh import refresh_scheduler
+from ..managers.state import settings_store, SHELL_ENABLED_EXTENSIONS, SHELL_DISABLED_EXTENSIONS
+from ..log import get_logger
+
+logger = get_logger("pages.extension")
 
 # This dictionary is used to mark strings for translation AND for runtime lookup
 EXTENSION_TRANSLATIONS = {
@@ -54,8 +59,8 @@ class ExtensionCard(Gtk.Box):
         self.extension_manager = None
         self._updating = False
         
-    def load_extension(self, extension_data, extension_manager):
-        """Load extension data into the card"""
+    def load_extension(self, extension_data, extension_manager, enabled=None):
+        """Load extension data into the card, using enabled as initial state if known"""
         self.extension_id = extension_data.get('id')
         self.extension_manager = extension_manager
         
@@ -82,7 +87,7 @@ class ExtensionCard(Gtk.Box):
             try:
                 # Check if it's a gresource path
                 if image_path.startswith('/tr/org/pardus/pardus-gnome-greeter/'):
-                    texture = Gdk.Texture.new_from_resource(image_path)
+                    texture = Gdk.Texture.new_from_resource(scaled_resource(image_path))
                     self.image.set_paintable(texture)
                 else:
                     # Fallback to filename for backward compatibility
@@ -90,11 +95,14 @@ class ExtensionCard(Gtk.Box):
                         texture = Gdk.Texture.new_from_filename(image_path)
                         self.image.set_paintable(texture)
             except Exception as e:
-                print(f"Error loading extension image {image_path}: {e}")
+                logger.error("Error loading extension image %s: %s", image_path, e)
         
         # Set switch state
         if self.extension_manager and hasattr(self, 'switch') and self.switch:
-            self.update_state()
+            if enabled is None:
+                self.update_state()
+            else:
+                self.set_enabled_state(enabled)
             
             # Connect switch signal
             self.switch.connect("state-set", self._on_switch_toggled)
@@ -109,14 +117,22 @@ class ExtensionCard(Gtk.Box):
         if self.extension_manager and hasattr(self, 'switch') and self.switch:
             if self._updating:
                 return
+            spawn(self._update_state())
 
-            self._updating = True
-            try:
-                is_enabled = self.extension_manager.is_extension_enabled(self.extension_id)
-                self.switch.set_state(is_enabled)
-                self.switch.set_active(is_enabled)
-            finally:
-                self._updating = False
+    async def _update_state(self):
+        self.set_enabled_state(await self.extension_manager.is_extension_enabled_async(self.extension_id))
+
+    def set_enabled_state(self, is_enabled):
+        """Update switch state from an already known value"""
+        if not (hasattr(self, 'switch') and self.switch) or self._updating:
+            return
+
+        self._updating = True
+        try:
+            self.switch.set_state(is_enabled)
+            self.switch.set_active(is_enabled)
+        finally:
+            self._updating = False
 
     def _on_switch_toggled(self, switch, state):
         """Handle switch toggle"""
@@ -125,9 +141,9 @@ class ExtensionCard(Gtk.Box):
 
         if self.extension_manager and self.extension_id:
             if state:
-                self.extension_manager.enable_extension(self.extension_id)
+                spawn(self.extension_manager.enable_extension_async(self.extension_id))
             else:
-                self.extension_manager.disable_extension(self.extension_id)
+                spawn(self.extension_manager.disable_extension_async(self.extension_id))
 
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/ExtensionPage.ui')
 class ExtensionPage(Adw.PreferencesPage):
@@ -137,6 +153,8 @@ class ExtensionPage(Adw.PreferencesPage):
     extensions_flowbox = Gtk.Template.Child("extensions_flowbox")
     
     def __init__(self, **kwargs):
+        # Extension screenshots live in their own resource bundle
+        ensure_bundle(BUNDLE_EXTENSIONS)
         super().__init__(**kwargs)
         
         # Initialize extension manager
@@ -144,40 +162,56 @@ class ExtensionPage(Adw.PreferencesPage):
         self.extension_cards = {}
         
         # Listen for extension enable/disable state changes in Gnome Shell
-        self.shell_settings = Gio.Settings.new("org.gnome.shell")
-        self.shell_settings.connect("changed::enabled-extensions", self.on_shell_settings_changed)
-        self.shell_settings.connect("changed::disabled-extensions", self.on_shell_settings_changed)
+        settings_store.subscribe([SHELL_ENABLED_EXTENSIONS, SHELL_DISABLED_EXTENSIONS], self.on_shell_settings_changed)
+        # The states have to be read again after gnome-shell restarts
+        self.extension_manager.watch_availability(self.on_shell_extensions_availability_changed)
         
         # Update when page is mapped
         self.connect("map", self.on_page_mapped)
         
-        # Load extensions
-        self._load_extensions()
+        # Load extensions with the states known from the last run, then reconcile
+        self._load_extensions(session_snapshot.get(ENABLED_EXTENSIONS))
         
-        print("ExtensionPage created.")
+        logger.debug("ExtensionPage created.")
     
-    def on_shell_settings_changed(self, settings, key):
+    def on_shell_settings_changed(self, setting, value):
         """Called when enabled/disabled extensions change"""
-        GLib.idle_add(self.update_all_cards)
+        refresh_scheduler.request(self.update_all_cards)
+
+    def on_shell_extensions_availability_changed(self, available):
+        if available:
+            refresh_scheduler.request(self.update_all_cards)
 
     def on_page_mapped(self, widget):
         """Called when the page becomes visible"""
         self.update_all_cards()
 
     def update_all_cards(self):
-        """Update state of all extension cards"""
-        for card in self.extension_cards.values():
-            card.update_state()
+        """Update state of all extension cards with a single D-Bus query"""
+        if self.extension_manager.available:
+            spawn(self._update_all_cards())
+        return False
+
+    async def _update_all_cards(self):
+        enabled = set(await self.extension_manager.get_enabled_extensions_async())
+        session_snapshot.update(ENABLED_EXTENSIONS, sorted(enabled))
+        for extension_id, card in self.extension_cards.items():
+            card.set_enabled_state(extension_id in enabled)
     
-    def _load_extensions(self):
+    def _load_extensions(self, snapshot_enabled=None):
         """Load and display extensions"""
         extensions = self.extension_manager.get_sorted_extensions()
         
         for extension in extensions:
             card = ExtensionCard()
-            card.load_extension(extension, self.extension_manager)
+            # Without a snapshot the switches start off until the query below returns
+            enabled = snapshot_enabled is not None and extension['id'] in snapshot_enabled
+            card.load_extension(extension, self.extension_manager, enabled)
             
             child = Gtk.FlowBoxChild()
             child.set_child(card)
             self.extensions_flowbox.append(child)
-            self.extension_cards[extension['id']] = card 
\ No newline at end of file
+            self.extension_cards[extension['id']] = card
+
+        # One asynchronous query reconciles all cards instead of one per card
+        self.update_all_cards() 
\ No newline at end of file
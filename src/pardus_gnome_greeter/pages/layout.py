@@ -1,22 +1,29 @@
 import gi
 import os
-import threading
-import time
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gtk, Adw, GLib, Gio, GdkPixbuf, Gdk, GObject
+from gi.repository import Gtk, Adw, GLib, Gio, Gdk, GObject
 
 from ..managers.LayoutManager import LayoutManager
+from ..managers.snapshot import session_snapshot, CURRENT_LAYOUT
+from ..resources import ensure_bundle, load_animation, scaled_resource, BUNDLE_LAYOUTS
+from ..render_profile import render_profile
+from ..event_loop import spawn
+from ..log import get_logger
+
+logger = get_logger("pages.layout")
 
 
 class GifPaintable(GObject.Object, Gdk.Paintable):
     def __init__(self, path):
         super().__init__()
+        from gi.repository import GdkPixbuf
         self.animation = GdkPixbuf.PixbufAnimation.new_from_file(path)
         self.iterator = self.animation.get_iter()
         self.delay = self.iterator.get_delay_time()
+        self.frame_texture = None
         self.timeout = GLib.timeout_add(self.delay, self.on_delay)
 
         self.invalidate_contents()
@@ -29,10 +36,17 @@ class GifPaintable(GObject.Object, Gdk.Paintable):
         instance.animation = animation
         instance.iterator = animation.get_iter()
         instance.delay = instance.iterator.get_delay_time()
+        instance.frame_texture = None
         instance.timeout = GLib.timeout_add(instance.delay, instance.on_delay)
         instance.invalidate_contents()
         return instance
 
+    def stop(self):
+        """Stops the frame timer once the animation is no longer shown"""
+        if self.timeout:
+            GLib.source_remove(self.timeout)
+            self.timeout = 0
+
     def on_delay(self):
         delay = self.iterator.get_delay_time()
         self.timeout = GLib.timeout_add(delay, self.on_delay)
@@ -52,11 +66,16 @@ class GifPaintable(GObject.Object, Gdk.Paintable):
     def do_snapshot(self, snapshot, width, height):
         timeval = GLib.TimeVal()
         timeval.tv_usec = GLib.get_real_time()
-        self.iterator.advance(timeval)
-        pixbuf = self.iterator.get_pixbuf()
-        texture = Gdk.Texture.new_for_pixbuf(pixbuf)
+        # Upload a frame only once, redraws of the same frame reuse its texture
+        if self.iterator.advance(timeval) or self.frame_texture is None:
+            pixbuf = self.iterator.get_pixbuf()
+            self.frame_texture = Gdk.Texture.new_for_pixbuf(pixbuf)
 
-        texture.snapshot(snapshot, width, height)
+        self.frame_texture.snapshot(snapshot, width, height)
+
+# Fixed 2x3 grid layout
+LAYOUT_ORDER = ['gnome', 'mac', 'ubuntu', '10', 'xp', 'pardus']
+LAYOUT_GIF_PATH = "/tr/org/pardus/pardus-gnome-greeter/assets/layouts/layout-{}.gif"
 
 
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/LayoutPage.ui')
@@ -66,13 +85,15 @@ class LayoutPage(Adw.PreferencesPage):
     layouts_grid = Gtk.Template.Child()
 
     def __init__(self, **kwargs):
+        # Layout previews live in their own resource bundle
+        ensure_bundle(BUNDLE_LAYOUTS)
         super().__init__(**kwargs)
         
         # Initialize layout manager
         try:
             self.layout_manager = LayoutManager()
         except Exception as e:
-            print(f"Warning: Could not initialize LayoutManager: {e}")
+            logger.warning("Could not initialize LayoutManager: %s", e)
             self.layout_manager = None
         
         self.current_layout = None
@@ -101,11 +122,8 @@ class LayoutPage(Adw.PreferencesPage):
             'pardus': {'name': _('Pardus Style'), 'description': _('Custom Pardus desktop layout')}
         }
         
-        # Fixed 2x3 grid layout
-        layout_order = ['gnome', 'mac', 'ubuntu', '10', 'xp', 'pardus']
-        
         row, col = 0, 0
-        for layout_name in layout_order:
+        for layout_name in LAYOUT_ORDER:
             if layout_name in layouts:
                 info = layout_info.get(layout_name, {'name': layout_name.title(), 'description': _(f'{layout_name.title()} layout')})
                 card = self._create_layout_card(layout_name, info['name'], info['description'])
@@ -120,14 +138,26 @@ class LayoutPage(Adw.PreferencesPage):
                     row += 1
     
     def _set_initial_selection(self):
-        """Set the initial selection based on the current layout"""
+        """Set the initial selection from the snapshot, then reconcile with the detected layout"""
+        snapshot_layout = session_snapshot.get(CURRENT_LAYOUT)
+        if snapshot_layout in self.layout_cards:
+            self._update_selection(snapshot_layout)
+            GLib.idle_add(self._reconcile_selection)
+        else:
+            self._reconcile_selection()
+
+    def _reconcile_selection(self):
+        """Select the layout detected on the system"""
         if self.layout_manager:
             try:
                 current_layout_name = self.layout_manager.get_current_layout()
                 if current_layout_name:
-                    self._update_selection(current_layout_name)
+                    session_snapshot.update(CURRENT_LAYOUT, current_layout_name)
+                    if current_layout_name != self.current_layout:
+                        self._update_selection(current_layout_name)
             except Exception as e:
-                print(f"Failed to set initial layout selection: {e}")
+                logger.warning("Failed to set initial layout selection: %s", e)
+        return False
 
     def _create_layout_card(self, layout_id, name, description):
         """Create a layout card widget"""
@@ -165,14 +195,14 @@ class LayoutPage(Adw.PreferencesPage):
         picture.set_valign(Gtk.Align.CENTER)
         picture.add_css_class("layout-image")
         
-        # Load static image initially from gresource
-        static_path = f"/tr/org/pardus/pardus-gnome-greeter/assets/layouts/layout-{layout_id}.svg"
+        # Load static image initially from gresource (pre-rendered at the displayed size)
+        static_path = scaled_resource(f"/tr/org/pardus/pardus-gnome-greeter/assets/layouts/layout-{layout_id}.png")
         try:
             file = Gio.File.new_for_uri(f'resource://{static_path}')
             if file.query_exists():
                 picture.set_resource(static_path)
         except Exception as e:
-            print(f"Error loading static image: {e}")
+            logger.error("Error loading static image: %s", e)
         
         image_container.append(picture)
         
@@ -205,7 +235,7 @@ class LayoutPage(Adw.PreferencesPage):
         card.picture = picture
         card.layout_id = layout_id
         card.static_path = static_path
-        card.gif_path = f"/tr/org/pardus/pardus-gnome-greeter/assets/layouts/layout-{layout_id}.gif"
+        card.gif_path = LAYOUT_GIF_PATH.format(layout_id)
         
         # Connect signals
         card.connect("clicked", self._on_layout_selected)
@@ -222,17 +252,21 @@ class LayoutPage(Adw.PreferencesPage):
         """Handle mouse enter on card"""
         card = controller.get_widget()
         
+        # The low-resource profile keeps the static preview and runs no frame timer
+        if not render_profile.animations_enabled:
+            card.add_css_class("card-hover")
+            return
+
         # Switch to GIF using GifPaintable from gresource
         try:
-            # Try to load GIF directly from gresource using GdkPixbuf
-            from gi.repository import GdkPixbuf
-            pixbuf_animation = GdkPixbuf.PixbufAnimation.new_from_resource(card.gif_path)
+            # Decoded animations are shared and may already be prefetched
+            pixbuf_animation = load_animation(card.gif_path)
             if pixbuf_animation:
                 # Create a simple paintable from the animation
                 gif_paintable = GifPaintable.from_animation(pixbuf_animation)
                 card.picture.set_paintable(gif_paintable)
         except Exception as e:
-            print(f"Error loading GIF: {e}")
+            logger.error("Error loading GIF: %s", e)
         
         # Add hover style
         card.add_css_class("card-hover")
@@ -241,13 +275,17 @@ class LayoutPage(Adw.PreferencesPage):
         """Handle mouse leave from card"""
         card = controller.get_widget()
         
+        paintable = card.picture.get_paintable()
+        if isinstance(paintable, GifPaintable):
+            paintable.stop()
+        
         # Switch back to static image from gresource
         try:
             file = Gio.File.new_for_uri(f'resource://{card.static_path}')
             if file.query_exists():
                 card.picture.set_resource(card.static_path)
         except Exception as e:
-            print(f"Error loading static image: {e}")
+            logger.error("Error loading static image: %s", e)
         
         # Remove hover style
         card.remove_css_class("card-hover")
@@ -257,14 +295,22 @@ class LayoutPage(Adw.PreferencesPage):
         layout_id = button.layout_id
         
         if not self.layout_manager:
-            print("Layout manager not available")
+            logger.debug("Layout manager not available")
             return
         
         # Update visual selection
         self._update_selection(layout_id)
         
-        # Apply layout directly; the manager handles asynchronicity
-        self.layout_manager.apply_layout(layout_id)
+        spawn(self._apply_layout(layout_id))
+    
+    async def _apply_layout(self, layout_id):
+        """Apply layout on the main loop without blocking it"""
+        logger.info("Applying layout: %s", layout_id)
+        if await self.layout_manager.apply_layout_async(layout_id):
+            session_snapshot.update(CURRENT_LAYOUT, layout_id)
+            self._show_success_notification(layout_id)
+        else:
+            self._show_error_notification(layout_id, "layout could not be applied")
     
     def _update_selection(self, selected_layout):
         """Update visual selection of cards"""
@@ -275,26 +321,11 @@ class LayoutPage(Adw.PreferencesPage):
             else:
                 card.remove_css_class("selected")
     
-    def _apply_layout_threaded(self, layout_id):
-        """Apply layout in background thread"""
-        try:
-            print(f"Applying layout: {layout_id}")
-            self.layout_manager.apply_layout(layout_id)
-            
-            # Show success notification on main thread
-            GLib.idle_add(self._show_success_notification, layout_id)
-            
-        except Exception as e:
-            print(f"Error applying layout {layout_id}: {e}")
-            GLib.idle_add(self._show_error_notification, layout_id, str(e))
-    
     def _show_success_notification(self, layout_id):
         """Show success notification"""
         # You can implement a toast notification here if available
-        print(f"Layout '{layout_id}' applied successfully!")
-        return False  # Remove from idle queue
+        logger.info("Layout '%s' applied successfully!", layout_id)
     
     def _show_error_notification(self, layout_id, error_msg):
         """Show error notification"""
-        print(f"Failed to apply layout '{layout_id}': {error_msg}")
-        return False  # Remove from idle queue 
\ No newline at end of file
+        logger.warning("Failed to apply layout '%s': %s", layout_id, error_msg)
\ No newline at end of file
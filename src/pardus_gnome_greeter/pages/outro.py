@@ -5,6 +5,8 @@ gi.require_version("Adw", "1")
 
 from gi.repository import Gtk, Adw
 
+from ..resources import ensure_bundle, BUNDLE_ILLUSTRATIONS
+
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/OutroPage.ui')
 class OutroPage(Adw.PreferencesPage):
     __gtype_name__ = 'OutroPage'
@@ -18,6 +20,8 @@ class OutroPage(Adw.PreferencesPage):
     btn_forum = Gtk.Template.Child("btn_forum")
 
     def __init__(self, **kwargs):
+        # The template references an image from the illustrations bundle
+        ensure_bundle(BUNDLE_ILLUSTRATIONS)
         super().__init__(**kwargs)
         
         self.explore_button.connect("clicked", self.on_explore_clicked)
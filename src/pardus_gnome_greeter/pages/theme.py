@@ -7,12 +7,12 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
 from gi.repository import Gtk, Adw, GLib, Gio
-import os
-import sys
 
-# Add the managers directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'managers'))
 from ..managers.ThemeManager import ThemeManager
+from ..managers.state import settings_store, COLOR_SCHEME, ACCENT_COLOR, ICON_THEME
+from ..log import get_logger
+
+logger = get_logger("pages.theme")
 
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/ThemePage.ui')
 class ThemePage(Adw.PreferencesPage):
@@ -38,6 +38,10 @@ class ThemePage(Adw.PreferencesPage):
         self.light_theme_button.connect("toggled", self.on_theme_button_toggled)
         self.dark_theme_button.connect("toggled", self.on_theme_button_toggled)
         
+        # Follow the applied values instead of polling for them
+        settings_store.subscribe([COLOR_SCHEME], lambda setting, value: self.update_button_states())
+        settings_store.subscribe([ACCENT_COLOR], lambda setting, value: self.update_accent_color_states())
+        settings_store.subscribe([ICON_THEME], lambda setting, value: self.update_icon_theme_states())
         
         # Set initial state
         GLib.idle_add(self.update_button_states)
@@ -111,7 +115,7 @@ class ThemePage(Adw.PreferencesPage):
                 self.icon_theme_buttons[theme_name] = button
 
         except Exception as e:
-            print(f"Error setting up icon themes: {e}")
+            logger.error("Error setting up icon themes: %s", e)
 
     def on_icon_theme_toggled(self, button):
         """Handle icon theme change"""
@@ -123,7 +127,7 @@ class ThemePage(Adw.PreferencesPage):
         try:
             self.theme_manager.set_icon_theme(theme_name)
         except Exception as e:
-            print(f"Error setting icon theme: {e}")
+            logger.error("Error setting icon theme: %s", e)
             
     def update_icon_theme_states(self):
         """Update icon theme button states based on current setting"""
@@ -142,7 +146,7 @@ class ThemePage(Adw.PreferencesPage):
                 button.handler_unblock_by_func(self.on_icon_theme_toggled)
                 
         except Exception as e:
-            print(f"Error updating icon theme states: {e}")
+            logger.error("Error updating icon theme states: %s", e)
             try:
                 self.icon_theme_buttons["Adwaita"].set_active(True)
             except:
@@ -190,7 +194,7 @@ class ThemePage(Adw.PreferencesPage):
         """Update accent color button states based on current setting"""
         try:
             current_accent = self.theme_manager.get_current_accent_color()
-            print(f"Current accent color: {current_accent}")
+            logger.debug("Current accent color: %s", current_accent)
             
             # Block signals to avoid recursion
             for name, button in self.accent_color_buttons.items():
@@ -199,18 +203,18 @@ class ThemePage(Adw.PreferencesPage):
             # Set the correct button as active
             if current_accent in self.accent_color_buttons:
                 self.accent_color_buttons[current_accent].set_active(True)
-                print(f"Set {current_accent} button as active")
+                logger.debug("Set %s button as active", current_accent)
             else:
                 # Default to blue if current accent is unknown
                 self.accent_color_buttons["blue"].set_active(True)
-                print("Defaulted to blue accent color")
+                logger.debug("Defaulted to blue accent color")
             
             # Unblock signals
             for name, button in self.accent_color_buttons.items():
                 button.handler_unblock_by_func(self.on_accent_color_toggled)
                 
         except Exception as e:
-            print(f"Error updating accent color states: {e}")
+            logger.error("Error updating accent color states: %s", e)
             # Default to blue on error
             try:
                 self.accent_color_buttons["blue"].set_active(True)
@@ -225,13 +229,13 @@ class ThemePage(Adw.PreferencesPage):
             return
             
         color_name = button.get_name()
-        print(f"Selected accent color: {color_name}")
+        logger.debug("Selected accent color: %s", color_name)
         
         # Apply the accent color through theme manager
         try:
             self.theme_manager.set_accent_color(color_name)
         except Exception as e:
-            print(f"Error setting accent color: {e}")
+            logger.error("Error setting accent color: %s", e)
         
     def on_theme_button_toggled(self, button):
         """Handle theme button toggle"""
@@ -243,16 +247,13 @@ class ThemePage(Adw.PreferencesPage):
         try:
             if button_name == "light":
                 self.theme_manager.apply_light_theme()
-                print("Applied light theme")
+                logger.info("Applied light theme")
             elif button_name == "dark":
                 self.theme_manager.apply_dark_theme()
-                print("Applied dark theme")
-                
-            # Update button states after a small delay to ensure settings are applied
-            GLib.timeout_add(200, self.update_button_states)
+                logger.info("Applied dark theme")
             
         except Exception as e:
-            print(f"Error applying theme: {e}")
+            logger.error("Error applying theme: %s", e)
     
     def update_button_states(self):
         """Update button states based on current theme"""
@@ -261,7 +262,7 @@ class ThemePage(Adw.PreferencesPage):
             is_dark = self.theme_manager.is_dark_theme_active()
             is_light = self.theme_manager.is_light_theme_active()
             
-            print(f"Theme state: dark={is_dark}, light={is_light}")
+            logger.debug("Theme state: dark=%s, light=%s", is_dark, is_light)
             
             # Temporarily disconnect signals to avoid recursion
             self.light_theme_button.handler_block_by_func(self.on_theme_button_toggled)
@@ -270,21 +271,21 @@ class ThemePage(Adw.PreferencesPage):
             # Set button states based on current theme
             if is_dark:
                 self.dark_theme_button.set_active(True)
-                print("Set dark button active")
+                logger.debug("Set dark button active")
             elif is_light:
                 self.light_theme_button.set_active(True)  
-                print("Set light button active")
+                logger.debug("Set light button active")
             else:
                 # Default to light if no specific theme is detected
                 self.light_theme_button.set_active(True)
-                print("Defaulted to light theme")
+                logger.debug("Defaulted to light theme")
             
             # Reconnect signals
             self.light_theme_button.handler_unblock_by_func(self.on_theme_button_toggled)
             self.dark_theme_button.handler_unblock_by_func(self.on_theme_button_toggled)
             
         except Exception as e:
-            print(f"Error updating button states: {e}")
+            logger.error("Error updating button states: %s", e)
             # Default to light theme on error
             try:
                 self.light_theme_button.set_active(True)
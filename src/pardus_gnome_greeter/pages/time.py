@@ -4,14 +4,17 @@ import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gtk, Adw, GLib, Gio
-import os
-import sys
+from gi.repository import Gtk, Adw, GLib
 
-# Add the managers directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'managers'))
 from ..managers.ExtensionManager import ExtensionManager
 from ..managers.ThemeManager import ThemeManager
+from ..event_loop import spawn
+from ..refresh import refresh_scheduler
+from ..managers.state import (settings_store, SHELL_ENABLED_EXTENSIONS, SHELL_DISABLED_EXTENSIONS,
+                              CLOCK_PATTERN, CLOCK_FONT_SIZE)
+from ..log import get_logger
+
+logger = get_logger("pages.time")
 
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/TimePage.ui')
 class TimePage(Adw.PreferencesPage):
@@ -32,18 +35,11 @@ class TimePage(Adw.PreferencesPage):
         
         # Extension settings
         self.clock_extension_id = "date-menu-formatter@marcinjakubowski.github.com"
-        self.schema = "org.gnome.shell.extensions.date-menu-formatter"
-        self.pattern_key = "pattern"
-        self.font_size_key = "font-size"
 
-        # Keep a persistent settings object to listen for changes
-        self.settings = Gio.Settings.new(self.schema)
-        self.settings.connect("changed", self.on_settings_changed)
-        
-        # Listen for extension enable/disable state changes in Gnome Shell
-        self.shell_settings = Gio.Settings.new("org.gnome.shell")
-        self.shell_settings.connect("changed::enabled-extensions", self.on_shell_settings_changed)
-        self.shell_settings.connect("changed::disabled-extensions", self.on_shell_settings_changed)
+        # Listen for changes of the clock settings and of the extension
+        # enable/disable state in Gnome Shell
+        settings_store.subscribe([CLOCK_PATTERN, CLOCK_FONT_SIZE], self.on_settings_changed)
+        settings_store.subscribe([SHELL_ENABLED_EXTENSIONS, SHELL_DISABLED_EXTENSIONS], self.on_shell_settings_changed)
         
         # State update flag to prevent signal loops
         self._updating = False
@@ -73,28 +69,31 @@ class TimePage(Adw.PreferencesPage):
         """Called when the page becomes visible"""
         self.update_initial_state()
 
-    def on_shell_settings_changed(self, settings, key):
+    def on_shell_settings_changed(self, setting, value):
         """Called when enabled/disabled extensions change"""
-        GLib.idle_add(self.update_initial_state)
+        refresh_scheduler.request(self.update_initial_state)
 
-    def on_settings_changed(self, settings, key):
+    def on_settings_changed(self, setting, value):
         """Called when settings change externally"""
-        # Update on ANY setting change in the extension schema
-        GLib.idle_add(self.update_initial_state)
+        refresh_scheduler.request(self.update_initial_state)
     
     def update_initial_state(self):
         """Update the initial state of all widgets"""
+        spawn(self._update_initial_state())
+        return False
+
+    async def _update_initial_state(self):
+        # Check if extension is enabled
+        is_enabled = await self.extension_manager.is_extension_enabled_async(self.clock_extension_id)
         if self._updating:
             return
 
         self._updating = True
         try:
-            # Check if extension is enabled
-            is_enabled = self.extension_manager.is_extension_enabled(self.clock_extension_id)
             self.clock_format_switch.set_active(is_enabled)
             
             # Get current pattern
-            current_pattern = self.settings.get_string(self.pattern_key)
+            current_pattern = settings_store.get(CLOCK_PATTERN, "")
             
             # Set format buttons based on pattern (detects Luxon components)
             if any(c in current_pattern for c in ['d', 'M', 'y', 'E', 'c']):
@@ -109,14 +108,14 @@ class TimePage(Adw.PreferencesPage):
                 self.show_seconds_switch.set_active(False)
             
             # Set font size
-            font_size = self.settings.get_int(self.font_size_key)
+            font_size = settings_store.get(CLOCK_FONT_SIZE, 0)
             self.font_size_spinbutton.set_value(font_size)
             
             # Update sensitivity
             self.update_sensitivity(is_enabled)
             
         except Exception as e:
-            print(f"Error updating initial state: {e}")
+            logger.error("Error updating initial state: %s", e)
         finally:
             self._updating = False
     
@@ -134,14 +133,14 @@ class TimePage(Adw.PreferencesPage):
 
         try:
             if state:
-                self.extension_manager.enable_extension(self.clock_extension_id)
+                spawn(self.extension_manager.enable_extension_async(self.clock_extension_id))
             else:
-                self.extension_manager.disable_extension(self.clock_extension_id)
+                spawn(self.extension_manager.disable_extension_async(self.clock_extension_id))
             
             self.update_sensitivity(state)
             
         except Exception as e:
-            print(f"Error toggling extension: {e}")
+            logger.error("Error toggling extension: %s", e)
     
     def on_format_change(self, button, format_type):
         """Handle format type change"""
@@ -162,10 +161,10 @@ class TimePage(Adw.PreferencesPage):
                 pattern = self.format_types[format_type]
             
             # Set the pattern
-            self.settings.set_string(self.pattern_key, pattern)
+            settings_store.set(CLOCK_PATTERN, pattern)
             
         except Exception as e:
-            print(f"Error changing format: {e}")
+            logger.error("Error changing format: %s", e)
     
     def on_font_size_change(self, spinbutton):
         """Handle font size change"""
@@ -174,10 +173,10 @@ class TimePage(Adw.PreferencesPage):
 
         try:
             size = int(spinbutton.get_value())
-            self.settings.set_int(self.font_size_key, size)
+            settings_store.set(CLOCK_FONT_SIZE, size)
             
         except Exception as e:
-            print(f"Error changing font size: {e}")
+            logger.error("Error changing font size: %s", e)
     
     def on_seconds_toggle(self, switch, state):
         """Handle seconds display toggle"""
@@ -197,7 +196,7 @@ class TimePage(Adw.PreferencesPage):
             else:
                 pattern = self.format_types[format_type]
             
-            self.settings.set_string(self.pattern_key, pattern)
+            settings_store.set(CLOCK_PATTERN, pattern)
             
         except Exception as e:
-            print(f"Error toggling seconds: {e}") 
\ No newline at end of file
+            logger.error("Error toggling seconds: %s", e)
\ No newline at end of file
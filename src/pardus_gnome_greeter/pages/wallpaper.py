@@ -1,17 +1,20 @@
 import locale
 import gi
-import threading
 import os
-import sys
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Gtk, Adw, GLib, GdkPixbuf, Gdk
+from gi.repository import Gtk, Adw, GLib, Gdk, Gio
 
-# Add the managers directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'managers'))
 from ..managers.WallpaperManager import WallpaperManager
+from ..managers.snapshot import session_snapshot, WALLPAPERS
+from ..render_profile import render_profile
+from ..executor import executor
+from ..event_loop import spawn
+from ..log import get_logger
+
+logger = get_logger("pages.wallpaper")
 
 # WallpaperThumbnail template class
 @Gtk.Template(resource_path='/tr/org/pardus/pardus-gnome-greeter/ui/components/WallpaperThumbnail.ui')
@@ -41,7 +44,7 @@ class WallpaperThumbnail(Gtk.Box):
                 texture = Gdk.Texture.new_from_filename(wallpaper_path)
                 self.picture.set_paintable(texture)
         except Exception as e:
-            print(f"Error loading wallpaper {wallpaper_path}: {e}")
+            logger.error("Error loading wallpaper %s: %s", wallpaper_path, e)
     
     def load_pixbuf(self, pixbuf):
         """Load wallpaper from GdkPixbuf"""
@@ -50,7 +53,7 @@ class WallpaperThumbnail(Gtk.Box):
                 texture = Gdk.Texture.new_for_pixbuf(pixbuf)
                 self.picture.set_paintable(texture)
         except Exception as e:
-            print(f"Error loading pixbuf: {e}")
+            logger.error("Error loading pixbuf: %s", e)
     
     def set_selected(self, selected):
         """Set selection state"""
@@ -80,75 +83,108 @@ class WallpaperPage(Adw.PreferencesPage):
         # Initialize manager
         self.wallpaper_manager = WallpaperManager()
         self.wallpapers = []
+        self.wallpaper_children = {}
         self.current_selection = None
         
+        # Cancels queued scans and thumbnails once the page is destroyed
+        self.cancellable = Gio.Cancellable()
+        self.connect("destroy", self._on_destroy)
+        
         # Connect signals
         if self.live_wallpaper_row:
             self.live_wallpaper_row.connect("activated", self.on_live_wallpaper_clicked)
         if self.wallpapers_flowbox:
             self.wallpapers_flowbox.connect("child-activated", self.on_wallpaper_selected)
+            # Keep the order stable while thumbnails arrive out of order
+            self.wallpapers_flowbox.set_sort_func(self._sort_wallpapers)
+        
+        # Show the wallpapers known from the last run right away
+        snapshot_wallpapers = session_snapshot.get(WALLPAPERS)
+        if snapshot_wallpapers:
+            self.wallpapers = list(snapshot_wallpapers)
+            self.populate_wallpapers_ui(self.wallpapers)
         
-        # Load wallpapers in background thread
-        thread = threading.Thread(target=self.load_wallpapers_background)
-        thread.daemon = True
-        thread.start()
+        spawn(self._scan_wallpapers())
     
-    def load_wallpapers_background(self):
-        """Load wallpapers in background thread"""
-        try:
-            self.wallpapers = self.wallpaper_manager.get_wallpapers()
-            GLib.idle_add(self.populate_wallpapers_ui)
-        except Exception as e:
-            print(f"Error loading wallpapers: {e}")
+    async def _scan_wallpapers(self):
+        """Scan the wallpaper directories without blocking the main loop"""
+        # Cancelled together with self.cancellable when the page is destroyed
+        wallpapers = await self.wallpaper_manager.get_wallpapers_async(
+            cached=True, cancellable=self.cancellable)
+        self.reconcile_wallpapers(wallpapers)
+    
+    def _on_destroy(self, widget):
+        self.cancellable.cancel()
+    
+    def _sort_wallpapers(self, child_a, child_b):
+        path_a = getattr(child_a, 'wallpaper_path', '')
+        path_b = getattr(child_b, 'wallpaper_path', '')
+        return (path_a > path_b) - (path_a < path_b)
+    
+    def reconcile_wallpapers(self, wallpapers):
+        """Patch the thumbnails shown from the snapshot with the scanned wallpapers"""
+        session_snapshot.update(WALLPAPERS, wallpapers)
+        
+        shown = set(self.wallpapers)
+        scanned = set(wallpapers)
+        self.wallpapers = wallpapers
+        
+        for wallpaper_path in shown - scanned:
+            child = self.wallpaper_children.pop(wallpaper_path, None)
+            if child:
+                if self.current_selection is child:
+                    self.current_selection = None
+                self.wallpapers_flowbox.remove(child)
+        
+        added = [path for path in wallpapers if path not in shown]
+        if added:
+            self.populate_wallpapers_ui(added)
+        elif not wallpapers:
+            logger.warning("No wallpapers found")
+        return False
             
-    def populate_wallpapers_ui(self):
+    def populate_wallpapers_ui(self, wallpapers):
         """Populate the UI with wallpaper thumbnails"""
         try:
-            if not self.wallpapers:
-                print("No wallpapers found")
-                return
-            
             # Get current wallpaper for selection
             current_wallpaper = self.wallpaper_manager.get_current_wallpaper()
             
             # Create wallpaper thumbnails in batches
             batch_size = 5
-            total_wallpapers = len(self.wallpapers)
+            total_wallpapers = len(wallpapers)
             
             for i in range(0, total_wallpapers, batch_size):
-                batch = self.wallpapers[i:i + batch_size]
+                batch = wallpapers[i:i + batch_size]
                 GLib.idle_add(self.create_wallpaper_batch, batch, current_wallpaper)
                 
         except Exception as e:
-            print(f"Error populating wallpapers UI: {e}")
+            logger.error("Error populating wallpapers UI: %s", e)
             
     def create_wallpaper_batch(self, wallpaper_batch, current_wallpaper):
-        """Create a batch of wallpaper thumbnails"""
+        """Queue a batch of wallpaper thumbnails on the shared executor"""
+        width, height = render_profile.thumbnail_size
         for wallpaper_path in wallpaper_batch:
-            try:
-                thread = threading.Thread(
-                    target=self.create_wallpaper_thumbnail,
-                    args=(wallpaper_path, current_wallpaper)
-                )
-                thread.daemon = True
-                thread.start()
-            except Exception as e:
-                print(f"Error creating thumbnail thread for {wallpaper_path}: {e}")
-                
-    def create_wallpaper_thumbnail(self, wallpaper_path, current_wallpaper):
-        """Create thumbnail for a single wallpaper"""
-        try:
-            pixbuf = self.wallpaper_manager.create_thumbnail(wallpaper_path, 160, 120)
-            if pixbuf:
-                GLib.idle_add(self.add_wallpaper_to_flowbox, wallpaper_path, pixbuf, current_wallpaper)
-        except Exception as e:
-            print(f"Error creating thumbnail for {wallpaper_path}: {e}")
+            executor.submit(
+                self.wallpaper_manager.create_thumbnail, wallpaper_path, width, height,
+                callback=lambda pixbuf, path=wallpaper_path: self.on_thumbnail_created(path, pixbuf, current_wallpaper),
+                cancellable=self.cancellable,
+            )
+        return False
+    
+    def on_thumbnail_created(self, wallpaper_path, pixbuf, current_wallpaper):
+        """Show a thumbnail decoded by the executor, skipping images that failed to load"""
+        if pixbuf:
+            self.add_wallpaper_to_flowbox(wallpaper_path, pixbuf, current_wallpaper)
             
     def add_wallpaper_to_flowbox(self, wallpaper_path, pixbuf, current_wallpaper):
         """Add wallpaper thumbnail to the flowbox"""
         try:
             if not self.wallpapers_flowbox:
-                print("Wallpapers flowbox not found")
+                logger.debug("Wallpapers flowbox not found")
+                return
+            
+            # Skip wallpapers removed by a reconcile or already shown
+            if wallpaper_path not in self.wallpapers or wallpaper_path in self.wallpaper_children:
                 return
                 
             thumbnail = WallpaperThumbnail()
@@ -170,9 +206,10 @@ class WallpaperPage(Adw.PreferencesPage):
                 self.current_selection = child
             
             self.wallpapers_flowbox.append(child)
+            self.wallpaper_children[wallpaper_path] = child
                 
         except Exception as e:
-            print(f"Error adding wallpaper to flowbox: {e}")
+            logger.error("Error adding wallpaper to flowbox: %s", e)
 
     def on_wallpaper_selected(self, flowbox, flowbox_child):
         """Handle wallpaper selection - GNOME Control Center style"""
@@ -198,12 +235,12 @@ class WallpaperPage(Adw.PreferencesPage):
             # Set wallpaper immediately (like GNOME Control Center)
             success = self.wallpaper_manager.set_wallpaper(wallpaper_path)
             if success:
-                print(f"Wallpaper changed to: {wallpaper_path}")
+                logger.debug("Wallpaper changed to: %s", wallpaper_path)
             else:
-                print(f"Failed to set wallpaper: {wallpaper_path}")
+                logger.warning("Failed to set wallpaper: %s", wallpaper_path)
                 
         except Exception as e:
-            print(f"Error setting wallpaper: {e}")
+            logger.error("Error setting wallpaper: %s", e)
     
     def on_live_wallpaper_clicked(self, row):
         """Handle Pardus Live Wallpaper button click"""
@@ -228,4 +265,4 @@ class WallpaperPage(Adw.PreferencesPage):
                 dialog.present()
                 
         except Exception as e:
-            print(f"Error opening live wallpaper settings: {e}")
+            logger.error("Error opening live wallpaper settings: %s", e)
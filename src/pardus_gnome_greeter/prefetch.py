@@ -0,0 +1,177 @@
+"""
+Idle-time prefetching of the data that upcoming wizard pages need.
+
+While the user reads the current page, warmers for the next pages run one
+small step at a time. A step is dispatched from a GLib.PRIORITY_LOW idle
+callback and executed as a low priority job on the shared executor, so the
+queue only advances while the main loop has nothing else to do. Any user interaction cancels the
+remaining steps; they resume once the user has been quiet for a while.
+"""
+from gi.repository import Gio, GLib
+
+from .executor import executor, PRIORITY_LOW
+from .session_gate import session_gate
+from .log import get_logger
+
+logger = get_logger("prefetch")
+
+# Number of pages after the current one that are warmed
+LOOKAHEAD = 2
+# Reading time before warming starts and quiet time after an interaction
+START_DELAY_MS = 800
+RESUME_DELAY_MS = 1500
+# Thumbnails for roughly the first screenful of wallpapers
+WALLPAPER_THUMBNAILS = 24
+
+
+def _warm_layout():
+    from .resources import ensure_bundle, load_animation, BUNDLE_LAYOUTS
+    from .pages.layout import LAYOUT_ORDER, LAYOUT_GIF_PATH
+    from .render_profile import render_profile
+
+    available = yield lambda: ensure_bundle(BUNDLE_LAYOUTS)
+    # Hover animations are not shown in the low-resource profile
+    if not available or not render_profile.animations_enabled:
+        return
+    for layout_id in LAYOUT_ORDER:
+        yield lambda path=LAYOUT_GIF_PATH.format(layout_id): load_animation(path)
+
+
+def _warm_wallpaper():
+    from .managers.WallpaperManager import WallpaperManager
+    from .render_profile import render_profile
+
+    manager = WallpaperManager()
+    width, height = render_profile.thumbnail_size
+    wallpapers = yield manager.get_wallpapers
+    for path in (wallpapers or [])[:WALLPAPER_THUMBNAILS]:
+        yield lambda path=path: manager.create_thumbnail(path, width, height)
+
+
+def _warm_display():
+    from .managers.DisplayManager import display_manager
+
+    if display_manager.monitors_loaded:
+        return
+    config = yield display_manager.fetch_monitors
+    display_manager.store_monitors(config)
+
+
+def _warm_extension():
+    from .resources import ensure_bundle, BUNDLE_EXTENSIONS
+    from .managers.ExtensionManager import installed_extension_index
+
+    yield lambda: ensure_bundle(BUNDLE_EXTENSIONS)
+    yield installed_extension_index
+
+
+WARMERS = {
+    "layout": _warm_layout,
+    "wallpaper": _warm_wallpaper,
+    "display": _warm_display,
+    "extension": _warm_extension,
+}
+
+
+class PrefetchScheduler:
+    """
+    Runs page warmers in the background while the user is idle.
+
+    A warmer is a generator function that yields callables; each callable is
+    run on the executor and its return value is sent back into the
+    generator. Warmers must only fill caches, never touch widgets.
+    """
+
+    def __init__(self, warmers=None):
+        self._warmers = WARMERS if warmers is None else warmers
+        self._pages = []
+        self._warmed = set()
+        self._current = None
+        self._result = None
+        self._source_id = 0
+        self._generation = 0
+        self._step_cancellable = None
+
+    def schedule(self, page_names):
+        """Warms page_names in order once the user has been reading for a while"""
+        self.cancel()
+        self._pages = [name for name in page_names
+                       if name in self._warmers and name not in self._warmed]
+        if self._pages:
+            self._arm(START_DELAY_MS)
+
+    def interrupt(self):
+        """Stops prefetching because the user interacted and resumes later"""
+        if not self._pages:
+            return
+        self.cancel()
+        self._arm(RESUME_DELAY_MS)
+
+    def cancel(self):
+        """Drops the pending steps; a step already running finishes in the background"""
+        if self._source_id:
+            GLib.source_remove(self._source_id)
+            self._source_id = 0
+        if self._step_cancellable is not None:
+            self._step_cancellable.cancel()
+            self._step_cancellable = None
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        self._result = None
+        self._generation += 1
+
+    def _arm(self, delay_ms):
+        self._source_id = GLib.timeout_add(delay_ms, self._on_delay_elapsed)
+
+    def _on_delay_elapsed(self):
+        self._source_id = 0
+        # Nothing is prefetched while the login session is still starting up
+        session_gate.run_when_ready(self._on_gate_open, self._generation)
+        return False
+
+    def _on_gate_open(self, generation):
+        if generation == self._generation and not self._source_id:
+            self._queue_next_step()
+
+    def _queue_next_step(self):
+        self._source_id = GLib.idle_add(self._run_next_step, priority=GLib.PRIORITY_LOW)
+
+    def _run_next_step(self):
+        self._source_id = 0
+        if self._step_cancellable is not None or not self._pages:
+            return False
+
+        if self._current is None:
+            self._current = self._warmers[self._pages[0]]()
+            self._result = None
+
+        try:
+            step = self._current.send(self._result)
+        except StopIteration:
+            self._finish_page()
+            return False
+        except Exception as e:
+            logger.warning("Warming '%s' failed: %s", self._pages[0], e)
+            self._finish_page()
+            return False
+
+        self._step_cancellable = Gio.Cancellable()
+        executor.submit(step, callback=self._on_step_done, error_callback=self._on_step_failed,
+                        priority=PRIORITY_LOW, cancellable=self._step_cancellable)
+        return False
+
+    def _finish_page(self):
+        self._warmed.add(self._pages.pop(0))
+        self._current = None
+        self._result = None
+        if self._pages:
+            self._queue_next_step()
+
+    def _on_step_done(self, result):
+        self._step_cancellable = None
+        self._result = result
+        self._queue_next_step()
+
+    def _on_step_failed(self, error):
+        self._on_step_done(None)
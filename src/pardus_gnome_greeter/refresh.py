@@ -0,0 +1,70 @@
+"""
+Coalesces UI refresh requests.
+
+Settings signals tend to arrive in bursts: applying a layout changes the
+enabled extensions and dozens of extension keys one after another. Pages
+request their refresh here instead of scheduling it themselves; a refresh
+requested many times runs once, at most once per frame. While a manager
+holds a bulk operation open, refreshes are held back and run once when the
+last bulk operation ends.
+"""
+from contextlib import contextmanager
+
+from gi.repository import GLib
+from .log import get_logger
+
+logger = get_logger("refresh")
+
+# One frame at 60 Hz
+FRAME_INTERVAL_MS = 16
+
+
+class RefreshScheduler:
+    def __init__(self):
+        # Callbacks in request order; dict keys keep each one only once
+        self._pending = {}
+        self._source_id = 0
+        self._bulk_depth = 0
+
+    def request(self, callback):
+        """Runs callback() on the main loop, merged with other requests for it"""
+        self._pending[callback] = None
+        self._schedule()
+
+    def begin_bulk(self):
+        """Holds back refreshes until the matching end_bulk()"""
+        self._bulk_depth += 1
+
+    def end_bulk(self):
+        """Ends a bulk operation and flushes the refreshes it held back"""
+        self._bulk_depth = max(0, self._bulk_depth - 1)
+        self._schedule()
+
+    @contextmanager
+    def bulk(self):
+        self.begin_bulk()
+        try:
+            yield
+        finally:
+            self.end_bulk()
+
+    def _schedule(self):
+        if self._pending and not self._bulk_depth and not self._source_id:
+            self._source_id = GLib.timeout_add(FRAME_INTERVAL_MS, self._flush)
+
+    def _flush(self):
+        self._source_id = 0
+        if self._bulk_depth:
+            return False
+
+        callbacks, self._pending = list(self._pending), {}
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error("Refresh %s failed: %s", getattr(callback, '__qualname__', callback), e)
+        return False
+
+
+# Scheduler shared by all pages and managers
+refresh_scheduler = RefreshScheduler()
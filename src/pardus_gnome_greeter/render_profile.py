@@ -0,0 +1,153 @@
+"""
+Chooses between the normal and a low-resource rendering profile.
+
+The low-resource profile is meant for machines that draw with the software
+renderer (llvmpipe or cairo) or that should save power. It shows static
+layout previews, decodes thumbnails at 1x instead of the screen's scale
+factor with fewer workers and turns off GTK animations. The
+"render-profile" setting forces either profile; "auto" detects it.
+"""
+import glob
+import os
+
+from gi.repository import Gio, GLib
+from .log import get_logger
+
+logger = get_logger("render-profile")
+
+PROFILE_AUTO = "auto"
+PROFILE_NORMAL = "normal"
+PROFILE_LOW_RESOURCE = "low-resource"
+
+# Size of WallpaperThumbnail.ui; smaller thumbnails would be upscaled and blurry
+THUMBNAIL_SIZE = (160, 120)
+# The normal profile decodes thumbnails for HiDPI screens up to this scale
+MAX_THUMBNAIL_SCALE = 2
+NORMAL_WORKER_THREADS = 4
+LOW_RESOURCE_WORKER_THREADS = 1
+
+SOFTWARE_RENDERERS = {"GskCairoRenderer"}
+POWER_SUPPLY_DIR = "/sys/class/power_supply"
+
+
+def _software_rendering():
+    """Returns a reason if GTK is going to render without a GPU"""
+    if os.environ.get("GSK_RENDERER", "").lower() == "cairo":
+        return "GSK_RENDERER=cairo"
+    if os.environ.get("LIBGL_ALWAYS_SOFTWARE") not in (None, "", "0"):
+        return "LIBGL_ALWAYS_SOFTWARE"
+    if not glob.glob("/dev/dri/renderD*"):
+        return "no DRM render node"
+    return None
+
+
+def _power_saver():
+    """Returns a reason if the power-saver power profile is active"""
+    try:
+        monitor = Gio.PowerProfileMonitor.dup_default()
+        if monitor.get_power_saver_enabled():
+            return "power saver"
+    except (AttributeError, GLib.Error):
+        pass
+    return None
+
+
+def _on_battery():
+    """Returns a reason if a battery is discharging"""
+    for supply in glob.glob(os.path.join(POWER_SUPPLY_DIR, "*")):
+        try:
+            with open(os.path.join(supply, "type")) as f:
+                if f.read().strip() != "Battery":
+                    continue
+            with open(os.path.join(supply, "status")) as f:
+                if f.read().strip() == "Discharging":
+                    return "on battery"
+        except OSError:
+            continue
+    return None
+
+
+def _display_scale():
+    """Returns the highest integer scale factor of the connected monitors"""
+    from gi.repository import Gdk
+
+    display = Gdk.Display.get_default()
+    if display is None:
+        return 1
+    monitors = display.get_monitors()
+    scales = [monitors.get_item(i).get_scale_factor() for i in range(monitors.get_n_items())]
+    return max(scales, default=1)
+
+
+class RenderProfile:
+    def __init__(self):
+        self._low_resource = None
+        self.reasons = []
+
+    @property
+    def low_resource(self):
+        if self._low_resource is None:
+            self._low_resource = self._detect()
+        return self._low_resource
+
+    def _setting(self):
+        from .managers.settings import app_settings
+
+        try:
+            return app_settings.get("render-profile")
+        except Exception as e:
+            logger.warning("Could not read render-profile setting: %s", e)
+            return PROFILE_AUTO
+
+    def _detect(self):
+        profile = self._setting()
+        if profile == PROFILE_LOW_RESOURCE:
+            self.reasons = ["forced by setting"]
+        elif profile == PROFILE_NORMAL:
+            self.reasons = []
+        else:
+            self.reasons = [reason for reason in (_software_rendering(), _power_saver(), _on_battery()) if reason]
+
+        if self.reasons:
+            logger.info("Using the low-resource rendering profile: %s", ', '.join(self.reasons))
+        return bool(self.reasons)
+
+    def check_renderer(self, renderer):
+        """Switches to the low-resource profile if the window's GSK renderer draws in software"""
+        if renderer is None or self.low_resource or self._setting() != PROFILE_AUTO:
+            return
+        renderer_name = renderer.__gtype__.name
+        if renderer_name in SOFTWARE_RENDERERS:
+            self.reasons.append(renderer_name)
+            self._low_resource = True
+            logger.info("Using the low-resource rendering profile: %s", ', '.join(self.reasons))
+            self.apply()
+
+    def apply(self):
+        """Turns off GTK animations in the low-resource profile"""
+        if not self.low_resource:
+            return
+        from gi.repository import Gtk
+
+        settings = Gtk.Settings.get_default()
+        if settings is not None:
+            settings.set_property("gtk-enable-animations", False)
+
+    @property
+    def animations_enabled(self):
+        return not self.low_resource
+
+    @property
+    def thumbnail_size(self):
+        """Thumbnail decode size: the widget size times the screen scale, or 1x when saving resources"""
+        if self.low_resource:
+            return THUMBNAIL_SIZE
+        scale = min(_display_scale(), MAX_THUMBNAIL_SCALE)
+        return (THUMBNAIL_SIZE[0] * scale, THUMBNAIL_SIZE[1] * scale)
+
+    @property
+    def worker_threads(self):
+        return LOW_RESOURCE_WORKER_THREADS if self.low_resource else NORMAL_WORKER_THREADS
+
+
+render_profile = RenderProfile()
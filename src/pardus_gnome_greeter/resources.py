@@ -0,0 +1,126 @@
+import os
+import sys
+import threading
+
+from gi.repository import Gio, GLib
+from .log import get_logger
+
+logger = get_logger("resources")
+
+RESOURCE_NAME = "pardus-gnome-greeter"
+INSTALLED_RESOURCE_DIR = "/usr/share/pardus/pardus-gnome-greeter"
+
+# Asset bundles that pages register on demand, see ensure_bundle()
+BUNDLE_LAYOUTS = "layouts"
+BUNDLE_EXTENSIONS = "extensions"
+BUNDLE_ILLUSTRATIONS = "illustrations"
+
+_registered_bundles = {}
+_animations = {}
+_lock = threading.Lock()
+
+
+def _resource_dir():
+    """Returns the directory that holds the compiled .gresource files."""
+    # Simplified dev environment check
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    build_dir = os.path.join(project_root, 'build')
+
+    if os.path.exists(os.path.join(build_dir, f"{RESOURCE_NAME}.gresource")):
+        # Development environment
+        return build_dir
+    # Installed environment
+    return INSTALLED_RESOURCE_DIR
+
+
+def _resource_path(bundle=None):
+    name = RESOURCE_NAME if bundle is None else f"{RESOURCE_NAME}-{bundle}"
+    return os.path.join(_resource_dir(), f"{name}.gresource")
+
+
+def load_gresource():
+    """Loads the core GResource file (UI, CSS, JSON and small icons)."""
+    resource_path = _resource_path()
+
+    try:
+        resource = Gio.resource_load(resource_path)
+        Gio.Resource._register(resource)
+        _("GResource loaded from")
+        logger.debug("GResource loaded from %s", resource_path)
+    except GLib.Error as e:
+        logger.critical("Could not load GResource: %s", e)
+        sys.exit(1)
+
+
+def ensure_bundle(bundle):
+    """
+    Registers the named asset bundle the first time it is needed.
+    Returns True if the bundle is available.
+    """
+    with _lock:
+        if bundle in _registered_bundles:
+            return _registered_bundles[bundle]
+
+        resource_path = _resource_path(bundle)
+        try:
+            resource = Gio.resource_load(resource_path)
+            Gio.Resource._register(resource)
+            _registered_bundles[bundle] = True
+        except GLib.Error as e:
+            logger.warning("Could not load asset bundle '%s': %s", bundle, e)
+            _registered_bundles[bundle] = False
+        return _registered_bundles[bundle]
+
+
+def resource_exists(resource_path):
+    """Returns True if resource_path is available in a registered bundle."""
+    try:
+        Gio.resources_get_info(resource_path, Gio.ResourceLookupFlags.NONE)
+        return True
+    except GLib.Error:
+        return False
+
+
+def _display_scale_factor():
+    """Returns the largest monitor scale factor of the default display."""
+    from gi.repository import Gdk
+
+    display = Gdk.Display.get_default()
+    if display is None:
+        return 1
+    monitors = display.get_monitors()
+    scales = [monitors.get_item(i).get_scale_factor() for i in range(monitors.get_n_items())]
+    return max(scales, default=1)
+
+
+def scaled_resource(resource_path):
+    """
+    Returns the @2x variant of a pre-rendered image on HiDPI displays and
+    resource_path itself otherwise.
+    """
+    if _display_scale_factor() < 2:
+        return resource_path
+
+    base, ext = os.path.splitext(resource_path)
+    hidpi_path = f"{base}@2x{ext}"
+    if resource_exists(hidpi_path):
+        return hidpi_path
+    return resource_path
+
+
+def load_animation(resource_path):
+    """
+    Returns the decoded GdkPixbuf.PixbufAnimation for resource_path.
+    Animations are decoded once and shared, so they can be warmed from a
+    worker thread before they are shown.
+    """
+    with _lock:
+        animation = _animations.get(resource_path)
+    if animation is not None:
+        return animation
+
+    from gi.repository import GdkPixbuf
+
+    animation = GdkPixbuf.PixbufAnimation.new_from_resource(resource_path)
+    with _lock:
+        return _animations.setdefault(resource_path, animation)
@@ -0,0 +1,118 @@
+from gi.repository import Gio, GLib
+from .log import get_logger
+
+logger = get_logger("service")
+
+INTERFACE_NAME = "tr.org.pardus.PardusGnomeGreeter"
+ERROR_UNKNOWN_LAYOUT = f"{INTERFACE_NAME}.Error.UnknownLayout"
+ERROR_BUSY = f"{INTERFACE_NAME}.Error.Busy"
+
+INTERFACE_XML = f"""
+<node>
+  <interface name="{INTERFACE_NAME}">
+    <method name="ApplyLayout">
+      <arg type="s" name="name" direction="in"/>
+      <arg type="b" name="success" direction="out"/>
+    </method>
+    <method name="ListLayouts">
+      <arg type="as" name="layouts" direction="out"/>
+    </method>
+    <method name="GetCurrentLayout">
+      <arg type="s" name="name" direction="out"/>
+    </method>
+    <method name="SetAccentColor">
+      <arg type="s" name="color" direction="in"/>
+      <arg type="b" name="success" direction="out"/>
+    </method>
+    <method name="SetWallpaper">
+      <arg type="s" name="path" direction="in"/>
+      <arg type="b" name="success" direction="out"/>
+    </method>
+  </interface>
+</node>
+"""
+
+
+class GreeterService:
+    """
+    Exports the layout, theme and wallpaper managers on the application's
+    D-Bus connection. The managers are created once and reused by every call,
+    so a resident instance answers without the cost of a cold start.
+    """
+
+    def __init__(self):
+        self.layout_manager = None
+        self.theme_manager = None
+        self.wallpaper_manager = None
+        self._registrations = []
+        self._node_info = Gio.DBusNodeInfo.new_for_xml(INTERFACE_XML)
+
+    def warm(self):
+        """Creates the managers ahead of the first call"""
+        from .managers.LayoutManager import LayoutManager
+        from .managers.ThemeManager import ThemeManager
+        from .managers.WallpaperManager import WallpaperManager
+
+        if self.layout_manager is None:
+            self.layout_manager = LayoutManager()
+        if self.theme_manager is None:
+            self.theme_manager = ThemeManager()
+        if self.wallpaper_manager is None:
+            self.wallpaper_manager = WallpaperManager()
+
+    def register(self, connection, object_path):
+        """Exports the interface at object_path on connection"""
+        registration_id = connection.register_object(
+            object_path,
+            self._node_info.interfaces[0],
+            self._on_method_call,
+            None,
+            None,
+        )
+        self._registrations.append((connection, registration_id))
+
+    def unregister(self):
+        for connection, registration_id in self._registrations:
+            connection.unregister_object(registration_id)
+        self._registrations = []
+
+    def _on_method_call(self, connection, sender, object_path, interface_name,
+                        method_name, parameters, invocation):
+        try:
+            self.warm()
+            handler = getattr(self, f"_handle_{method_name}")
+            handler(parameters.unpack(), invocation)
+        except Exception as e:
+            logger.error("%s failed: %s", method_name, e)
+            invocation.return_dbus_error(f"{INTERFACE_NAME}.Error.Failed", str(e))
+
+    def _handle_ApplyLayout(self, args, invocation):
+        (layout_name,) = args
+        if layout_name not in self.layout_manager.get_available_layouts():
+            invocation.return_dbus_error(ERROR_UNKNOWN_LAYOUT, f"Unknown layout '{layout_name}'")
+            return
+
+        def on_finished(success):
+            invocation.return_value(GLib.Variant("(b)", (success,)))
+
+        # The reply is sent once every layout step has finished
+        if not self.layout_manager.apply_layout(layout_name, on_finished):
+            invocation.return_dbus_error(ERROR_BUSY, "Another layout is being applied")
+
+    def _handle_ListLayouts(self, args, invocation):
+        layouts = list(self.layout_manager.get_available_layouts())
+        invocation.return_value(GLib.Variant("(as)", (layouts,)))
+
+    def _handle_GetCurrentLayout(self, args, invocation):
+        layout_name = self.layout_manager.get_current_layout() or ""
+        invocation.return_value(GLib.Variant("(s)", (layout_name,)))
+
+    def _handle_SetAccentColor(self, args, invocation):
+        (color_name,) = args
+        success = self.theme_manager.set_accent_color(color_name)
+        invocation.return_value(GLib.Variant("(b)", (bool(success),)))
+
+    def _handle_SetWallpaper(self, args, invocation):
+        (path,) = args
+        success = self.wallpaper_manager.set_wallpaper(path)
+        invocation.return_value(GLib.Variant("(b)", (bool(success),)))
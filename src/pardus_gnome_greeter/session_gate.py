@@ -0,0 +1,209 @@
+"""
+Defers background work until the login session has settled.
+
+The autostart greeter starts while gnome-shell, its extensions and the other
+autostart applications compete for CPU and disk. Background work queued with
+run_when_ready() is held back until gnome-session reports the session as
+running and the kernel's pressure stall information shows that CPU and I/O
+contention has dropped, then released one item at a time. The application runs
+lower_thread_priority() in every executor worker so that whatever still
+runs yields to the session without being starved once it has settled.
+"""
+import os
+import platform
+import threading
+import time
+
+from gi.repository import Gio, GLib
+from .log import get_logger
+
+logger = get_logger("session-gate")
+
+PRESSURE_DIR = os.environ.get("PARDUS_GNOME_GREETER_PRESSURE_DIR", "/proc/pressure")
+# "some avg10" percentages under which the system counts as settled
+CPU_PRESSURE_LIMIT = 20.0
+IO_PRESSURE_LIMIT = 10.0
+# Consecutive settled samples needed before work is released
+SETTLED_SAMPLES = 2
+SAMPLE_INTERVAL_MS = 500
+# Background work is never held back longer than this
+MAX_WAIT_SECONDS = 30
+# Spacing between two released work items
+RELEASE_INTERVAL_MS = 250
+
+THREAD_NICENESS = 10
+# Lowest level of the best-effort class; unlike the idle class it still gets
+# disk time while other processes keep the disk busy
+IOPRIO_CLASS_BE = 2
+IOPRIO_BE_LOWEST = 7
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+_IOPRIO_SET_SYSCALLS = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "armv7l": 314,
+    "riscv64": 30,
+}
+
+
+def lower_thread_priority():
+    """Moves the calling thread to a higher nice value and the lowest best-effort I/O level"""
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, THREAD_NICENESS)
+    except (AttributeError, OSError) as e:
+        logger.warning("Could not lower thread priority: %s", e)
+
+    syscall_number = _IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if syscall_number is None:
+        return
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.syscall(syscall_number, IOPRIO_WHO_PROCESS, tid,
+                     IOPRIO_CLASS_BE << IOPRIO_CLASS_SHIFT | IOPRIO_BE_LOWEST)
+    except (AttributeError, OSError) as e:
+        logger.warning("Could not lower thread I/O priority: %s", e)
+
+
+def _read_pressure(resource):
+    """Returns the "some avg10" value of /proc/pressure/<resource>, or None"""
+    try:
+        with open(os.path.join(PRESSURE_DIR, resource)) as f:
+            for line in f:
+                fields = line.split()
+                if fields and fields[0] == "some":
+                    for field in fields[1:]:
+                        key, _sep, value = field.partition("=")
+                        if key == "avg10":
+                            return float(value)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def system_settled():
+    """Returns True if CPU and I/O pressure are below their limits"""
+    cpu = _read_pressure("cpu")
+    io = _read_pressure("io")
+    # Without pressure information only the session state is considered
+    if cpu is not None and cpu >= CPU_PRESSURE_LIMIT:
+        return False
+    if io is not None and io >= IO_PRESSURE_LIMIT:
+        return False
+    return True
+
+
+class SessionGate:
+    """Releases queued background work once the login session has settled"""
+
+    def __init__(self):
+        self._started = False
+        self._ready = False
+        self._session_running = False
+        self._settled_samples = 0
+        self._deadline = 0
+        self._proxy = None
+        self._sample_source_id = 0
+        self._release_source_id = 0
+        self._waiting = []
+
+    @property
+    def ready(self):
+        return self._ready
+
+    def run_when_ready(self, callback, *args):
+        """Calls callback(*args) on the main loop once the session has settled"""
+        self._waiting.append((callback, args))
+        if self._ready:
+            self._schedule_release()
+        else:
+            self._start()
+
+    def _start(self):
+        if self._started:
+            return
+        self._started = True
+        self._deadline = time.monotonic() + MAX_WAIT_SECONDS
+
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SESSION,
+            Gio.DBusProxyFlags.DO_NOT_AUTO_START,
+            None,
+            "org.gnome.SessionManager",
+            "/org/gnome/SessionManager",
+            "org.gnome.SessionManager",
+            None,
+            self._on_proxy_ready,
+        )
+        self._sample_source_id = GLib.timeout_add(SAMPLE_INTERVAL_MS, self._sample)
+
+    def _on_proxy_ready(self, source, result):
+        try:
+            self._proxy = Gio.DBusProxy.new_for_bus_finish(result)
+        except GLib.Error as e:
+            logger.warning("Session manager unavailable: %s", e)
+            self._session_running = True
+            return
+
+        if self._proxy.get_name_owner() is None:
+            # Not a GNOME session, nothing to wait for
+            self._session_running = True
+            return
+
+        self._proxy.connect("g-signal", self._on_session_signal)
+        self._proxy.call("IsSessionRunning", None, Gio.DBusCallFlags.NONE, -1, None,
+                         self._on_is_session_running)
+
+    def _on_is_session_running(self, proxy, result):
+        try:
+            (running,) = proxy.call_finish(result).unpack()
+        except GLib.Error as e:
+            logger.warning("IsSessionRunning failed: %s", e)
+            running = True
+        if running:
+            self._session_running = True
+
+    def _on_session_signal(self, proxy, sender_name, signal_name, parameters):
+        if signal_name == "SessionRunning":
+            self._session_running = True
+
+    def _sample(self):
+        if self._session_running and system_settled():
+            self._settled_samples += 1
+        else:
+            self._settled_samples = 0
+
+        timed_out = time.monotonic() >= self._deadline
+        if self._settled_samples >= SETTLED_SAMPLES or timed_out:
+            if timed_out:
+                logger.info("Session did not settle in time, releasing work")
+            self._sample_source_id = 0
+            self._ready = True
+            self._schedule_release()
+            return False
+        return True
+
+    def _schedule_release(self):
+        if not self._release_source_id:
+            self._release_source_id = GLib.idle_add(self._release_next, priority=GLib.PRIORITY_LOW)
+
+    def _release_next(self):
+        self._release_source_id = 0
+        if not self._waiting:
+            return False
+
+        callback, args = self._waiting.pop(0)
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error("Released work failed: %s", e)
+
+        if self._waiting:
+            self._release_source_id = GLib.timeout_add(RELEASE_INTERVAL_MS, self._release_next)
+        return False
+
+
+session_gate = SessionGate()